@@ -1,1011 +1,957 @@
-import tkinter as tk
+import csv
 import random
 import json
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache, wraps
+from itertools import accumulate
 from pathlib import Path
+from typing import NamedTuple
+
+from loadout_catalog import load_catalog
+
+# --- Core Data (loaded from catalog.json, see loadout_catalog) ---
+CATALOG = load_catalog()
+_VALUES = CATALOG["values"]
+_SIZES = CATALOG["draw_sizes"]
+
+MELEE_WEAPONS = list(_VALUES["melee"][:_SIZES["melee"]])
+WEAPONS = list(_VALUES["weapon"][:_SIZES["weapon"]])
+MAGAZINES = list(_VALUES["magazines"][:_SIZES["magazines"]])
+AMMO_STACKS = list(_VALUES["ammo"][:_SIZES["ammo"]])
+ARMOUR_TIERS = list(_VALUES["armour"][:_SIZES["armour"]])
+FILTERS = list(_VALUES["filter"][:_SIZES["filter"]])
 
-# --- Core Data ---
-MELEE_WEAPONS = ["Cleaver", "Sickle", "Fists"]
-WEAPONS = [
-    "None", "Makarov PM", "Sawed-off Revolver", "TT33", "Bizon", "Carl Gustaf M45", "MP40",
-    "CR-61 Skorpion", "Spectre M4", "PP-91 Kedr", "Thompson M1A1", "Criket", "PPSH",
-    "Sporter 22", "BK-18", "Sawed-off BK-12", "Henry Single Shot", "Toz-34",
-    "Mossberg 88", "BK-43", "Sawed-off BK-43", "Mossberg 590", "Mossberg 500",
-    "Toz-34 sawed-off", "Winchester 1873", "Repeater Carbine", "Rusty AK-74",
-    "Rusty AKS-74U", "AKS-74UN", "Rusty AKM", "CZ SA Vz.58", "SK 59/66"
-]
-MAGAZINES = ["None"] + [f"{i} Magazine" + ("s" if i > 1 else "") for i in range(1, 7)]
-AMMO_STACKS = ["None"] + [f"{i} Stack" + ("s" if i > 1 else "") for i in range(1, 6)]
-ARMOUR_TIERS = ["None", "Cloth", "Kevlar", "Ceramic"]
-FILTERS = ["None", 200, 400, 600, 800]
 
 # --- Detailed Data with weights (item, weight) ---
+def _choices(slot):
+    return list(zip(_VALUES[slot], CATALOG["weights"][slot]))
+
+
+MEDICINE_CHOICES = _choices("medicine")
+BANDAGE_CHOICES = _choices("bandages")
+MEDKIT_CHOICES = _choices("medkits")
+FOOD_CHOICES = _choices("food")
+WATER_CHOICES = _choices("water")
+PACK_CHOICES = _choices("pack")
+GASMASK_CHOICES = _choices("gasmask")
+POCKET_CHOICES = _choices("pockets")
+RESTRAINT_CHOICES = _choices("restraints")
+
+
+class WeightedTable:
+    """A (item, weight) table compiled once into cumulative weights.
+
+    Drawing is a single random() plus a bisect over the precomputed sums, which
+    is exactly what random.choices does internally minus rebuilding the sums on
+    every call, so a seeded RNG gives the same sequence as before.
+    """
+    __slots__ = ("items", "weights", "cum_weights", "total")
+
+    def __init__(self, choices):
+        items, weights = zip(*choices)
+        self.items = items
+        self.weights = weights
+        self.cum_weights = tuple(accumulate(weights))
+        self.total = self.cum_weights[-1]
+
+    def index(self, rng=random):
+        return bisect_right(self.cum_weights, rng.random() * self.total)
+
+    def sample(self, rng=random):
+        return self.items[bisect_right(self.cum_weights, rng.random() * self.total)]
+
+    def __iter__(self):
+        return zip(self.items, self.weights)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return f"WeightedTable({list(self)!r})"
+
+
+MEDICINE_TABLE = WeightedTable(MEDICINE_CHOICES)
+BANDAGE_TABLE = WeightedTable(BANDAGE_CHOICES)
+MEDKIT_TABLE = WeightedTable(MEDKIT_CHOICES)
+FOOD_TABLE = WeightedTable(FOOD_CHOICES)
+WATER_TABLE = WeightedTable(WATER_CHOICES)
+PACK_TABLE = WeightedTable(PACK_CHOICES)
+GASMASK_TABLE = WeightedTable(GASMASK_CHOICES)
+POCKET_TABLE = WeightedTable(POCKET_CHOICES)
+RESTRAINT_TABLE = WeightedTable(RESTRAINT_CHOICES)
+
+
+def weighted_choice(choices, rng=random):
+    if not isinstance(choices, WeightedTable):
+        choices = WeightedTable(choices)
+    return choices.sample(rng)
+
+
+# --- Headless engine ---
+DETAILED_TABLES = {
+    "medicine": MEDICINE_TABLE,
+    "bandages": BANDAGE_TABLE,
+    "medkits": MEDKIT_TABLE,
+    "food": FOOD_TABLE,
+    "water": WATER_TABLE,
+    "pack": PACK_TABLE,
+    "gasmask": GASMASK_TABLE,
+    "pockets": POCKET_TABLE,
+    "restraints": RESTRAINT_TABLE,
+}
+
+SLOT_LABELS = {
+    "melee": "Melee",
+    "weapon": "Weapon",
+    "magazines": "Magazines",
+    "ammo": "Ammo",
+    "armour": "Armour",
+    "filter": "Filter",
+    "money": "Money",
+    "medicine": "Medicine",
+    "bandages": "Bandages",
+    "medkits": "Medkits",
+    "food": "Food",
+    "water": "Water",
+    "pack": "Pack",
+    "gasmask": "Gasmask",
+    "pockets": "Pockets",
+    "restraints": "Restraints",
+}
+
+INCLUDE_DEFAULTS = {
+    "melee": True,
+    "weapon": True,
+    "armour": True,
+    "filter": True,
+    "money": True,
+    **{k: False for k in DETAILED_TABLES},
+}
+LOCK_DEFAULTS = {"melee": False, "weapon": False, "armour": False, "filter": False, "money": False}
+
+# The one table of what shows where; the engine, loadout_bulk, loadout_odds and
+# loadout_conformance all read it. include/lock flag -> the slots it switches
+# (the weapon flag carries magazines and ammo).
+FLAG_SLOTS = {
+    "melee": ("melee",),
+    "weapon": ("weapon", "magazines", "ammo"),
+    "armour": ("armour",),
+    "filter": ("filter",),
+    "money": ("money",),
+    **{name: (name,) for name in DETAILED_TABLES},
+}
+LOCK_GROUPS = {flag: FLAG_SLOTS[flag] for flag in LOCK_DEFAULTS}
+# draw group -> its include flags, in RNG order
+GROUP_FLAGS = {
+    "basic": ("melee", "weapon", "armour", "filter"),
+    "detailed": tuple(DETAILED_TABLES),
+    "money": ("money",),
+}
+# normal mode -> the groups it shows, in RNG order (modes without money still
+# roll it, hidden, so a money lock has something to keep)
+MODE_GROUPS = {
+    "all": ("basic", "detailed", "money"),
+    "basic": ("basic",),
+    "detailed": ("detailed",),
+    "money": ("money",),
+}
+MODE_FLAGS = {mode: tuple(f for group in groups for f in GROUP_FLAGS[group]) for mode, groups in MODE_GROUPS.items()}
+
+FIELD_NAMES = ("melee", "weapon", "magazines", "ammo", "armour", "filter", "money")
+# order lines appear in "Generate All"
+SLOT_ORDER = FIELD_NAMES[:-1] + tuple(DETAILED_TABLES) + ("money",)
+
+MONEY_MIN, MONEY_MAX, MONEY_STEP = CATALOG["money"]
+MONEY_VALUES = _VALUES["money"]
+
+
+# --- Encoding ---
+# Every value a slot can show, including preset-only extras after the plain
+# table. Rolls store indices into these, never strings.
+SLOT_VALUES = {slot: _VALUES[slot] for slot in SLOT_ORDER}
+SLOT_INDEX = CATALOG["index"]
+
+# uniform draws: choice() over a range yields an index and consumes the RNG
+# exactly like choice() over the table itself
+DRAW_RANGES = {slot: range(size) for slot, size in _SIZES.items()}
+
+# Bit layout of a packed roll: each slot stores index + 1 (0 = not rolled),
+# in SLOT_ORDER from the low bits up; the layout id sits on top.
+SLOT_BITS = {slot: len(SLOT_VALUES[slot]).bit_length() for slot in SLOT_ORDER}
+SLOT_SHIFTS = {}
+_shift = 0
+for _slot in SLOT_ORDER:
+    SLOT_SHIFTS[_slot] = _shift
+    _shift += SLOT_BITS[_slot]
+LAYOUT_SHIFT = _shift
+del _shift, _slot
+SLOT_MASKS = {slot: (1 << bits) - 1 for slot, bits in SLOT_BITS.items()}
+
+
+def encode(slot, index):
+    return (index + 1) << SLOT_SHIFTS[slot]
+
+
+def index_of(slot, value):
+    return SLOT_INDEX[slot][value]
+
+
+def format_line(slot, value):
+    if slot == "money":
+        return f"Money: {value} RU"
+    return f"{SLOT_LABELS[slot]}: {value}"
+
+
+def format_sidearm(weapon, magazines, ammo):
+    return f"Sidearm: {weapon} ({magazines}, {ammo})"
+
+
+BAD_KEYWORDS = (
+    "none", "rusty", "0 ru", "you think i can afford medkits", "cannibal breakfast", "rotten",
+)
+GOOD_KEYWORDS = (
+    "kevlar", "ceramic", "ak-", "aks", "mossberg", "vz.58",
+    "ppsh", "full canteen", "gasmask", "big orange medkit (full)",
+)
+
+
+_BAD_RE = re.compile("|".join(map(re.escape, BAD_KEYWORDS)))
+_GOOD_RE = re.compile("|".join(map(re.escape, GOOD_KEYWORDS)))
+
+
+LINE_TAGS = ("bad", "good", "normal")
+
+
+def line_tag(line):
+    """Colour tag for a free-text result line: "bad", "good" or "normal"."""
+    ll = line.lower()
+    if _BAD_RE.search(ll):
+        return "bad"
+    if _GOOD_RE.search(ll):
+        return "good"
+    return "normal"
+
+
+# Tag of every line a slot can produce, parallel to SLOT_VALUES; rendering
+# looks tags up instead of scanning text.
+SLOT_TAGS = {
+    slot: tuple(line_tag(format_line(slot, value)) for value in values)
+    for slot, values in SLOT_VALUES.items()
+}
+
+
+@lru_cache(maxsize=None)
+def sidearm_tag(weapon, magazines, ammo):
+    return line_tag(format_sidearm(
+        SLOT_VALUES["weapon"][weapon], SLOT_VALUES["magazines"][magazines], SLOT_VALUES["ammo"][ammo],
+    ))
+
+
+class Layout(NamedTuple):
+    """How a roll is displayed: line order, preset header, empty message."""
+    mode: str
+    order: tuple = SLOT_ORDER
+    header: tuple = ()
+    empty_message: str = "No categories selected."
+    sidearm: bool = False  # render weapon/magazines/ammo as one "Sidearm:" line
 
-MEDICINE_CHOICES = [
-    ("None", 6),
-    ("B190 (small pack)", 3),
-    ("B190 (big pack)", 1),
-    ("Mexamin (small pack)", 2),
-    ("Mexamin (big pack)", 1),
-    ("B190 + Mexamin combo", 1),
-    ("Expired Tramadol", 2),
-    ("Empty pill bottle", 2),
-]
-
-BANDAGE_CHOICES = [
-    ("None", 4),
-    ("Bandage", 3),
-    ("Small quick bandage (1 use)", 3),
-    ("Big quick bandage", 2),
-    ("Rags (damaged)", 4),
-    ("Rags (pristine)", 2),
-    ("Used bandage (Probably used to wipe something)", 1),
-]
-
-MEDKIT_CHOICES = [
-    ("Big orange medkit (full)", 1),
-    ("Small orange medkit", 2),
-    ("Small blue medkit", 4),
-    ("Small yellow medkit", 2),
-    ("Coke and heroin", 5),
-    ("Coke", 2),
-    ("Heroin", 2),
-    ("Empty syringe", 1),
-    ("Spoon", 2),
-    ("You think I can afford medkits?", 5),
-]
-
-FOOD_CHOICES = [
-    ("None", 3),
-    ("Zagorsky", 3),
-    ("Klbasa", 3),
-    ("Vodka (real men don't need food)", 2),
-    ("Pasta live (cold)", 2),
-    ("Cannibal breakfast (human meat)", 1),
-    ("Mystery can (unlabeled)", 2),
-]
-
-WATER_CHOICES = [
-    ("No water", 4),
-    ("Half canteen (seems someone shot your canteen)", 3),
-    ("Rusty canteen (half)", 2),
-    ("Plastic bottle (full)", 3),
-    ("Full canteen", 2),
-    ("Vodka bottle filled with water", 1),
-]
-
-PACK_CHOICES = [
-    ("Nothing", 5),
-    ("Whetstone set", 2),
-    ("5V battery", 3),
-    ("9V battery", 3),
-    ("Compass", 2),
-    ("Old PDA (broken)", 2),
-    ("Cigarette pack", 2),
-    ("Lighter", 2),
-]
-
-GASMASK_CHOICES = [
-    ("No mask", 5),
-    ("GP5", 3),
-    ("GP7", 2),
-    ("Standard gasmask", 2),
-    ("Cracked gasmask", 2),
-    ("Filter canister only", 2),
-]
-
-POCKET_CHOICES = [
-    ("Nothing but air", 4),
-    ("Lighter", 3),
-    ("Matches", 3),
-    ("Spare loaded revolver", 1),
-    ("Half a chocolate bar", 2),
-    ("Cigarettes", 3),
-    ("Mossberg Shotgun loaded", 4),
-    ("Empty wallet", 2),
-    ("Rusty bolts", 2),
-]
-
-RESTRAINT_CHOICES = [
-    ("Nothing (I'll just knock them out)", 4),
-    ("Zipties", 3),
-    ("Rope", 3),
-    ("Duct tape", 3),
-]
-
-CONFIG_PATH = Path(__file__).with_name("loadout_config.json")
-
-
-def weighted_choice(choices):
-    items, weights = zip(*choices)
-    return random.choices(items, weights=weights, k=1)[0]
-
-
-# --- Tooltip helper ---
-class ToolTip:
-    def __init__(self, widget, text):
-        self.widget = widget
-        self.text = text
-        self.tip = None
-        widget.bind("<Enter>", self.show)
-        widget.bind("<Leave>", self.hide)
-
-    def show(self, _event=None):
-        if self.tip is not None:
-            return
-        x = self.widget.winfo_rootx() + 10
-        y = self.widget.winfo_rooty() + 20
-        self.tip = tk.Toplevel(self.widget)
-        self.tip.wm_overrideredirect(True)
-        self.tip.wm_geometry(f"+{x}+{y}")
-        label = tk.Label(
-            self.tip,
-            text=self.text,
-            bg="#222222",
-            fg="#ffcccc",
-            relief="solid",
-            borderwidth=1,
-            font=("Arial", 8),
-        )
-        label.pack(ipadx=4, ipady=2)
-
-    def hide(self, _event=None):
-        if self.tip is not None:
-            self.tip.destroy()
-            self.tip = None
-
-
-class LoadoutApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Renegade Generator")
-        self.root.geometry("560x720")
-        self.root.resizable(False, False)
-        self.root.configure(bg="#1a1a1a")
-
-        # Styles
-        self.title_font = ("Arial", 16, "bold")
-        self.text_font = ("Arial", 11, "bold")
-        self.button_font = ("Arial", 11, "bold")
-        self.exit_font = ("Arial", 10, "bold")
-
-        self.color_fg = "#ff3333"
-        self.color_text = "#ffcccc"
-        self.color_accent = "#ff5555"
-        self.btn_bg = "#330000"
-        self.btn_fg = "#ff8888"
-        self.btn_active_bg = "#660000"
-        self.btn_active_fg = "#ffffff"
-
-        # Lockable core fields
-        self.fields = {
-            "melee": None,
-            "weapon": None,
-            "magazines": None,
-            "ammo": None,
-            "armour": None,
-            "filter": None,
-            "money": None,
-        }
-
-        self.history = []  # list of full result strings
-
-        self._build_ui()
-        self.load_settings()
-        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
-
-        if not self.result_box.get("1.0", tk.END).strip():
-            self.set_result("Use Actions or Presets. Enable Detailed for full cursed immersion.")
-
-    # --- UI setup ---
-    def _build_ui(self):
-        tk.Label(
-            self.root,
-            text="⚠️ Renegade Generator ⚠️",
-            font=self.title_font,
-            fg=self.color_fg,
-            bg="#1a1a1a",
-        ).pack(pady=(10, 5))
-
-        # Include (Basic)
-        include_frame = tk.LabelFrame(
-            self.root,
-            text="Include (Basic)",
-            font=("Arial", 9, "bold"),
-            fg=self.color_text,
-            bg="#1a1a1a",
-            bd=1,
-            relief="ridge",
-            labelanchor="n",
-            padx=5,
-            pady=3,
-        )
-        include_frame.pack(pady=(5, 4), fill="x")
-
-        self.include_melee = tk.BooleanVar(value=True)
-        self.include_weapon = tk.BooleanVar(value=True)
-        self.include_armour = tk.BooleanVar(value=True)
-        self.include_filter = tk.BooleanVar(value=True)
-        self.include_money = tk.BooleanVar(value=True)
-
-        self._make_check(include_frame, "Melee", self.include_melee, 0)
-        self._make_check(include_frame, "Weapon", self.include_weapon, 1)
-        self._make_check(include_frame, "Armour", self.include_armour, 2)
-        self._make_check(include_frame, "Filter", self.include_filter, 3)
-        self._make_check(include_frame, "Money", self.include_money, 4)
-
-        # Lock (Basic)
-        lock_frame = tk.LabelFrame(
-            self.root,
-            text="Lock (keep on reroll, Basic only)",
-            font=("Arial", 9, "bold"),
-            fg=self.color_text,
-            bg="#1a1a1a",
-            bd=1,
-            relief="ridge",
-            labelanchor="n",
-            padx=5,
-            pady=3,
-        )
-        lock_frame.pack(pady=(0, 4), fill="x")
-
-        self.lock_melee = tk.BooleanVar(value=False)
-        self.lock_weapon = tk.BooleanVar(value=False)
-        self.lock_armour = tk.BooleanVar(value=False)
-        self.lock_filter = tk.BooleanVar(value=False)
-        self.lock_money = tk.BooleanVar(value=False)
-
-        lock_widgets = [
-            self._make_check(lock_frame, "Melee", self.lock_melee, 0),
-            self._make_check(lock_frame, "Weapon + Ammo", self.lock_weapon, 1),
-            self._make_check(lock_frame, "Armour", self.lock_armour, 2),
-            self._make_check(lock_frame, "Filter", self.lock_filter, 3),
-            self._make_check(lock_frame, "Money", self.lock_money, 4),
-        ]
-        lock_tips = [
-            "Keep the current melee weapon on rerolls.",
-            "Keep current weapon, magazines & ammo on rerolls.",
-            "Keep current armour tier on rerolls.",
-            "Keep current filter value on rerolls.",
-            "Keep current money roll on rerolls.",
-        ]
-        for w, t in zip(lock_widgets, lock_tips):
-            ToolTip(w, t)
-
-        # Detailed toggles
-        detailed_frame = tk.LabelFrame(
-            self.root,
-            text="Detailed (Optional)",
-            font=("Arial", 9, "bold"),
-            fg=self.color_text,
-            bg="#1a1a1a",
-            bd=1,
-            relief="ridge",
-            labelanchor="n",
-            padx=5,
-            pady=3,
-        )
-        detailed_frame.pack(pady=(0, 4), fill="x")
-
-        self.include_medicine = tk.BooleanVar(value=False)
-        self.include_bandages = tk.BooleanVar(value=False)
-        self.include_medkits = tk.BooleanVar(value=False)
-        self.include_food = tk.BooleanVar(value=False)
-        self.include_water = tk.BooleanVar(value=False)
-        self.include_pack = tk.BooleanVar(value=False)
-        self.include_gasmask = tk.BooleanVar(value=False)
-        self.include_pockets = tk.BooleanVar(value=False)
-        self.include_restraints = tk.BooleanVar(value=False)
-
-        self._make_check(detailed_frame, "Medicine", self.include_medicine, 0, row=0)
-        self._make_check(detailed_frame, "Bandages", self.include_bandages, 1, row=0)
-        self._make_check(detailed_frame, "Medkits", self.include_medkits, 2, row=0)
-        self._make_check(detailed_frame, "Food", self.include_food, 3, row=0)
-        self._make_check(detailed_frame, "Water", self.include_water, 4, row=0)
-
-        self._make_check(detailed_frame, "Pack", self.include_pack, 0, row=1)
-        self._make_check(detailed_frame, "Gasmask", self.include_gasmask, 1, row=1)
-        self._make_check(detailed_frame, "Pockets", self.include_pockets, 2, row=1)
-        self._make_check(detailed_frame, "Restraints", self.include_restraints, 3, row=1)
-
-        # Result box
-        result_frame = tk.Frame(self.root, bg="#1a1a1a")
-        result_frame.pack(pady=(4, 4), fill="x")
-
-        tk.Label(
-            result_frame,
-            text="Current Loadout:",
-            font=("Arial", 10, "bold"),
-            fg=self.color_text,
-            bg="#1a1a1a",
-        ).pack(anchor="w", padx=10)
-
-        self.result_box = tk.Text(
-            result_frame,
-            height=12,
-            width=70,
-            bg="#111111",
-            fg=self.color_accent,
-            font=self.text_font,
-            relief="solid",
-            bd=1,
-        )
-        self.result_box.pack(padx=10, pady=(2, 5), fill="x")
-        self.result_box.config(state="disabled")
-
-        self.result_box.tag_configure("bad", foreground="#ff4444")
-        self.result_box.tag_configure("good", foreground="#7CFC00")
-        self.result_box.tag_configure("normal", foreground=self.color_accent)
-
-        # Actions
-        actions_frame = tk.LabelFrame(
-            self.root,
-            text="Actions",
-            font=("Arial", 9, "bold"),
-            fg=self.color_text,
-            bg="#1a1a1a",
-            bd=1,
-            relief="ridge",
-            labelanchor="n",
-            padx=8,
-            pady=6,
-        )
-        actions_frame.pack(pady=(0, 5), fill="x")
-
-        for i in range(3):
-            actions_frame.columnconfigure(i, weight=1)
-
-        self._make_button(actions_frame, "Generate Basic", self.generate_loadout, width=16)\
-            .grid(row=0, column=0, padx=4, pady=3, sticky="nsew")
-        self._make_button(actions_frame, "Generate Detailed", self.generate_detailed, width=16)\
-            .grid(row=0, column=1, padx=4, pady=3, sticky="nsew")
-        self._make_button(actions_frame, "Generate All", self.generate_all, width=16)\
-            .grid(row=0, column=2, padx=4, pady=3, sticky="nsew")
-
-        self._make_button(actions_frame, "Generate Money Only", self.generate_money, width=16)\
-            .grid(row=1, column=0, padx=4, pady=3, sticky="nsew")
-        self._make_button(actions_frame, "Copy", self.copy_to_clipboard, width=16)\
-            .grid(row=1, column=1, padx=4, pady=3, sticky="nsew")
-        self._make_button(actions_frame, "Clear / Reset", self.clear_all, width=16)\
-            .grid(row=1, column=2, padx=4, pady=3, sticky="nsew")
-
-        # Presets
-        presets_frame = tk.LabelFrame(
-            self.root,
-            text="Presets",
-            font=("Arial", 9, "bold"),
-            fg=self.color_text,
-            bg="#1a1a1a",
-            bd=1,
-            relief="ridge",
-            labelanchor="n",
-            padx=5,
-            pady=3,
-        )
-        presets_frame.pack(pady=(3, 5), fill="x")
-
-        for i in range(3):
-            presets_frame.columnconfigure(i, weight=1)
-
-        # Row 0
-        self._make_button(presets_frame, "Scuffed Raider", self.preset_scuffed_raider, width=16)\
-            .grid(row=0, column=0, padx=5, pady=3, sticky="nsew")
-        self._make_button(presets_frame, "Rich Junkie", self.preset_rich_pmc, width=16)\
-            .grid(row=0, column=1, padx=5, pady=3, sticky="nsew")
-        self._make_button(presets_frame, "Swamp Goblin", self.preset_swamp_goblin, width=16)\
-            .grid(row=0, column=2, padx=5, pady=3, sticky="nsew")
-
-        # Row 1
-        self._make_button(presets_frame, "Hungover", self.preset_hungover, width=16)\
-            .grid(row=1, column=0, padx=5, pady=3, sticky="nsew")
-        self._make_button(presets_frame, "Desperate Muppet", self.preset_desperate_rookie, width=16)\
-            .grid(row=1, column=1, padx=5, pady=3, sticky="nsew")
-        self._make_button(presets_frame, "Crack Medic", self.preset_field_medic, width=16)\
-            .grid(row=1, column=2, padx=5, pady=3, sticky="nsew")
-
-        # History
-        # history_frame = tk.LabelFrame(
-        #     self.root,
-        #     text="History (last 10)",
-        #     font=("Arial", 9, "bold"),
-        #     fg=self.color_text,
-        #     bg="#1a1a1a",
-        #     bd=1,
-        #     relief="ridge",
-        #     labelanchor="n",
-        #     padx=5,
-        #     pady=3,
-        # )
-        # history_frame.pack(pady=(4, 0), fill="both", expand=True)
-
-        # self.history_listbox = tk.Listbox(
-        #     history_frame,
-        #     width=70,
-        #     height=7,
-        #     bg="#111111",
-        #     fg=self.color_text,
-        #     selectbackground="#330000",
-        #     highlightthickness=0,
-        #     activestyle="none",
-        # )
-        # self.history_listbox.pack(padx=8, pady=5, fill="both", expand=True)
-
-        # # Restore from history on double-click / Enter
-        # self.history_listbox.bind("<Double-Button-1>", self.on_history_activate)
-        # self.history_listbox.bind("<Return>", self.on_history_activate)
-
-        # Exit button
-        tk.Button(
-            self.root,
-            text="Exit",
-            command=self.on_close,
-            font=self.exit_font,
-            bg=self.btn_bg,
-            fg=self.btn_fg,
-            activebackground=self.btn_active_bg,
-            activeforeground=self.btn_active_fg,
-            width=12,
-        ).pack(pady=(4, 8))
-
-    # --- UI helpers ---
-    def _make_button(self, parent, text, command, width=18):
-        return tk.Button(
-            parent,
-            text=text,
-            command=command,
-            font=self.button_font,
-            bg=self.btn_bg,
-            fg=self.btn_fg,
-            activebackground=self.btn_active_bg,
-            activeforeground=self.btn_active_fg,
-            width=width,
-        )
 
-    def _make_check(self, parent, label, var, col, row=0):
-        cb = tk.Checkbutton(
-            parent,
-            text=label,
-            variable=var,
-            font=("Arial", 9),
-            bg="#1a1a1a",
-            fg=self.color_text,
-            selectcolor="#330000",
-            activebackground="#1a1a1a",
-            activeforeground=self.color_fg,
-            pady=0,
-        )
-        cb.grid(row=row, column=col, padx=4, pady=1, sticky="w")
-        return cb
-
-    # --- Settings ---
-    def get_settings(self):
-        return {
-            "include": {
-                "melee": self.include_melee.get(),
-                "weapon": self.include_weapon.get(),
-                "armour": self.include_armour.get(),
-                "filter": self.include_filter.get(),
-                "money": self.include_money.get(),
-                "medicine": self.include_medicine.get(),
-                "bandages": self.include_bandages.get(),
-                "medkits": self.include_medkits.get(),
-                "food": self.include_food.get(),
-                "water": self.include_water.get(),
-                "pack": self.include_pack.get(),
-                "gasmask": self.include_gasmask.get(),
-                "pockets": self.include_pockets.get(),
-                "restraints": self.include_restraints.get(),
-            },
-            "lock": {
-                "melee": self.lock_melee.get(),
-                "weapon": self.lock_weapon.get(),
-                "armour": self.lock_armour.get(),
-                "filter": self.lock_filter.get(),
-                "money": self.lock_money.get(),
-            },
-        }
-
-    def apply_settings(self, data):
-        inc = data.get("include", {})
-        self.include_melee.set(inc.get("melee", True))
-        self.include_weapon.set(inc.get("weapon", True))
-        self.include_armour.set(inc.get("armour", True))
-        self.include_filter.set(inc.get("filter", True))
-        self.include_money.set(inc.get("money", True))
-
-        self.include_medicine.set(inc.get("medicine", False))
-        self.include_bandages.set(inc.get("bandages", False))
-        self.include_medkits.set(inc.get("medkits", False))
-        self.include_food.set(inc.get("food", False))
-        self.include_water.set(inc.get("water", False))
-        self.include_pack.set(inc.get("pack", False))
-        self.include_gasmask.set(inc.get("gasmask", False))
-        self.include_pockets.set(inc.get("pockets", False))
-        self.include_restraints.set(inc.get("restraints", False))
+LAYOUTS = (
+    Layout("all"),
+    Layout("basic", empty_message="No basic categories selected."),
+    Layout("detailed", empty_message="No detailed categories selected."),
+    Layout("money", empty_message="Money generation is disabled."),
+    *(
+        Layout(f"preset={name}", spec["order"], spec["header"], sidearm=spec["sidearm"])
+        for name, spec in CATALOG["presets"].items()
+    ),
+)
+LAYOUT_IDS = {layout.mode: i for i, layout in enumerate(LAYOUTS)}
+# (slot, shift, mask) per layout, in display order, for fast decoding
+LAYOUT_FIELDS = tuple(
+    tuple((slot, SLOT_SHIFTS[slot], SLOT_MASKS[slot]) for slot in layout.order) for layout in LAYOUTS
+)
+HEADER_TAGS = {layout.mode: tuple(map(line_tag, layout.header)) for layout in LAYOUTS}
+EMPTY_TAGS = {layout.mode: line_tag(layout.empty_message) for layout in LAYOUTS}
+LAYOUT_CODES = {mode: i << LAYOUT_SHIFT for mode, i in LAYOUT_IDS.items()}
+PACKED_BITS = LAYOUT_SHIFT + (len(LAYOUTS) - 1).bit_length()  # == CATALOG["packed_bits"]
+WORD64 = PACKED_BITS <= 64
+
+
+@dataclass
+class RollSettings:
+    """Include/lock flags, same shape as the "include"/"lock" blocks of the config file."""
+    include: dict = field(default_factory=lambda: dict(INCLUDE_DEFAULTS))
+    lock: dict = field(default_factory=lambda: dict(LOCK_DEFAULTS))
 
+    @classmethod
+    def from_dict(cls, data):
+        settings = cls()
+        inc = data.get("include", {})
         locks = data.get("lock", {})
-        self.lock_melee.set(locks.get("melee", False))
-        self.lock_weapon.set(locks.get("weapon", False))
-        self.lock_armour.set(locks.get("armour", False))
-        self.lock_filter.set(locks.get("filter", False))
-        self.lock_money.set(locks.get("money", False))
-
-    def save_settings(self):
-        try:
-            CONFIG_PATH.write_text(json.dumps(self.get_settings(), indent=2), encoding="utf-8")
-        except Exception:
-            pass
-
-    def load_settings(self):
-        if not CONFIG_PATH.exists():
-            return
-        try:
-            data = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
-            self.apply_settings(data)
-        except Exception:
-            pass
-
-    # --- Result rendering ---
-    def set_result(self, text: str):
-        self.result_box.config(state="normal")
-        self.result_box.delete("1.0", tk.END)
-        for line in text.splitlines():
-            tag = self.get_line_tag(line)
-            self.result_box.insert(tk.END, line + "\n", tag)
-        self.result_box.config(state="disabled")
-
-    def get_line_tag(self, line: str) -> str:
-        ll = line.lower()
-        if (
-            "none" in ll
-            or "rusty" in ll
-            or "0 ru" in ll
-            or "you think i can afford medkits" in ll
-            or "cannibal breakfast" in ll
-            or "rotten" in ll
-        ):
-            return "bad"
-        good_keywords = [
-            "kevlar", "ceramic", "ak-", "aks", "mossberg", "vz.58",
-            "ppsh", "full canteen", "gasmask", "big orange medkit (full)"
-        ]
-        if any(k in ll for k in good_keywords):
-            return "good"
-        return "normal"
-
-    # --- History ---
-    # def add_to_history(self, text: str):
-    #     text = text.strip()
-    #     if not text:
-    #         return
-    #     # avoid duplicating identical last entry
-    #     if self.history and self.history[0] == text:
-    #         return
-    #     self.history.insert(0, text)
-    #     if len(self.history) > 10:
-    #         self.history = self.history[:10]
-    #     self.refresh_history()
-
-    # def refresh_history(self):
-    #     self.history_listbox.delete(0, tk.END)
-    #     for i, item in enumerate(self.history, start=1):
-    #         preview = item.replace("\n", " | ")
-    #         if len(preview) > 140:
-    #             preview = preview[:137] + "..."
-    #         self.history_listbox.insert(tk.END, f"{i}. {preview}")
-
-    # def on_history_activate(self, event=None):
-    #     sel = self.history_listbox.curselection()
-    #     if not sel:
-    #         return
-    #     idx = sel[0]
-    #     if 0 <= idx < len(self.history):
-    #         self.set_result(self.history[idx])
-
-    # --- Basic generators ---
-    def generate_loadout(self):
-        parts = []
-
-        if self.include_melee.get():
-            melee = self.fields["melee"] if self.lock_melee.get() and self.fields["melee"] is not None \
-                else random.choice(MELEE_WEAPONS)
-            self.fields["melee"] = melee
-            parts.append(f"Melee: {melee}")
-
-        if self.include_weapon.get():
-            if self.lock_weapon.get() and self.fields["weapon"] is not None:
-                weapon = self.fields["weapon"]
-                magazines = self.fields["magazines"]
-                ammo = self.fields["ammo"]
+        for k in settings.include:
+            settings.include[k] = bool(inc.get(k, INCLUDE_DEFAULTS[k]))
+        for k in settings.lock:
+            settings.lock[k] = bool(locks.get(k, LOCK_DEFAULTS[k]))
+        return settings
+
+    def to_dict(self):
+        return {"include": dict(self.include), "lock": dict(self.lock)}
+
+
+class Loadout:
+    """One roll, stored as a single packed integer (see SLOT_SHIFTS/LAYOUTS).
+
+    Slot values are decoded and text is rendered only on access, so millions
+    of these stay cheap; pack()/unpack() round-trip through a plain int.
+    """
+    __slots__ = ("packed", "seed")
+
+    def __init__(self, packed=0, seed=None):
+        self.packed = packed
+        self.seed = seed  # replay with LoadoutEngine.replay(mode, seed)
+
+    @classmethod
+    def from_codes(cls, codes, mode="all", seed=None):
+        packed = LAYOUT_CODES[mode]
+        for slot, index in codes.items():
+            packed |= encode(slot, index)
+        return cls(packed, seed)
+
+    @classmethod
+    def from_values(cls, values, mode="all", seed=None):
+        return cls.from_codes({slot: index_of(slot, v) for slot, v in values.items()}, mode, seed)
+
+    @classmethod
+    def unpack(cls, packed, seed=None):
+        return cls(packed, seed)
+
+    def pack(self):
+        return self.packed
+
+    @property
+    def layout(self):
+        return LAYOUTS[self.packed >> LAYOUT_SHIFT]
+
+    @property
+    def mode(self):
+        return self.layout.mode
+
+    @property
+    def header(self):
+        return self.layout.header
+
+    def code(self, slot):
+        """Index into SLOT_VALUES[slot], or None if the slot was not rolled."""
+        c = (self.packed >> SLOT_SHIFTS[slot]) & SLOT_MASKS[slot]
+        return c - 1 if c else None
+
+    @property
+    def codes(self):
+        packed = self.packed
+        codes = {}
+        for slot, shift, mask in LAYOUT_FIELDS[packed >> LAYOUT_SHIFT]:
+            c = (packed >> shift) & mask
+            if c:
+                codes[slot] = c - 1
+        return codes
+
+    @property
+    def slots(self):
+        return {slot: SLOT_VALUES[slot][c] for slot, c in self.codes.items()}
+
+    def __getitem__(self, slot):
+        c = self.code(slot)
+        if c is None:
+            raise KeyError(slot)
+        return SLOT_VALUES[slot][c]
+
+    def get(self, slot, default=None):
+        c = self.code(slot)
+        return default if c is None else SLOT_VALUES[slot][c]
+
+    def __contains__(self, slot):
+        return self.code(slot) is not None
+
+    def diff(self, previous):
+        """Slots whose value changed since `previous`.
+
+        None means the two rolls do not share a line layout (no previous roll,
+        another mode, or a slot switched on/off), so everything must be redrawn.
+        """
+        if previous is None or (self.packed ^ previous.packed) >> LAYOUT_SHIFT:
+            return None
+        changed = set()
+        for slot in SLOT_ORDER:
+            mask = SLOT_MASKS[slot] << SLOT_SHIFTS[slot]
+            new, old = self.packed & mask, previous.packed & mask
+            if new != old:
+                if not (new and old):
+                    return None
+                changed.add(slot)
+        return changed
+
+    def line_slots(self):
+        """For each line of lines(), the slots it shows (empty for header lines)."""
+        layout = self.layout
+        deps = [()] * len(layout.header)
+        for slot in self.codes:
+            if layout.sidearm and slot in ("magazines", "ammo"):
+                continue
+            if layout.sidearm and slot == "weapon":
+                deps.append(("weapon", "magazines", "ammo"))
+            else:
+                deps.append((slot,))
+        if not deps:
+            deps.append(())
+        return deps
+
+    def lines(self):
+        layout = self.layout
+        slots = self.slots
+        lines = list(layout.header)
+        for slot, value in slots.items():
+            if layout.sidearm and slot in ("magazines", "ammo"):
+                continue
+            if layout.sidearm and slot == "weapon":
+                lines.append(format_sidearm(value, slots["magazines"], slots["ammo"]))
             else:
-                weapon = random.choice(WEAPONS)
-                magazines = random.choice(MAGAZINES)
-                ammo = random.choice(AMMO_STACKS)
-                self.fields["weapon"] = weapon
-                self.fields["magazines"] = magazines
-                self.fields["ammo"] = ammo
-            parts.append(f"Weapon: {weapon}")
-            parts.append(f"Magazines: {magazines}")
-            parts.append(f"Ammo: {ammo}")
-
-        if self.include_armour.get():
-            armour = self.fields["armour"] if self.lock_armour.get() and self.fields["armour"] is not None \
-                else random.choice(ARMOUR_TIERS)
-            self.fields["armour"] = armour
-            parts.append(f"Armour: {armour}")
-
-        if self.include_filter.get():
-            filt = self.fields["filter"] if self.lock_filter.get() and self.fields["filter"] is not None \
-                else random.choice(FILTERS)
-            self.fields["filter"] = filt
-            parts.append(f"Filter: {filt}")
-
-        # generate/store money for locking/consistency, but don't display it in basic gen
-        self._ensure_money_generated()
-
-        if not parts:
-            parts.append("No basic categories selected.")
-
-        text = "\n".join(parts)
-        self.set_result(text)
-        # self.add_to_history(text)
-
-    def generate_money(self):
-        if not self.include_money.get():
-            self.set_result("Money generation is disabled.")
-            return
-
-        money = self.fields["money"] if self.lock_money.get() and self.fields["money"] is not None \
-            else random.randrange(0, 150_001, 5_000)
-        self.fields["money"] = money
-
-        text = f"Money: {money} RU"
-        self.set_result(text)
-        # self.add_to_history(text)
-
-    # Ensure money gets generated/stored for basic/detailed gens (but not displayed)
-    def _ensure_money_generated(self):
-        if not self.include_money.get():
-            return
-        # if money is locked and already present, keep it
-        if self.lock_money.get() and self.fields.get("money") is not None:
-            return
-        # generate and store (step is 5000)
-        self.fields["money"] = random.randrange(0, 150_001, 5_000)
-
-    # --- Detailed generator ---
-    def _build_detailed_parts(self):
-        parts = []
-        if self.include_medicine.get():
-            parts.append(f"Medicine: {weighted_choice(MEDICINE_CHOICES)}")
-        if self.include_bandages.get():
-            parts.append(f"Bandages: {weighted_choice(BANDAGE_CHOICES)}")
-        if self.include_medkits.get():
-            parts.append(f"Medkits: {weighted_choice(MEDKIT_CHOICES)}")
-        if self.include_food.get():
-            parts.append(f"Food: {weighted_choice(FOOD_CHOICES)}")
-        if self.include_water.get():
-            parts.append(f"Water: {weighted_choice(WATER_CHOICES)}")
-        if self.include_pack.get():
-            parts.append(f"Pack: {weighted_choice(PACK_CHOICES)}")
-        if self.include_gasmask.get():
-            parts.append(f"Gasmask: {weighted_choice(GASMASK_CHOICES)}")
-        if self.include_pockets.get():
-            parts.append(f"Pockets: {weighted_choice(POCKET_CHOICES)}")
-        if self.include_restraints.get():
-            parts.append(f"Restraints: {weighted_choice(RESTRAINT_CHOICES)}")
-        return parts
-
-    def generate_detailed(self):
-        parts = self._build_detailed_parts()
-        # generate/store money for locking/consistency, but don't display here
-        self._ensure_money_generated()
-        if not parts:
-            parts.append("No detailed categories selected.")
-        text = "\n".join(parts)
-        self.set_result(text)
-        # self.add_to_history(text)
-
-    # --- All-in-one ---
-    def generate_all(self):
-        parts = []
-
-        # Basic
-        if self.include_melee.get():
-            melee = self.fields["melee"] if self.lock_melee.get() and self.fields["melee"] is not None \
-                else random.choice(MELEE_WEAPONS)
-            self.fields["melee"] = melee
-            parts.append(f"Melee: {melee}")
-
-        if self.include_weapon.get():
-            if self.lock_weapon.get() and self.fields["weapon"] is not None:
-                weapon = self.fields["weapon"]
-                magazines = self.fields["magazines"]
-                ammo = self.fields["ammo"]
+                lines.append(format_line(slot, value))
+        if not lines:
+            lines.append(layout.empty_message)
+        return lines
+
+    def line_tags(self):
+        """Tag for each line of lines(), from the precomputed SLOT_TAGS."""
+        layout = self.layout
+        codes = self.codes
+        tags = list(HEADER_TAGS[layout.mode])
+        for slot, c in codes.items():
+            if layout.sidearm and slot in ("magazines", "ammo"):
+                continue
+            if layout.sidearm and slot == "weapon":
+                tags.append(sidearm_tag(c, codes["magazines"], codes["ammo"]))
             else:
-                weapon = random.choice(WEAPONS)
-                magazines = random.choice(MAGAZINES)
-                ammo = random.choice(AMMO_STACKS)
-                self.fields["weapon"] = weapon
-                self.fields["magazines"] = magazines
-                self.fields["ammo"] = ammo
-            parts.append(f"Weapon: {weapon}")
-            parts.append(f"Magazines: {magazines}")
-            parts.append(f"Ammo: {ammo}")
-
-        if self.include_armour.get():
-            armour = self.fields["armour"] if self.lock_armour.get() and self.fields["armour"] is not None \
-                else random.choice(ARMOUR_TIERS)
-            self.fields["armour"] = armour
-            parts.append(f"Armour: {armour}")
-
-        if self.include_filter.get():
-            filt = self.fields["filter"] if self.lock_filter.get() and self.fields["filter"] is not None \
-                else random.choice(FILTERS)
-            self.fields["filter"] = filt
-            parts.append(f"Filter: {filt}")
-
-        # Detailed
-        parts.extend(self._build_detailed_parts())
-
-        # Money
-        if self.include_money.get():
-            money = self.fields["money"] if self.lock_money.get() and self.fields["money"] is not None \
-                else random.randrange(0, 150_001, 5_000)
-            self.fields["money"] = money
-            parts.append(f"Money: {money} RU")
-
-        if not parts:
-            parts.append("No categories selected.")
-
-        text = "\n".join(parts)
-        self.set_result(text)
-        # self.add_to_history(text)
+                tags.append(SLOT_TAGS[slot][c])
+        if not tags:
+            tags.append(EMPTY_TAGS[layout.mode])
+        return tags
 
-    # --- Presets ---
+    @property
+    def text(self):
+        return "\n".join(self.lines())
+
+    def __str__(self):
+        return self.text
+
+    def __eq__(self, other):
+        if not isinstance(other, Loadout):
+            return NotImplemented
+        return self.packed == other.packed
+
+    def __hash__(self):
+        return hash(self.packed)
+
+    def __repr__(self):
+        return f"Loadout({self.mode!r}, {self.slots!r}, seed={self.seed!r})"
+
+
+class LoadoutArray:
+    """Rolls kept as one unsigned 64-bit word each (seeds are dropped).
+
+    A catalog whose rolls need more than 64 bits (see PACKED_BITS) gets a
+    plain list of ints instead; same interface, just not compact.
+    """
+
+    def __init__(self, loadouts=()):
+        words = (loadout.packed for loadout in loadouts)
+        self.words = array("Q", words) if WORD64 else list(words)
+
+    def append(self, loadout):
+        self.words.append(loadout.packed)
+
+    def extend(self, loadouts):
+        self.words.extend(loadout.packed for loadout in loadouts)
+
+    def __len__(self):
+        return len(self.words)
 
-    def preset_scuffed_raider(self):
-        self._preset_reset()
-        self.include_melee.set(True)
-        self.include_weapon.set(True)
-        self.include_armour.set(True)
-        self.include_filter.set(False)
-        self.include_money.set(True)
-        self.include_food.set(True)
-        self.include_water.set(True)
-        self.include_bandages.set(True)
-        self.include_medicine.set(True)
-        self.include_pockets.set(True)
-        self.generate_all()
-
-    def preset_rich_pmc(self):
-        self._preset_reset()
-        self.include_melee.set(True)
-        self.include_weapon.set(True)
-        self.include_armour.set(True)
-        self.include_filter.set(True)
-        self.include_money.set(True)
-        self.include_medicine.set(True)
-        self.include_medkits.set(True)
-        self.include_food.set(True)
-        self.include_water.set(True)
-        self.include_pack.set(True)
-        self.include_gasmask.set(True)
-        self.include_pockets.set(True)
-
-        weapon = random.choice([
-            "AKS-74UN", "CZ SA Vz.58", "Mossberg 590", "Mossberg 500",
-            "PPSH", "Spectre M4", "PP-91 Kedr"
-        ])
-        magazines = random.choice(MAGAZINES[2:])
-        ammo = random.choice(AMMO_STACKS[2:])
-        armour = random.choice(["Kevlar", "Ceramic"])
-        filt = random.choice([400, 600, 800])
-        money = random.randrange(80_000, 150_001, 5_000)
-
-        self.fields.update({
-            "melee": random.choice(MELEE_WEAPONS),
-            "weapon": weapon,
-            "magazines": magazines,
-            "ammo": ammo,
-            "armour": armour,
-            "filter": filt,
-            "money": money,
-        })
-
-        self.generate_all()
-
-    def preset_swamp_goblin(self):
-        self._preset_reset()
-        self.include_melee.set(True)
-        self.include_weapon.set(True)
-        self.include_armour.set(True)
-        self.include_filter.set(True)
-        self.include_money.set(True)
-        self.include_food.set(True)
-        self.include_water.set(True)
-        self.include_bandages.set(True)
-        self.include_pockets.set(True)
-        self.include_restraints.set(True)
-
-        melee = random.choice(["Sickle", "Fists"])
-        weapon = random.choice(["None", "Sporter 22", "Rusty AKM", "Rusty AK-74"])
-        magazines = random.choice(MAGAZINES[:3])
-        ammo = random.choice(AMMO_STACKS[:3])
-        armour = random.choice(["None", "Cloth"])
-        filt = random.choice(["None", 200])
-        money = random.randrange(0, 40_001, 5_000)
-
-        self.fields.update({
-            "melee": melee,
-            "weapon": weapon,
-            "magazines": magazines,
-            "ammo": ammo,
-            "armour": armour,
-            "filter": filt,
-            "money": money,
-        })
-
-        self.generate_all()
-
-    def preset_hungover(self):
-        self._preset_reset()
-        text = (
-            "Preset: Hungover\n"
-            "You partied so hard last night that you woke up in a ditch.\n"
-            "A renegade stole your shoes. Best of luck.\n"
-            "\n"
-            "Melee: Vodka bottle\n"
-            "Food: Vodka (real men don't need food)\n"
-            "Water: No water\n"
-            "Pockets: Empty wallet\n"
+    def __getitem__(self, i):
+        return Loadout(self.words[i])
+
+    def __iter__(self):
+        return map(Loadout, self.words)
+
+
+def _roll(mode):
+    """Wrap a generator so each call draws from its own seed, recorded on the Loadout.
+
+    The wrapped method returns the packed slot codes; the layout for `mode` is
+    added here. Passing seed=... replays that roll exactly given the same
+    include settings. A roll that kept a locked value depends on state the
+    seed does not capture, so it is returned with seed=None instead.
+    """
+    layout = LAYOUT_CODES[mode]
+
+    def decorate(method):
+        @wraps(method)
+        def roll(self, *args, seed=None, **kwargs):
+            if seed is None and self.record_seeds:
+                seed = self.rng.getrandbits(64)
+            if seed is None:
+                self._rng = self.rng
+            else:
+                self._rng = self._seeded_rng
+                self._rng.seed(seed)
+            self._kept = False
+            codes = method(self, *args, **kwargs)
+            return Loadout(codes | layout, None if self._kept else seed)
+        return roll
+    return decorate
+
+
+class PresetSampler:
+    """A catalog preset compiled into a fixed draw plan (see loadout_catalog).
+
+    Each step is one RNG draw: a uniform pick from a pool or a bisect into
+    precomputed weights, so a preset roll costs the same as roll_all(). Slots
+    the preset's layout hides are still drawn (keeping seeds stable) but not
+    encoded. roll() needs nothing but an RNG, for bulk use without an engine.
+    """
+    __slots__ = ("name", "mode", "label", "include", "exclude", "fixed", "base", "steps", "_include_patch")
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.mode = f"preset={name}"
+        self.label = spec["label"]
+        self.include = spec["include"]
+        self.exclude = spec["exclude"]
+        self.fixed = spec["fixed"]
+        # detailed slots off, then the preset's include/exclude, as one dict.update (locks: LOCK_RESET)
+        self._include_patch = dict.fromkeys(DETAILED_TABLES, False)
+        self._include_patch.update(dict.fromkeys(self.include, True))
+        self._include_patch.update(dict.fromkeys(self.exclude, False))
+        shown = set(LAYOUTS[LAYOUT_IDS[self.mode]].order)
+        self.base = 0
+        for slot, index in self.fixed.items():
+            if slot in shown:
+                self.base |= encode(slot, index)
+        self.steps = tuple(
+            (
+                slot,
+                SLOT_SHIFTS[slot] if slot in shown else None,
+                indices,
+                None if weights is None else WeightedTable(zip(indices, weights)),
+            )
+            for slot, indices, weights in spec["draws"]
         )
-        self.set_result(text)
-        # self.add_to_history(text)
-
-    def preset_desperate_rookie(self):
-        self._preset_reset()
-        self.include_melee.set(True)
-        self.include_weapon.set(True)
-        self.include_money.set(True)
-        self.include_food.set(True)
-        self.include_water.set(True)
-        self.include_pockets.set(True)
-
-        self.fields["melee"] = random.choice(["Fists", "Sickle"])
-        self.fields["weapon"] = random.choice(["None", "Sporter 22", "BK-18"])
-        self.fields["magazines"] = random.choice(["None", "1 Magazine"])
-        self.fields["ammo"] = random.choice(
-            ["None", "1 Stack", "Half a Stack", "1 Bullet (make it count)"]
+
+    def draw(self, rng=random, fields=None):
+        """Packed slot codes (no layout bits) for one roll; fills `fields` if given."""
+        codes = self.base
+        for slot, shift, indices, table in self.steps:
+            index = rng.choice(indices) if table is None else table.sample(rng)
+            if fields is not None and slot in fields:
+                fields[slot] = index
+            if shift is not None:
+                codes |= (index + 1) << shift
+        return codes
+
+    def roll(self, rng=random):
+        return Loadout(self.draw(rng) | LAYOUT_CODES[self.mode])
+
+    def roll_many(self, n, rng=random):
+        layout = LAYOUT_CODES[self.mode]
+        draw = self.draw
+        rolls = LoadoutArray()
+        rolls.words.extend(draw(rng) | layout for _ in range(n))
+        return rolls
+
+    def apply_settings(self, settings):
+        """Switch the GUI include/lock flags the way this preset expects."""
+        settings.include.update(self._include_patch)
+        settings.lock.update(LOCK_RESET)
+
+
+LOCK_RESET = dict.fromkeys(LOCK_DEFAULTS, False)
+PRESET_SAMPLERS = {name: PresetSampler(name, spec) for name, spec in CATALOG["presets"].items()}
+
+
+# basic include flag -> ((slot, draw range, shift), ...) drawn together
+_BASIC_PLAN = tuple(
+    (flag, tuple((slot, DRAW_RANGES[slot], SLOT_SHIFTS[slot]) for slot in FLAG_SLOTS[flag]))
+    for flag in GROUP_FLAGS["basic"]
+)
+
+
+class LoadoutEngine:
+    """Pure-Python roller behind LoadoutApp; usable without a Tk root.
+
+    rng is the source of randomness (a random.Random); by default every roll
+    gets a 64-bit seed drawn from it and stored on the result, so a roll can be
+    kept as (mode, seed) and regenerated with replay() under the same include
+    settings. Rolls that kept a locked value get seed=None: what they show
+    depends on earlier rolls, not just the seed. record_seeds=False
+    draws straight from rng instead, skipping the per-roll reseed (the bulk
+    paths use this; reseeding costs more than the roll itself).
+    """
+
+    def __init__(self, settings=None, rng=None, record_seeds=True):
+        self.settings = settings if settings is not None else RollSettings()
+        self.rng = rng if rng is not None else random.Random()
+        self.record_seeds = record_seeds
+        self._seeded_rng = random.Random()
+        self._rng = self.rng
+        self._kept = False  # the current roll reused a locked value (see _roll)
+        # last rolled core values (SLOT_VALUES indices), kept for locks
+        self.fields = dict.fromkeys(FIELD_NAMES)
+        self.last = None  # previous reroll() result
+
+    def reset_fields(self):
+        self.fields = dict.fromkeys(FIELD_NAMES)
+
+    def field_values(self):
+        return {k: None if i is None else SLOT_VALUES[k][i] for k, i in self.fields.items()}
+
+    def replay(self, mode, seed):
+        """Roll `mode` from `seed` (a Loadout.seed); locks must not be holding values."""
+        return resolve_mode(mode)(self, seed=seed)
+
+    def reroll(self, mode):
+        """Roll `mode` and report what changed since the previous reroll.
+
+        Returns (loadout, changed) where changed is a set of slots, or None
+        when the result has to be redrawn from scratch (see Loadout.diff).
+        """
+        loadout = resolve_mode(mode)(self)
+        changed = loadout.diff(self.last)
+        self.last = loadout
+        return loadout, changed
+
+    # --- Slot helpers ---
+    def _basic(self):
+        include = self.settings.include
+        lock = self.settings.lock
+        fields = self.fields
+        choice = self._rng.choice
+        codes = 0
+        for flag, slots in _BASIC_PLAN:
+            if not include[flag]:
+                continue
+            if lock[flag] and fields[flag] is not None:
+                self._kept = True
+            else:
+                for slot, draw_range, _shift in slots:
+                    fields[slot] = choice(draw_range)
+            for slot, _range, shift in slots:
+                codes |= (fields[slot] + 1) << shift
+        return codes
+
+    def _detailed(self):
+        rng = self._rng
+        include = self.settings.include
+        codes = 0
+        for name in GROUP_FLAGS["detailed"]:
+            if include[name]:
+                codes |= (DETAILED_TABLES[name].index(rng) + 1) << SLOT_SHIFTS[name]
+        return codes
+
+    def _money(self):
+        if self.settings.lock["money"] and self.fields["money"] is not None:
+            self._kept = True
+            return self.fields["money"]
+        self.fields["money"] = self._rng.choice(DRAW_RANGES["money"])
+        return self.fields["money"]
+
+    def _money_codes(self):
+        if not self.settings.include["money"]:
+            return 0
+        return (self._money() + 1) << SLOT_SHIFTS["money"]
+
+    _GROUP_DRAWS = {"basic": "_basic", "detailed": "_detailed", "money": "_money_codes"}
+
+    def _mode_codes(self, mode):
+        """Draw the groups MODE_GROUPS lists for `mode`, in order."""
+        groups = MODE_GROUPS[mode]
+        codes = 0
+        for group in groups:
+            codes |= getattr(self, self._GROUP_DRAWS[group])()
+        if "money" not in groups and self.settings.include["money"]:
+            self._money()  # rolled but not shown, so a money lock has a value to keep
+        return codes
+
+    # --- Generators ---
+    @_roll("basic")
+    def roll_basic(self):
+        return self._mode_codes("basic")
+
+    @_roll("money")
+    def roll_money(self):
+        return self._mode_codes("money")
+
+    @_roll("detailed")
+    def roll_detailed(self):
+        return self._mode_codes("detailed")
+
+    @_roll("all")
+    def roll_all(self):
+        return self._mode_codes("all")
+
+    # --- Presets ---
+    def _preset(self, sampler):
+        sampler.apply_settings(self.settings)
+        self.fields = fields = dict.fromkeys(FIELD_NAMES)
+        for slot, index in sampler.fixed.items():
+            if slot in fields:
+                fields[slot] = index
+        return sampler.draw(self._rng, fields)
+
+    def roll_preset(self, name, seed=None):
+        return PRESETS[name](self, seed=seed)
+
+
+def _preset_roller(sampler):
+    @_roll(sampler.mode)
+    def roll(self):
+        return self._preset(sampler)
+    roll.__name__ = roll.__qualname__ = f"preset_{sampler.name}"
+    return roll
+
+
+# preset name -> roll function taking the engine, like the ROLL_MODES entries
+PRESETS = {name: _preset_roller(sampler) for name, sampler in PRESET_SAMPLERS.items()}
+
+# one LoadoutEngine.roll_<mode> per MODE_GROUPS entry
+ROLL_MODES = {mode: getattr(LoadoutEngine, f"roll_{mode}") for mode in MODE_GROUPS}
+
+
+def resolve_mode(mode):
+    if mode in ROLL_MODES:
+        return ROLL_MODES[mode]
+    return PRESETS[mode.partition("preset=")[2]]
+
+
+# --- Window (loadout_gui) ---
+_GUI_NAMES = ("LoadoutApp", "ToolTip", "VirtualList", "CONFIG_PATH", "HISTORY_PATH")
+
+
+def __getattr__(name):
+    # the window lives in loadout_gui so importing this module never loads tkinter
+    if name in _GUI_NAMES:
+        import loadout_gui
+        return getattr(loadout_gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# --- Command line batch mode ---
+def parse_mode(mode):
+    try:
+        resolve_mode(mode)
+    except KeyError:
+        choices = ", ".join([*ROLL_MODES, *(f"preset={p}" for p in PRESETS)])
+        from argparse import ArgumentTypeError
+        raise ArgumentTypeError(f"unknown mode {mode!r} (choose from {choices})") from None
+    return mode
+
+
+def positive_int(text):
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        from argparse import ArgumentTypeError
+        raise ArgumentTypeError(f"expected a positive integer, got {text!r}")
+    return value
+
+
+def iter_rolls(engine, roll, count):
+    for _ in range(count):
+        yield roll(engine)
+
+
+def render_text(loadout):
+    return loadout.text + "\n"
+
+
+def render_jsonl(loadout):
+    return json.dumps(loadout.slots, ensure_ascii=False) + "\n"
+
+
+class _LineBuffer:
+    def write(self, line):
+        self.line = line
+
+
+_CSV_BUFFER = _LineBuffer()
+_CSV_WRITER = csv.DictWriter(_CSV_BUFFER, fieldnames=SLOT_ORDER, restval="", lineterminator="\n")
+
+
+def render_csv(loadout):
+    _CSV_WRITER.writerow(loadout.slots)
+    return _CSV_BUFFER.line
+
+
+def csv_header():
+    _CSV_WRITER.writeheader()
+    return _CSV_BUFFER.line
+
+
+# format -> (record renderer, header, separator between records)
+FORMATS = {
+    "text": (render_text, "", "\n"),
+    "jsonl": (render_jsonl, "", ""),
+    "csv": (render_csv, csv_header(), ""),
+}
+
+
+def write_records(out, fmt, records):
+    _, header, separator = FORMATS[fmt]
+    write = out.write
+    if header:
+        write(header)
+    for i, record in enumerate(records):
+        if separator and i:
+            write(separator)
+        write(record)
+
+
+def build_parser():
+    import argparse  # CLI only; keeps `import Loadout` light
+    parser = argparse.ArgumentParser(prog="Loadout.py", description="Renegade loadout generator.")
+    parser.add_argument("--profile", metavar="JSON", default=os.environ.get("LOADOUT_PROFILE"),
+                        help="time each generator/render stage and write the totals here (env LOADOUT_PROFILE)")
+    parser.add_argument("--cprofile", metavar="PROF", default=os.environ.get("LOADOUT_CPROFILE"),
+                        help="run under cProfile and dump the stats here (env LOADOUT_CPROFILE)")
+    sub = parser.add_subparsers(dest="command")
+    gen = sub.add_parser("generate", help="roll loadouts without the window and stream them to stdout")
+    gen.add_argument("--count", type=positive_int, default=1, help="number of loadouts to roll (default 1)")
+    gen.add_argument("--mode", type=parse_mode, default="all",
+                     help="all | basic | detailed | money | preset=<name> (default all)")
+    gen.add_argument("--format", choices=FORMATS, default="text", help="output format (default text)")
+    gen.add_argument("--settings", type=Path, help="include/lock JSON in the loadout_config.json format")
+    gen.add_argument("--seed", type=int, help="make the run reproducible (same output for any --workers)")
+    gen.add_argument("--workers", type=positive_int, default=1, help="worker processes (default 1)")
+    exp = sub.add_parser("export", help="write rolls as dictionary-encoded columns (see loadout_export)")
+    exp.add_argument("path", type=Path, help="output file (parquet/arrow) or directory (npy)")
+    exp.add_argument("--count", type=positive_int, required=True, help="number of loadouts to roll")
+    exp.add_argument("--format", choices=("parquet", "arrow", "npy"), default="parquet",
+                     help="parquet | arrow (IPC file) need pyarrow; npy needs only NumPy (default parquet)")
+    exp.add_argument("--mode", type=parse_mode, default="all",
+                     help="all | basic | detailed | money | preset=<name> (default all)")
+    exp.add_argument("--settings", type=Path, help="include/lock JSON in the loadout_config.json format")
+    exp.add_argument("--seed", type=int, help="make the export reproducible (for the same --chunk)")
+    exp.add_argument("--chunk", type=positive_int, default=1 << 20, help="rows rolled and written at a time (default 1048576)")
+    st = sub.add_parser("stats", help="roll and print summary counts as JSON, keeping no rolls (see loadout_stats)")
+    st.add_argument("--count", type=positive_int, required=True, help="number of loadouts to roll")
+    st.add_argument("--mode", type=parse_mode, default="all",
+                    help="all | basic | detailed | money | preset=<name> (default all)")
+    st.add_argument("--settings", type=Path, help="include/lock JSON in the loadout_config.json format")
+    st.add_argument("--seed", type=int)
+    st.add_argument("--bulk", action="store_true", help="roll with NumPy (loadout_bulk); much faster")
+    srv = sub.add_parser("serve", help="serve rolls as JSON over local HTTP (see loadout_server)")
+    srv.add_argument("--host", default="127.0.0.1", help="interface to bind (default 127.0.0.1)")
+    srv.add_argument("--port", type=int, default=8765, help="port to listen on (default 8765)")
+    return parser
+
+
+def read_settings(path):
+    if path is None:
+        return RollSettings()
+    return RollSettings.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def run_generate(args, out=None):
+    out = out if out is not None else sys.stdout
+    settings = read_settings(args.settings)
+
+    if args.seed is not None or args.workers > 1:
+        import loadout_parallel
+        records = loadout_parallel.generate_records(
+            args.mode, settings, args.count, fmt=args.format, seed=args.seed, workers=args.workers,
         )
-        self.fields["armour"] = "None"
-        self.fields["filter"] = "None"
-        # self.fields["money"] = random.randrange(0, 20_001, 5_000)
-
-        text_parts = [
-            "Preset: Desperate Rookie",
-            "You're new, broke, and everyone can tell.",
-            "",
-            f"Melee: {self.fields['melee']}",
-            f"Weapon: {self.fields['weapon']}",
-            f"Magazines: {self.fields['magazines']}",
-            f"Ammo: {self.fields['ammo']}",
-            "Armour: None",
-            "Filter: None",
-            f"Food: {weighted_choice(FOOD_CHOICES)}",
-            f"Water: {weighted_choice(WATER_CHOICES)}",
-            f"Pockets: {weighted_choice(POCKET_CHOICES)}",
-            # f"💰 Money: {self.fields['money']} RU",
-        ]
-        text = "\n".join(text_parts)
-        self.set_result(text)
-        # self.add_to_history(text)
-
-    def preset_field_medic(self):
-        self._preset_reset()
-        self.include_melee.set(True)
-        self.include_weapon.set(True)
-        self.include_armour.set(True)
-        self.include_medicine.set(True)
-        self.include_bandages.set(True)
-        self.include_medkits.set(True)
-        self.include_pack.set(True)
-        self.include_pockets.set(True)
-        self.include_water.set(True)
-        self.include_food.set(True)
-        self.include_money.set(True)
-
-        self.fields["melee"] = random.choice(["Fists", "Cleaver"])
-        self.fields["weapon"] = random.choice(["Makarov PM", "TT33", "None"])
-        self.fields["magazines"] = random.choice(["1 Magazine", "2 Magazines"])
-        self.fields["ammo"] = random.choice(["1 Stack", "2 Stacks"])
-        self.fields["armour"] = random.choice(["Cloth", "Kevlar"])
-        self.fields["filter"] = random.choice(["None", 200])
-        # self.fields["money"] = random.randrange(20_000, 60_001, 5_000)
-
-        text_parts = [
-            "Preset: Field Medic",
-            "You're here to keep idiots alive, not win fashion contests.",
-            "",
-            f"Melee: {self.fields['melee']}",
-            f"Sidearm: {self.fields['weapon']} ({self.fields['magazines']}, {self.fields['ammo']})",
-            f"Armour: {self.fields['armour']}",
-            f"Medicine: {weighted_choice(MEDICINE_CHOICES)}",
-            f"Bandages: {weighted_choice(BANDAGE_CHOICES)}",
-            f"Medkits: {weighted_choice(MEDKIT_CHOICES)}",
-            f"Pack: {weighted_choice(PACK_CHOICES)}",
-            f"Water: {weighted_choice(WATER_CHOICES)}",
-            f"Pockets: {weighted_choice(POCKET_CHOICES)}",
-            # f"Money: {self.fields['money']} RU",
-        ]
-        text = "\n".join(text_parts)
-        self.set_result(text)
-        # self.add_to_history(text)
-
-    def _preset_reset(self):
-        self.lock_melee.set(False)
-        self.lock_weapon.set(False)
-        self.lock_armour.set(False)
-        self.lock_filter.set(False)
-        self.lock_money.set(False)
-        self.fields = {k: None for k in self.fields}
-
-        self.include_medicine.set(False)
-        self.include_bandages.set(False)
-        self.include_medkits.set(False)
-        self.include_food.set(False)
-        self.include_water.set(False)
-        self.include_pack.set(False)
-        self.include_gasmask.set(False)
-        self.include_pockets.set(False)
-        self.include_restraints.set(False)
-
-    # --- Misc ---
-    def copy_to_clipboard(self):
-        text = self.result_box.get("1.0", tk.END).strip()
-        if not text:
-            return
-        self.root.clipboard_clear()
-        self.root.clipboard_append(text)
-
-    def clear_all(self):
-        self.include_melee.set(True)
-        self.include_weapon.set(True)
-        self.include_armour.set(True)
-        self.include_filter.set(True)
-        self.include_money.set(True)
-
-        self.lock_melee.set(False)
-        self.lock_weapon.set(False)
-        self.lock_armour.set(False)
-        self.lock_filter.set(False)
-        self.lock_money.set(False)
-
-        self.include_medicine.set(False)
-        self.include_bandages.set(False)
-        self.include_medkits.set(False)
-        self.include_food.set(False)
-        self.include_water.set(False)
-        self.include_pack.set(False)
-        self.include_gasmask.set(False)
-        self.include_pockets.set(False)
-        self.include_restraints.set(False)
-
-        self.fields = {k: None for k in self.fields}
-        self.history = []
-        self.refresh_history()
-        self.set_result("Cleared. Ready for a fresh roll.")
-        self.save_settings()
-
-    def on_close(self):
-        self.save_settings()
-        self.root.destroy()
-
-
-def main():
-    root = tk.Tk()
-    LoadoutApp(root)
+    else:
+        render = FORMATS[args.format][0]
+        engine = LoadoutEngine(settings, record_seeds=False)
+        records = map(render, iter_rolls(engine, resolve_mode(args.mode), args.count))
+
+    try:
+        write_records(out, args.format, records)
+        out.flush()
+    except BrokenPipeError:
+        # downstream closed early (e.g. `| head`); silence the final flush at exit
+        if out is sys.stdout:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+
+def run_export(args):
+    import loadout_export
+    try:
+        rows = loadout_export.export(args.path, args.count, args.format, read_settings(args.settings),
+                                     args.mode, args.seed, args.chunk)
+    except loadout_export.ExportError as exc:
+        sys.exit(f"export: {exc}")
+    print(f"wrote {rows} rows to {args.path}", file=sys.stderr)
+
+
+def run_stats(args, out=None):
+    import loadout_stats
+    out = out if out is not None else sys.stdout
+    settings = read_settings(args.settings)
+    stats = loadout_stats.RollStats()
+    if args.bulk:
+        import loadout_bulk
+        if args.mode not in loadout_bulk.MODES and not args.mode.startswith("preset="):
+            sys.exit(f"stats: mode {args.mode!r} has no bulk roller (use {', '.join(loadout_bulk.MODES)} or preset=<name>)")
+        for batch in loadout_bulk.iter_batches(args.count, settings, args.mode, args.seed):
+            stats.add_batch(batch)
+    else:
+        engine = LoadoutEngine(settings, random.Random(args.seed), record_seeds=False)
+        stats.extend(iter_rolls(engine, resolve_mode(args.mode), args.count))
+    json.dump(stats.to_dict(), out, indent=2)
+    out.write("\n")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile or args.cprofile:
+        import loadout_profile
+        loadout_profile.run_profiled(lambda: run(args), args.profile, args.cprofile)
+        return
+    run(args)
+
+
+def run(args):
+    if args.command == "generate":
+        run_generate(args)
+        return
+    if args.command == "export":
+        run_export(args)
+        return
+    if args.command == "stats":
+        run_stats(args)
+        return
+    if args.command == "serve":
+        import loadout_server
+        loadout_server.serve(args.host, args.port)
+        return
+
+    import loadout_gui
+    root = loadout_gui.tk.Tk()
+    app = loadout_gui.LoadoutApp(root)
+    if os.environ.get("LOADOUT_EXIT_AFTER_STARTUP"):  # benchmarks/startup.py: quit once fully started
+        root.after_idle(lambda: root.after_idle(app.on_close))
     root.mainloop()
 
 
 if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    # sibling modules import Loadout; let them share this copy instead of loading a second one
+    sys.modules.setdefault("Loadout", sys.modules[__name__])
     main()
@@ -0,0 +1,35 @@
+"""Per-draw cost of preset rolls vs roll_all() with every slot included.
+
+Run from the repo root:  python benchmarks/bench_presets.py
+"""
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import Loadout  # noqa: E402
+
+ENGINE = Loadout.LoadoutEngine(rng=random.Random(1), record_seeds=False)
+ALL_ENGINE = Loadout.LoadoutEngine(rng=random.Random(1), record_seeds=False)
+ALL_ENGINE.settings.include.update(dict.fromkeys(ALL_ENGINE.settings.include, True))
+ALL_DRAWS = len(Loadout.SLOT_ORDER)
+
+
+def per_draw_ns(fn, draws, number):
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    return best / number / max(draws, 1) * 1e9
+
+
+def main(number=20_000):
+    print(f"{'roll_all':<18}: {per_draw_ns(ALL_ENGINE.roll_all, ALL_DRAWS, number):8.1f} ns/draw")
+    for name, sampler in Loadout.PRESET_SAMPLERS.items():
+        roll = Loadout.PRESETS[name]
+        engine_ns = per_draw_ns(lambda: roll(ENGINE), len(sampler.steps), number)
+        bare_ns = per_draw_ns(sampler.draw, len(sampler.steps), number)
+        print(f"{name:<18}: {engine_ns:8.1f} ns/draw  (sampler only {bare_ns:6.1f})")
+
+
+if __name__ == "__main__":
+    main()
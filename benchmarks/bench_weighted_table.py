@@ -0,0 +1,59 @@
+"""Per-draw cost of the detailed tables: old zip + random.choices vs WeightedTable.
+
+Run from the repo root:  python benchmarks/bench_weighted_table.py
+"""
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import Loadout  # noqa: E402
+
+CHOICE_LISTS = [
+    Loadout.MEDICINE_CHOICES,
+    Loadout.BANDAGE_CHOICES,
+    Loadout.MEDKIT_CHOICES,
+    Loadout.FOOD_CHOICES,
+    Loadout.WATER_CHOICES,
+    Loadout.PACK_CHOICES,
+    Loadout.GASMASK_CHOICES,
+    Loadout.POCKET_CHOICES,
+    Loadout.RESTRAINT_CHOICES,
+]
+DRAWS_PER_ROLL = len(CHOICE_LISTS)
+
+
+def old_weighted_choice(choices):
+    items, weights = zip(*choices)
+    return random.choices(items, weights=weights, k=1)[0]
+
+
+def old_detailed_parts():
+    return [old_weighted_choice(choices) for choices in CHOICE_LISTS]
+
+
+ENGINE = Loadout.LoadoutEngine()
+ENGINE.settings.include.update(dict.fromkeys(Loadout.DETAILED_TABLES, True))
+
+
+def new_detailed_parts():
+    return ENGINE._detailed()
+
+
+def per_draw_ns(fn, number):
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    return best / number / DRAWS_PER_ROLL * 1e9
+
+
+def main(number=20_000):
+    old = per_draw_ns(old_detailed_parts, number)
+    new = per_draw_ns(new_detailed_parts, number)
+    print(f"zip + random.choices : {old:8.1f} ns/draw")
+    print(f"WeightedTable.sample : {new:8.1f} ns/draw")
+    print(f"speedup              : {old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
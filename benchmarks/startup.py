@@ -0,0 +1,140 @@
+"""Cold-start time of the app, against a fixed budget.
+
+Each run launches a fresh process and times it until the window is fully
+started (first paint, deferred widgets, history and settings loaded) and has
+closed again; LOADOUT_EXIT_AFTER_STARTUP makes the app quit at that point.
+The headless import (`import Loadout`) is timed the same way, and once more
+under `python -X importtime` for the interpreter's own cumulative figure,
+which must stay under IMPORTTIME_BUDGET_US and must not include any of
+GUI_ONLY_MODULES (the window lives in loadout_gui, imported by main()).
+
+    python benchmarks/startup.py                                  # python Loadout.py
+    python benchmarks/startup.py --exe dist/LoadoutGenerator.exe  # a PyInstaller build
+    python benchmarks/startup.py --check                          # exit 1 over budget
+
+Without a display (no DISPLAY/WAYLAND_DISPLAY on Linux) the gui and exe
+cases are skipped; any other run that exits non-zero is a failure and its
+stderr is printed.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# milliseconds, median of the runs
+BUDGET_MS = {"import": 600, "gui": 2000, "exe": 3000}
+# `-X importtime` cumulative microseconds for `import Loadout`, median of the runs.
+# Recorded on the dev box: ~99 ms with tkinter at module top, ~50-65 ms after the split.
+IMPORTTIME_BUDGET_US = 150_000
+GUI_ONLY_MODULES = ("tkinter", "_tkinter", "sqlite3", "multiprocessing")
+NEEDS_DISPLAY = ("gui", "exe")
+
+
+class LaunchError(Exception):
+    """A timed run exited non-zero; the message is its stderr."""
+
+
+def has_display():
+    if sys.platform in ("win32", "darwin"):
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def launch(command, env=None):
+    """Wall-clock seconds for one run of `command`; raises LaunchError when it fails."""
+    start = time.perf_counter()
+    done = subprocess.run(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    elapsed = time.perf_counter() - start
+    if done.returncode:
+        stderr = done.stderr.decode(errors="replace").strip()
+        raise LaunchError(f"exit status {done.returncode}" + (f"\n{stderr}" if stderr else ""))
+    return elapsed
+
+
+def measure(command, runs, env=None):
+    times = [launch(command, env) * 1000 for _ in range(runs)]
+    return {"median_ms": round(statistics.median(times), 1), "best_ms": round(min(times), 1)}
+
+
+def importtime(runs):
+    """(median cumulative us of `import Loadout`, GUI-only modules it pulled in)."""
+    totals, strays = [], set()
+    for _ in range(runs):
+        done = subprocess.run([sys.executable, "-X", "importtime", "-c", "import Loadout"], cwd=ROOT,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+        for line in done.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            name = name.strip()
+            if name == "Loadout":
+                totals.append(int(cumulative))
+            elif name in GUI_ONLY_MODULES:
+                strays.add(name)
+    return statistics.median(totals), sorted(strays)
+
+
+def run(runs=5, exe=None):
+    """{case: timings, None when skipped for want of a display, or the LaunchError}."""
+    env = {**os.environ, "LOADOUT_EXIT_AFTER_STARTUP": "1"}
+    cases = {
+        "import": [sys.executable, "-c", "import Loadout"],
+        "gui": [sys.executable, str(ROOT / "Loadout.py")],
+    }
+    if exe:
+        cases["exe"] = [str(exe)]
+    display = has_display()
+    results = {}
+    for name, command in cases.items():
+        if name in NEEDS_DISPLAY and not display:
+            results[name] = None
+            continue
+        try:
+            results[name] = measure(command, runs, env)
+        except LaunchError as exc:
+            results[name] = exc
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--exe", type=Path, help="also time a frozen build")
+    parser.add_argument("--check", action="store_true", help="fail if a median is over its budget")
+    args = parser.parse_args(argv)
+
+    over = []
+    total, strays = importtime(args.runs)
+    print(f"importtime  {total / 1000:8.1f} ms  budget {IMPORTTIME_BUDGET_US / 1000:.0f} ms")
+    if total > IMPORTTIME_BUDGET_US:
+        over.append("importtime")
+    if strays:
+        print(f"`import Loadout` loaded GUI-only modules: {', '.join(strays)}")
+        over.append("headless import")
+    failed = []
+    for name, result in run(args.runs, args.exe).items():
+        if result is None:
+            print(f"{name:<8} skipped (no display)")
+            continue
+        if isinstance(result, LaunchError):
+            print(f"{name:<8} FAILED: {result}")
+            failed.append(name)
+            continue
+        budget = BUDGET_MS[name]
+        print(f"{name:<8} median {result['median_ms']:8.1f} ms  best {result['best_ms']:8.1f} ms  budget {budget} ms")
+        if result["median_ms"] > budget:
+            over.append(name)
+    if failed:
+        print(f"FAILED: {', '.join(failed)}")
+    if args.check and over:
+        print(f"OVER BUDGET: {', '.join(over)}")
+    return 1 if failed or (args.check and over) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""Benchmark every generation path, with a recorded baseline and a regression gate.
+
+Run from the repo root:
+
+    python benchmarks/suite.py                 # measure and print
+    python benchmarks/suite.py --save          # record benchmarks/baseline.json
+    python benchmarks/suite.py --check         # exit 1 if a case got slower than the baseline allows,
+                                               # or has no baseline entry
+
+Cases in the "engine" group run without a Tk root. The "gui" group drives
+LoadoutApp on a real (withdrawn) root and is skipped when no display is
+available. Timings are stored relative to a fixed pure-Python calibration
+loop measured in the same run, so a baseline recorded on one machine still
+gates runs on a faster or slower one.
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import Loadout  # noqa: E402
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_TOLERANCE = 0.5  # allowed slowdown vs baseline (0.5 = 50 %)
+REPEAT = 5
+TARGET_SECONDS = 0.05  # per repeat
+# interpreter speed differs across versions; a baseline is only comparable on its own
+PYTHON = f"{sys.version_info[0]}.{sys.version_info[1]}"
+
+
+def calibration():
+    total = 0
+    for i in range(1000):
+        total += i * i % 7
+    return total
+
+
+def _engine(all_slots=True):
+    engine = Loadout.LoadoutEngine(rng=random.Random(1), record_seeds=False)
+    if all_slots:
+        engine.settings.include.update(dict.fromkeys(engine.settings.include, True))
+    return engine
+
+
+def _engine_seeded():
+    engine = _engine()
+    engine.record_seeds = True
+    return engine
+
+
+class _StubText:
+    """Just enough of tk.Text for LoadoutApp.set_result without a Tk root."""
+
+    def config(self, **_options):
+        pass
+
+    def delete(self, *_args):
+        pass
+
+    def insert(self, *_args):
+        pass
+
+
+def engine_cases():
+    engine = _engine()
+    table = Loadout.DETAILED_TABLES["pockets"]
+    choices = Loadout.POCKET_CHOICES
+    lines = Loadout.Loadout.from_values({"weapon": "Rusty AKM", "armour": "Ceramic", "money": 0}).lines()
+    sample = engine.roll_all()
+
+    cases = {
+        "weighted_choice/list": lambda: Loadout.weighted_choice(choices),
+        "weighted_choice/table": lambda: Loadout.weighted_choice(table),
+        "detailed_parts": engine._detailed,
+        "generate_loadout": engine.roll_basic,
+        "generate_all": engine.roll_all,
+        "generate_all/seeded": _engine_seeded().roll_all,
+        "render/text": lambda: sample.text,
+        "get_line_tag": lambda: [Loadout.line_tag(line) for line in lines],
+    }
+    preset_engine = _engine(all_slots=False)
+    for name, roll in Loadout.PRESETS.items():
+        cases[f"preset/{name}"] = lambda roll=roll: roll(preset_engine)
+    return cases
+
+
+def gui_cases():
+    """(cases, Tk root or None); no cases without tkinter, only the stub ones without a display."""
+    try:
+        import loadout_gui
+    except ImportError:
+        return {}, None
+    sample = _engine().roll_all()
+    text, tags = sample.text, sample.line_tags()
+    headless = loadout_gui.LoadoutApp.__new__(loadout_gui.LoadoutApp)
+    headless.result_box = _StubText()
+    stub = {"set_result/stub": lambda: headless.set_result(text, tags)}
+    try:
+        root = loadout_gui.tk.Tk()
+    except loadout_gui.tk.TclError:
+        return stub, None
+    root.withdraw()
+    tmp = Path(tempfile.mkdtemp(prefix="loadout-bench-"))
+    # keep the real config and history untouched
+    loadout_gui.CONFIG_PATH = tmp / "loadout_config.json"
+    loadout_gui.HISTORY_PATH = tmp / "history.sqlite3"
+    app = loadout_gui.LoadoutApp(root, defer_startup=False)
+    app.autosave = False
+    cases = {
+        **stub,
+        "gui/generate_loadout": app.generate_loadout,
+        "gui/generate_all": app.generate_all,
+        "gui/set_result": lambda: app.set_result(text, tags),
+        "gui/get_line_tag": lambda: app.get_line_tag("Armour: Ceramic"),
+    }
+    for name in Loadout.PRESETS:
+        cases[f"gui/preset/{name}"] = lambda name=name: app._run_preset(name)
+    return cases, root
+
+
+def measure(fn):
+    """Best-of-REPEAT seconds per call, with the loop count sized to TARGET_SECONDS."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(1, int(number * TARGET_SECONDS / 0.2))
+    return min(timer.repeat(repeat=REPEAT, number=number)) / number
+
+
+def run(select=None):
+    calib = measure(calibration)
+    cases = engine_cases()
+    gui, root = gui_cases()
+    cases.update(gui)
+    results = {}
+    for name, fn in cases.items():
+        if select and not any(part in name for part in select):
+            continue
+        seconds = measure(fn)
+        results[name] = {"ns": round(seconds * 1e9, 1), "relative": round(seconds / calib, 4)}
+    if root is not None:
+        root.destroy()
+    return {"calibration_ns": round(calib * 1e9, 1), "gui": root is not None, "cases": results}
+
+
+def check(results, baseline, tolerance):
+    """(name, ratio) of cases slower than baseline * (1 + tolerance), relative to
+    calibration; ratio is None for a case with no baseline entry, which fails too
+    (an unrecorded case would otherwise never be gated)."""
+    failures = []
+    for name, result in results["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            failures.append((name, None))
+            continue
+        ratio = result["relative"] / base["relative"]
+        if ratio > 1 + tolerance:
+            failures.append((name, ratio))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", action="store_true", help=f"write the results to {BASELINE_PATH.name}")
+    parser.add_argument("--check", action="store_true", help="fail if slower than the baseline allows")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed slowdown for --check (default {DEFAULT_TOLERANCE})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("-k", dest="select", action="append", help="only cases whose name contains this")
+    args = parser.parse_args(argv)
+
+    results = run(args.select)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {"cases": {}}
+    if not results["gui"]:
+        print("(no display: gui cases skipped)")
+    for name, result in results["cases"].items():
+        base = baseline["cases"].get(name)
+        vs = f"{result['relative'] / base['relative']:6.2f}x baseline" if base else ""
+        print(f"{name:<32} {result['ns']:12.1f} ns/op  {vs}")
+
+    if args.save:
+        merged = {
+            "calibration_ns": results["calibration_ns"],
+            "python": PYTHON,
+            "cases": {**baseline["cases"], **results["cases"]},
+        }
+        args.baseline.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n")
+        print(f"saved {args.baseline}")
+    if args.check:
+        if baseline.get("python") not in (None, PYTHON):
+            print(f"warning: baseline recorded on Python {baseline['python']}, running on {PYTHON}")
+        failures = check(results, baseline, args.tolerance)
+        for name, ratio in failures:
+            if ratio is None:
+                print(f"NO BASELINE {name}: record it with --save -k {name}")
+            else:
+                print(f"REGRESSION {name}: {ratio:.2f}x baseline (limit {1 + args.tolerance:.2f}x)")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""Vectorized bulk rolling with NumPy.
+
+Draws N loadouts at once as integer-coded columns, one per slot, instead of
+looping LoadoutEngine.roll_all(). Each column holds indices into the slot's
+table in SLOT_VALUES (-1 = slot not rolled); strings are only produced when a
+row or column is decoded.
+
+Needs NumPy, which the GUI itself does not.
+
+    batch = roll_batch(1_000_000, seed=1)
+    (batch["weapon"] == WEAPONS.index("Rusty AKM")).mean()
+"""
+import numpy as np
+
+from Loadout import (
+    CATALOG,
+    DETAILED_TABLES,
+    DRAW_RANGES,
+    EMPTY_TAGS,
+    FLAG_SLOTS,
+    HEADER_TAGS,
+    LAYOUT_CODES,
+    LAYOUT_IDS,
+    LAYOUTS,
+    LINE_TAGS,
+    LOCK_GROUPS,
+    MODE_FLAGS,
+    PRESET_SAMPLERS,
+    SLOT_ORDER,
+    SLOT_SHIFTS,
+    SLOT_TAGS,
+    SLOT_VALUES,
+    Loadout,
+    RollSettings,
+    sidearm_tag,
+)
+from loadout_catalog import require_word64
+
+ABSENT = -1
+CHUNK_SIZE = 1 << 20  # rows per batch for iter_batches()
+# int8 covers the shipped tables; a catalog with bigger tables needs wider codes
+CODE_DTYPE = np.int8 if max(len(v) for v in SLOT_VALUES.values()) <= 127 else np.int16
+
+# modes roll_batch() can draw; include flag -> columns comes from FLAG_SLOTS
+MODES = tuple(MODE_FLAGS)
+
+
+def _as_generator(rng=None, seed=None):
+    if rng is not None:
+        return rng
+    return np.random.default_rng(seed)
+
+
+def _uniform(gen, size, n):
+    return gen.integers(0, size, n, dtype=CODE_DTYPE)
+
+
+def _weighted(gen, table, n):
+    cum = np.asarray(table.cum_weights, dtype=np.float64)
+    return np.searchsorted(cum, gen.random(n) * table.total, side="right").astype(CODE_DTYPE)
+
+
+class LoadoutBatch:
+    """Integer-coded columns for a batch of rolls; decoding is deferred."""
+
+    def __init__(self, columns, mode="all"):
+        self.columns = columns
+        self.mode = mode
+        self._decoders = {}
+
+    def __len__(self):
+        return len(next(iter(self.columns.values())))
+
+    def __getitem__(self, slot):
+        return self.columns[slot]
+
+    def decode(self, slot):
+        """Column as an object array of table values (None where absent)."""
+        decoder = self._decoders.get(slot)
+        if decoder is None:
+            decoder = np.array(SLOT_VALUES[slot] + (None,), dtype=object)
+            self._decoders[slot] = decoder
+        return decoder[self.columns[slot]]  # -1 picks the trailing None
+
+    def tags(self, slot):
+        """Column of precomputed line tags (None where absent)."""
+        lookup = np.array(SLOT_TAGS[slot] + (None,), dtype=object)
+        return lookup[self.columns[slot]]
+
+    def line_tags(self):
+        """({tag: per-row count of lines with it}, per-row line total), as Loadout.line_tags() tags them."""
+        n = len(self)
+        layout = LAYOUTS[LAYOUT_IDS[self.mode]]
+        per_tag = {tag: np.zeros(n, dtype=np.int64) for tag in LINE_TAGS}
+        lines = np.zeros(n, dtype=np.int64)
+        for tag in HEADER_TAGS[self.mode]:
+            per_tag[tag] += 1
+            lines += 1
+        for slot in layout.order:
+            if layout.sidearm and slot in ("magazines", "ammo"):
+                continue
+            column = self.columns[slot].astype(np.intp)
+            shown = column >= 0
+            if layout.sidearm and slot == "weapon":
+                ids = _sidearm_tag_ids()[column, self.columns["magazines"], self.columns["ammo"]]
+            else:
+                ids = np.array([LINE_TAGS.index(t) for t in SLOT_TAGS[slot]])[column]
+            for t, tag in enumerate(LINE_TAGS):
+                per_tag[tag] += (ids == t) & shown
+            lines += shown
+        empty = lines == 0
+        per_tag[EMPTY_TAGS[self.mode]] += empty
+        lines += empty
+        return per_tag, lines
+
+    def tag_counts(self, tag):
+        """Per row, how many lines carry `tag`."""
+        return self.line_tags()[0][tag]
+
+    def packed(self):
+        """Every row as a packed Loadout word (uint64), see Loadout.pack()."""
+        require_word64(CATALOG, "LoadoutBatch.packed()")
+        words = np.full(len(self), LAYOUT_CODES[self.mode], dtype=np.uint64)
+        for slot in SLOT_ORDER:
+            words |= (self.columns[slot] + 1).astype(np.uint64) << np.uint64(SLOT_SHIFTS[slot])
+        return words
+
+    def row(self, i):
+        packed = LAYOUT_CODES[self.mode]
+        for slot in SLOT_ORDER:
+            packed |= (int(self.columns[slot][i]) + 1) << SLOT_SHIFTS[slot]
+        return Loadout(packed)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+
+_SIDEARM_IDS = None
+
+
+def _sidearm_tag_ids():
+    # LINE_TAGS index of sidearm_tag(weapon, magazines, ammo) for every combination
+    global _SIDEARM_IDS
+    if _SIDEARM_IDS is None:
+        shape = tuple(len(SLOT_VALUES[s]) for s in ("weapon", "magazines", "ammo"))
+        _SIDEARM_IDS = np.array([LINE_TAGS.index(sidearm_tag(*i)) for i in np.ndindex(*shape)]).reshape(shape)
+    return _SIDEARM_IDS
+
+
+def roll_batch(n, settings=None, fields=None, mode="all", rng=None, seed=None):
+    """Roll n loadouts in one go.
+
+    settings/fields follow LoadoutEngine (fields holds SLOT_VALUES indices, as
+    engine.fields does): excluded slots come back as ABSENT, locked slots
+    repeat fields[slot] (or a single fresh roll when still unset).
+    """
+    settings = settings if settings is not None else RollSettings()
+    fields = fields or {}
+    gen = _as_generator(rng, seed)
+    if mode.startswith("preset="):
+        return _roll_preset(PRESET_SAMPLERS[mode.partition("=")[2]], n, gen)
+    shown_flags = MODE_FLAGS[mode]
+
+    columns = {}
+    for flag, slots in FLAG_SLOTS.items():
+        shown = flag in shown_flags and settings.include[flag]
+        locked = settings.lock.get(flag, False)
+        for slot in slots:
+            if not shown:
+                columns[slot] = np.full(n, ABSENT, CODE_DTYPE)
+                continue
+            size = 1 if locked else n
+            if slot in DETAILED_TABLES:
+                codes = _weighted(gen, DETAILED_TABLES[slot], size)
+            else:
+                codes = _uniform(gen, len(DRAW_RANGES[slot]), size)
+            if locked:
+                code = fields.get(slot)
+                codes = np.full(n, codes[0] if code is None else code, CODE_DTYPE)
+            columns[slot] = codes
+
+    return LoadoutBatch(columns, mode)
+
+
+def _roll_preset(sampler, n, gen):
+    """Presets ignore settings/locks; each sampler step becomes one column."""
+    columns = {slot: np.full(n, ABSENT, CODE_DTYPE) for slot in SLOT_ORDER}
+    for slot, index in sampler.fixed.items():
+        columns[slot][:] = index
+    for slot, shift, indices, table in sampler.steps:
+        if shift is None:
+            continue  # drawn but hidden by the preset's layout
+        lookup = np.asarray(indices, dtype=CODE_DTYPE)
+        if table is None:
+            columns[slot] = lookup[_uniform(gen, len(lookup), n)]
+        else:
+            columns[slot] = lookup[_weighted(gen, table, n)]
+    return LoadoutBatch(columns, sampler.mode)
+
+
+def iter_batches(count, settings=None, mode="all", seed=None, chunk_size=CHUNK_SIZE):
+    """LoadoutBatch chunks totalling `count` rolls from one seeded generator.
+
+    Locked slots are rolled once in the first chunk and repeated in the rest,
+    as they would be for a single roll_batch() of the whole count.
+    """
+    if count < 0:
+        raise ValueError(f"count must be >= 0, got {count}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be > 0, got {chunk_size}")
+    settings = settings if settings is not None else RollSettings()
+    gen = np.random.default_rng(seed)
+    fields = {}
+    done = 0
+    while done < count:
+        size = min(chunk_size, count - done)
+        batch = roll_batch(size, settings, fields, mode=mode, rng=gen)
+        if not done:
+            for flag, slots in LOCK_GROUPS.items():
+                if settings.lock.get(flag):
+                    fields.update((slot, int(batch[slot][0])) for slot in slots if batch[slot][0] != ABSENT)
+        done += size
+        yield batch
@@ -0,0 +1,301 @@
+"""Item catalog: loading, validation and the compiled cache.
+
+All item tables, weights, the money grid and preset pools live in
+catalog.json so balance tweaks do not need a new build. Loading validates the
+file and compiles it into plain index tables; the compiled form is kept in a
+marshal sidecar (catalog.cache) keyed by the catalog's SHA-256, so later starts
+skip parsing and validation entirely.
+
+Lookup order for the catalog file: $LOADOUT_CATALOG, a catalog.json next to a
+frozen executable, then the one shipped beside this module.
+"""
+import hashlib
+import json
+import marshal
+import os
+import sys
+from pathlib import Path
+
+CATALOG_VERSION = 1
+CACHE_FORMAT = 5  # bump when the compiled layout changes
+# LoadoutArray (array("Q")) and LoadoutBatch.packed() (uint64) hold one packed
+# roll per unsigned 64-bit word; Loadout.packed itself has no limit
+WORD_BITS = 64
+
+BASIC_SLOTS = ("melee", "weapon", "magazines", "ammo", "armour", "filter")
+DETAILED_SLOTS = ("medicine", "bandages", "medkits", "food", "water", "pack", "gasmask", "pockets", "restraints")
+SLOT_ORDER = BASIC_SLOTS + DETAILED_SLOTS + ("money",)
+# settings checkboxes a preset can switch on/off (magazines/ammo follow weapon)
+INCLUDE_FLAGS = ("melee", "weapon", "armour", "filter", "money") + DETAILED_SLOTS
+# all, basic, detailed, money; every preset adds one more (see Loadout.LAYOUTS)
+NORMAL_LAYOUTS = 4
+
+
+class CatalogError(ValueError):
+    """The catalog file is missing pieces or contradicts itself."""
+
+
+def default_catalog_path():
+    env = os.environ.get("LOADOUT_CATALOG")
+    if env:
+        return Path(env)
+    if getattr(sys, "frozen", False):
+        beside_exe = Path(sys.executable).with_name("catalog.json")
+        if beside_exe.exists():
+            return beside_exe
+        return Path(getattr(sys, "_MEIPASS", Path(sys.executable).parent)) / "catalog.json"
+    return Path(__file__).with_name("catalog.json")
+
+
+def cache_path_for(path):
+    return Path(path).with_suffix(".cache")
+
+
+# --- Validation ---
+def _require(cond, message):
+    if not cond:
+        raise CatalogError(message)
+
+
+def _check_values(where, values):
+    _require(isinstance(values, list) and values, f"{where}: expected a non-empty list")
+    for v in values:
+        _require(isinstance(v, (str, int)) and not isinstance(v, bool), f"{where}: {v!r} is not a string or integer")
+    _require(len(set(values)) == len(values), f"{where}: duplicate entries")
+
+
+def validate(data):
+    _require(isinstance(data, dict), "catalog: expected a JSON object")
+    _require(data.get("version") == CATALOG_VERSION,
+             f"catalog: unsupported version {data.get('version')!r} (expected {CATALOG_VERSION})")
+
+    basic = data.get("basic", {})
+    _require(set(basic) == set(BASIC_SLOTS), f"basic: expected exactly {', '.join(BASIC_SLOTS)}")
+    for slot in BASIC_SLOTS:
+        _check_values(f"basic.{slot}", basic[slot])
+
+    money = data.get("money", {})
+    for key in ("min", "max", "step"):
+        _require(isinstance(money.get(key), int), f"money.{key}: expected an integer")
+    _require(money["step"] > 0 and money["min"] <= money["max"], "money: need step > 0 and min <= max")
+
+    detailed = data.get("detailed", {})
+    _require(set(detailed) == set(DETAILED_SLOTS), f"detailed: expected exactly {', '.join(DETAILED_SLOTS)}")
+    for slot in DETAILED_SLOTS:
+        rows = detailed[slot]
+        _require(isinstance(rows, list) and rows, f"detailed.{slot}: expected a non-empty list")
+        for row in rows:
+            _require(isinstance(row, list) and len(row) == 2, f"detailed.{slot}: {row!r} is not [item, weight]")
+            _require(isinstance(row[1], (int, float)) and row[1] > 0, f"detailed.{slot}: weight of {row[0]!r} must be > 0")
+        _check_values(f"detailed.{slot}", [row[0] for row in rows])
+
+    extras = data.get("extras", {})
+    for slot, values in extras.items():
+        _require(slot in BASIC_SLOTS or slot in DETAILED_SLOTS, f"extras: unknown slot {slot!r}")
+        _check_values(f"extras.{slot}", values)
+
+    presets = data.get("presets", {})
+    _require(isinstance(presets, dict), "presets: expected an object")
+    return data
+
+
+# --- Compilation ---
+def _slot_values(data):
+    money = data["money"]
+    extras = data.get("extras", {})
+    values = {}
+    for slot in BASIC_SLOTS:
+        values[slot] = list(data["basic"][slot]) + list(extras.get(slot, ()))
+    for slot in DETAILED_SLOTS:
+        values[slot] = [row[0] for row in data["detailed"][slot]] + list(extras.get(slot, ()))
+    values["money"] = list(range(money["min"], money["max"] + 1, money["step"]))
+    for slot, vals in values.items():
+        _require(len(set(vals)) == len(vals), f"extras.{slot}: repeats a value already in the table")
+    return values
+
+
+def _compile_preset(name, spec, data, values, index, draw_sizes):
+    """One preset -> its draw plan.
+
+    draws is a tuple of (slot, indices, weights) in the order the RNG is
+    consumed; weights is None for a uniform pick among indices. Unrestricted
+    basic slots and money draw from the whole table, detailed slots use the
+    catalog weights; "pools" narrows a slot to a list, "weights" overrides or
+    (with 0) removes single items. Values from the catalog-wide "extras" must
+    also be listed under the preset's own "extras", so one preset's
+    off-table values do not silently become legal for every other preset.
+    """
+    where = f"presets.{name}"
+    _require(isinstance(spec, dict), f"{where}: expected an object")
+
+    def lookup(slot, value):
+        _require(slot in index, f"{where}: unknown slot {slot!r}")
+        _require(value in index[slot], f"{where}.{slot}: {value!r} is not in the catalog (add it to extras?)")
+        return index[slot][value]
+
+    def mapping(key, value):
+        _require(isinstance(value, dict), f"{where}.{key}: expected an object")
+        return value
+
+    def slots(key, allowed):
+        names = spec.get(key, [])
+        _require(isinstance(names, list), f"{where}.{key}: expected a list")
+        for slot in names:
+            _require(slot in allowed, f"{where}.{key}: unknown slot {slot!r}")
+        return tuple(names)
+
+    allowed = {}
+    for slot, extra in mapping("extras", spec.get("extras", {})).items():
+        _require(isinstance(extra, list), f"{where}.extras.{slot}: expected a list")
+        allowed[slot] = tuple(lookup(slot, v) for v in extra)
+        base = draw_sizes[slot] if slot in draw_sizes else len(data["detailed"][slot])
+        _require(all(i >= base for i in allowed[slot]), f"{where}.extras.{slot}: lists a value of the plain table")
+
+    draw = slots("draw", SLOT_ORDER)
+    _require(len(set(draw)) == len(draw), f"{where}.draw: duplicate slots")
+    fixed = {slot: lookup(slot, v) for slot, v in mapping("fixed", spec.get("fixed", {})).items()}
+    _require(not set(fixed) & set(draw), f"{where}: a slot cannot be both drawn and fixed")
+
+    pools = {}
+    for slot, pool in mapping("pools", spec.get("pools", {})).items():
+        _require(slot in draw, f"{where}.pools.{slot}: slot is not in draw")
+        if slot == "money":
+            _require(isinstance(pool, dict) and all(isinstance(pool.get(k), (int, float)) for k in ("min", "max")),
+                     f"{where}.money: expected {{\"min\": .., \"max\": ..}}")
+            grid = values["money"]
+            pools[slot] = tuple(i for i, v in enumerate(grid) if pool["min"] <= v <= pool["max"])
+            _require(pools[slot], f"{where}.money: range matches no money step")
+        else:
+            _require(isinstance(pool, list) and pool, f"{where}.{slot}: expected a non-empty list")
+            pools[slot] = tuple(lookup(slot, v) for v in pool)
+
+    overrides = mapping("weights", spec.get("weights", {}))
+    for slot, table in overrides.items():
+        mapping(f"weights.{slot}", table)
+    draws = []
+    for slot in draw:
+        if slot in pools:
+            indices, weights = pools[slot], None
+        elif slot in DETAILED_SLOTS:
+            indices = tuple(range(len(data["detailed"][slot])))
+            weights = tuple(row[1] for row in data["detailed"][slot])
+        else:
+            indices, weights = tuple(range(draw_sizes[slot])), None
+        if slot in overrides:
+            table = dict(zip(indices, weights or [1] * len(indices)))
+            for value, weight in overrides[slot].items():
+                _require(isinstance(weight, (int, float)) and weight >= 0,
+                         f"{where}.weights.{slot}: weight of {value!r} must be >= 0")
+                if value not in index.get(slot, ()) and value.isdigit():
+                    value = int(value)  # JSON keys are strings; filters/money are ints
+                table[lookup(slot, value)] = weight
+            table = {i: w for i, w in table.items() if w > 0}
+            _require(table, f"{where}.weights.{slot}: every item has weight 0")
+            indices, weights = tuple(table), tuple(table.values())
+        draws.append((slot, indices, weights))
+    for slot in overrides:
+        _require(slot in draw, f"{where}.weights.{slot}: slot is not in draw")
+
+    order = slots("order", SLOT_ORDER) if "order" in spec else SLOT_ORDER
+    header = spec.get("header", [])
+    _require(isinstance(header, list) and all(isinstance(line, str) for line in header),
+             f"{where}.header: expected a list of strings")
+    return {
+        "label": str(spec.get("label", name.replace("_", " ").title())),
+        "header": tuple(header),
+        "order": order,
+        "sidearm": bool(spec.get("sidearm", False)),
+        "include": slots("include", INCLUDE_FLAGS),
+        "exclude": slots("exclude", INCLUDE_FLAGS),
+        "draws": tuple(draws),
+        "fixed": fixed,
+        "extras": allowed,
+    }
+
+
+def _packed_bits(values, presets):
+    """Bits a packed roll needs: each slot's code (index + 1), then the layout id."""
+    layouts = NORMAL_LAYOUTS + len(presets)
+    return sum(len(vals).bit_length() for vals in values.values()) + (layouts - 1).bit_length()
+
+
+def compile_catalog(data):
+    """Validated catalog -> plain tuples/dicts (marshal-able) the engine runs on."""
+    validate(data)
+    values = _slot_values(data)
+    index = {slot: {v: i for i, v in enumerate(vals)} for slot, vals in values.items()}
+    draw_sizes = {slot: len(data["basic"][slot]) for slot in BASIC_SLOTS}
+    draw_sizes["money"] = len(values["money"])
+    weights = {slot: tuple(row[1] for row in data["detailed"][slot]) for slot in DETAILED_SLOTS}
+    money = data["money"]
+    return {
+        "format": CACHE_FORMAT,
+        "version": data["version"],
+        "values": {slot: tuple(vals) for slot, vals in values.items()},
+        "index": index,
+        "draw_sizes": draw_sizes,
+        "weights": weights,
+        "money": (money["min"], money["max"], money["step"]),
+        "packed_bits": _packed_bits(values, data.get("presets", {})),
+        "presets": {
+            name: _compile_preset(name, spec, data, values, index, draw_sizes)
+            for name, spec in data.get("presets", {}).items()
+        },
+    }
+
+
+def require_word64(compiled, what):
+    """CatalogError unless a packed roll of this catalog fits the 64-bit word `what` stores."""
+    bits = compiled["packed_bits"]
+    _require(bits <= WORD_BITS,
+             f"catalog too large for {what}: a packed roll needs {bits} bits, at most {WORD_BITS} fit")
+
+
+# --- Loading ---
+def _read_cache(cache, digest):
+    try:
+        blob = cache.read_bytes()
+    except OSError:
+        return None
+    try:
+        cached_digest, compiled = marshal.loads(blob)
+    except (EOFError, ValueError, TypeError):
+        return None
+    if cached_digest != digest or compiled.get("format") != CACHE_FORMAT:
+        return None
+    return compiled
+
+
+def _write_cache(cache, digest, compiled):
+    tmp = cache.with_name(cache.name + ".tmp")
+    try:
+        tmp.write_bytes(marshal.dumps((digest, compiled)))
+        os.replace(tmp, cache)
+    except OSError:
+        # read-only install (e.g. the one-file bundle); just compile next time
+        pass
+
+
+def load_catalog(path=None, use_cache=True):
+    path = Path(path) if path is not None else default_catalog_path()
+    try:
+        raw = path.read_bytes()
+    except OSError as exc:
+        raise CatalogError(f"cannot read catalog {path}: {exc}") from exc
+    digest = hashlib.sha256(raw).hexdigest()
+
+    cache = cache_path_for(path)
+    if use_cache:
+        compiled = _read_cache(cache, digest)
+        if compiled is not None:
+            return compiled
+
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except ValueError as exc:
+        raise CatalogError(f"{path}: invalid JSON ({exc})") from exc
+    compiled = compile_catalog(data)
+    compiled["digest"] = digest  # names this catalog, e.g. in loadout_history's database
+    if use_cache:
+        _write_cache(cache, digest, compiled)
+    return compiled
@@ -0,0 +1,236 @@
+"""Statistical conformance check: do the generators draw what the catalog declares?
+
+Rolls a large sample of every mode and preset and, slot by slot:
+  * checks every emitted value belongs to the table the catalog declares for
+    it (the plain lists for the normal modes, the preset's pool or fixed value
+    for presets);
+  * checks every preset pool and fixed value is in the slot's plain table,
+    or is an extra the preset lists under its own "extras" (the catalog-wide
+    extras list alone does not make a value legal for every preset);
+  * runs a chi-square goodness-of-fit test of the observed counts against the
+    declared weights (uniform for plain lists and pools).
+
+The expectations are built straight from the compiled catalog, not from the
+engine's tables or samplers, so a sampler that drifts from its declaration is
+caught. Rolls are seeded, so a run is reproducible.
+
+    python loadout_conformance.py [--samples 20000] [--seed 1] [--bulk]
+"""
+import argparse
+import math
+import random
+import sys
+from collections import Counter
+
+from Loadout import CATALOG, FLAG_SLOTS, MODE_FLAGS, PRESETS, SLOT_VALUES, LoadoutEngine, RollSettings, resolve_mode
+
+ALPHA = 1e-4  # per test; ~100 tests per run, so a false alarm is rare
+
+
+# --- chi-square survival function (regularized upper incomplete gamma) ---
+def _gammq(a, x):
+    if x <= 0:
+        return 1.0
+    gln = math.lgamma(a)
+    if x < a + 1:
+        # series for P(a, x)
+        term = total = 1.0 / a
+        n = a
+        for _ in range(1000):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return 1.0 - total * math.exp(-x + a * math.log(x) - gln)
+    # continued fraction for Q(a, x)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(-x + a * math.log(x) - gln) * h
+
+
+def chi2_sf(stat, dof):
+    return _gammq(dof / 2, stat / 2)
+
+
+def chi_square(observed, expected, n, min_expected=5.0):
+    """(statistic, dof, p) for counts vs probabilities; sparse cells are pooled."""
+    cells, pooled_obs, pooled_exp = [], 0, 0.0
+    for key, p in expected.items():
+        e = p * n
+        if e < min_expected:
+            pooled_obs += observed.get(key, 0)
+            pooled_exp += e
+        else:
+            cells.append((observed.get(key, 0), e))
+    if pooled_exp > 0:
+        cells.append((pooled_obs, pooled_exp))
+    dof = len(cells) - 1
+    if dof < 1:
+        return 0.0, 0, 1.0
+    stat = sum((o - e) ** 2 / e for o, e in cells)
+    return stat, dof, chi2_sf(stat, dof)
+
+
+# --- declared distributions, straight from the catalog ---
+def _uniform(indices):
+    p = 1 / len(indices)
+    dist = {}
+    for i in indices:
+        dist[i] = dist.get(i, 0) + p
+    return dist
+
+
+def _weighted(indices, weights):
+    total = sum(weights)
+    dist = {}
+    for i, w in zip(indices, weights):
+        dist[i] = dist.get(i, 0) + w / total
+    return dist
+
+
+def declared(mode):
+    """slot -> {SLOT_VALUES index: probability} the catalog promises for `mode`.
+
+    Normal modes are checked with every slot included and nothing locked.
+    """
+    if mode.startswith("preset="):
+        spec = CATALOG["presets"][mode.partition("=")[2]]
+        dists = {slot: {index: 1.0} for slot, index in spec["fixed"].items()}
+        for slot, indices, weights in spec["draws"]:
+            dists[slot] = _uniform(indices) if weights is None else _weighted(indices, weights)
+        return {slot: dists[slot] for slot in spec["order"] if slot in dists}
+
+    sizes = CATALOG["draw_sizes"]
+    weights = CATALOG["weights"]
+    dists = {}
+    for flag in MODE_FLAGS[mode]:
+        for slot in FLAG_SLOTS[flag]:
+            if slot in weights:
+                dists[slot] = _weighted(range(len(weights[slot])), weights[slot])
+            else:
+                dists[slot] = _uniform(range(sizes[slot]))
+    return dists
+
+
+def _plain_size(slot):
+    sizes = CATALOG["draw_sizes"]
+    return sizes[slot] if slot in sizes else len(CATALOG["weights"][slot])
+
+
+def off_table(mode):
+    """List of (slot, problem) for preset values outside the plain tables that the preset does not allow."""
+    if not mode.startswith("preset="):
+        return []
+    spec = CATALOG["presets"][mode.partition("=")[2]]
+    used = {slot: {index} for slot, index in spec["fixed"].items()}
+    for slot, indices, _weights in spec["draws"]:
+        used[slot] = set(indices)
+    problems = []
+    for slot, indices in used.items():
+        allowed = spec["extras"].get(slot, ())
+        stray = [SLOT_VALUES[slot][i] for i in sorted(indices) if i >= _plain_size(slot) and i not in allowed]
+        if stray:
+            problems.append((slot, f"values outside the {slot} table, not in the preset's extras: {stray!r}"))
+    return problems
+
+
+# --- sampling ---
+def _all_included():
+    settings = RollSettings()
+    settings.include.update(dict.fromkeys(settings.include, True))
+    settings.lock.update(dict.fromkeys(settings.lock, False))
+    return settings
+
+
+def sample_engine(mode, n, seed):
+    engine = LoadoutEngine(_all_included(), random.Random(seed), record_seeds=False)
+    roll = resolve_mode(mode)
+    counts = {}
+    for _ in range(n):
+        for slot, index in roll(engine).codes.items():
+            counts.setdefault(slot, Counter())[index] += 1
+    return counts
+
+
+def sample_bulk(mode, n, seed):
+    import loadout_bulk
+    batch = loadout_bulk.roll_batch(n, _all_included(), mode=mode, seed=seed)
+    counts = {}
+    for slot, column in batch.columns.items():
+        present = column[column >= 0]
+        if len(present):
+            values, freq = loadout_bulk.np.unique(present, return_counts=True)
+            counts[slot] = Counter(dict(zip(values.tolist(), freq.tolist())))
+    return counts
+
+
+def modes():
+    return [*MODE_FLAGS, *(f"preset={name}" for name in PRESETS)]
+
+
+def check_mode(mode, counts, n, alpha=ALPHA):
+    """List of (slot, problem) for one mode's sample; empty when it conforms."""
+    problems = off_table(mode)
+    expected = declared(mode)
+    for slot in sorted(set(counts) | set(expected), key=list(SLOT_VALUES).index):
+        observed = counts.get(slot, Counter())
+        if slot not in expected:
+            problems.append((slot, "emitted but not declared for this mode"))
+            continue
+        seen = sum(observed.values())
+        if seen != n:
+            problems.append((slot, f"present in {seen} of {n} rolls"))
+            continue
+        stray = [SLOT_VALUES[slot][i] for i in observed if i not in expected[slot]]
+        if stray:
+            problems.append((slot, f"values outside the declared table: {stray[:5]!r}"))
+            continue
+        stat, dof, p = chi_square(observed, expected[slot], n)
+        if p < alpha:
+            problems.append((slot, f"chi2={stat:.1f} dof={dof} p={p:.2e}"))
+    return problems
+
+
+def run(samples=20_000, seed=1, bulk=False, out=sys.stdout):
+    sample = sample_bulk if bulk else sample_engine
+    failures = 0
+    for i, mode in enumerate(modes()):
+        counts = sample(mode, samples, seed + i)
+        problems = check_mode(mode, counts, samples)
+        status = "ok" if not problems else "FAIL"
+        print(f"{mode:<26} {len(counts):2d} slots  {status}", file=out)
+        for slot, problem in problems:
+            print(f"    {slot}: {problem}", file=out)
+        failures += len(problems)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check rolled frequencies against the catalog's declared weights.")
+    parser.add_argument("--samples", type=int, default=20_000, help="rolls per mode (default 20000)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--bulk", action="store_true", help="check the NumPy roller (loadout_bulk) instead")
+    args = parser.parse_args(argv)
+    failures = run(args.samples, args.seed, args.bulk)
+    print(f"{failures} problem(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
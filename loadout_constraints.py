@@ -0,0 +1,174 @@
+"""Constrained rolls: sample only loadouts that satisfy given rules, without rerolling.
+
+The slot distributions from loadout_odds are conditioned up front. Per-slot
+rules filter and renormalize a table. Rules over the whole roll ("at least
+one medical item", "money under 50k") become a small state (how many lines
+matched so far, running total) and a dynamic program over the slots computes,
+for every reachable state, how much probability mass can still end in an
+accepted roll. Each slot is then drawn from its table reweighted by that
+mass: one bisect per slot, the same as an unconstrained roll, and the result
+is distributed exactly like rolling until the rules hold.
+
+    shotgun = ConstrainedSampler(
+        "all",
+        allow={"weapon": lambda w: w.startswith("Mossberg")},
+        at_least=[(1, lambda slot, v: slot in ("medicine", "bandages", "medkits") and v != "None")],
+        budget=(money_value, 0, 50_000),
+    )
+    shotgun.roll().text
+"""
+import random
+from bisect import bisect_right
+from fractions import Fraction
+from itertools import accumulate
+
+from Loadout import LAYOUT_CODES, SLOT_SHIFTS, SLOT_VALUES, Loadout, LoadoutArray, format_line, line_tag
+from loadout_odds import slot_model
+
+
+class UnsatisfiableError(ValueError):
+    """No roll of the mode can meet the constraints."""
+
+
+def money_value(slot, value):
+    """Budget value of a line: the money amount, 0 for everything else."""
+    return value if slot == "money" else 0
+
+
+def tagged(tag):
+    """at_least test: the line renders with `tag` ("good"/"bad")."""
+    return lambda slot, value: line_tag(format_line(slot, value)) == tag
+
+
+def _allowed(rule):
+    if callable(rule):
+        return rule
+    if isinstance(rule, (set, frozenset, list, tuple)):
+        rule = frozenset(rule)
+        return rule.__contains__
+    return lambda value: value == rule
+
+
+class ConstrainedSampler:
+    """Roll `mode` under constraints; build once, roll as often as needed.
+
+    allow: slot -> allowed value, collection of values, or predicate(value).
+    at_least: (k, test(slot, value)) pairs; at least k displayed slots pass test.
+    budget: (value(slot, value), low, high); the summed non-negative values of
+    the displayed slots lie in [low, high].
+
+    settings/fields (locks) work as in loadout_odds.slot_model. Raises
+    UnsatisfiableError when no roll qualifies; `probability` is the exact
+    chance that an unconstrained roll would have qualified.
+    """
+
+    def __init__(self, mode="all", settings=None, fields=None, allow=None, at_least=(), budget=None):
+        self.mode = mode
+        model = slot_model(mode, settings, fields)
+        allow = {slot: _allowed(rule) for slot, rule in (allow or {}).items()}
+        for slot in allow:
+            if slot not in model:
+                raise UnsatisfiableError(f"{mode} does not show {slot!r}")
+        at_least = tuple(at_least)
+        need = tuple(k for k, _test in at_least)
+        value_of, low, high = budget if budget is not None else (None, 0, 0)
+
+        # per slot: (index, probability, counted hits, budget value)
+        steps = []
+        for slot, dist in model.items():
+            values = SLOT_VALUES[slot]
+            options = []
+            for index, p in dist.items():
+                value = values[index]
+                if slot in allow and not allow[slot](value):
+                    continue
+                hits = tuple(int(bool(test(slot, value))) for _k, test in at_least)
+                cost = value_of(slot, value) if value_of is not None else 0
+                if cost < 0:
+                    raise ValueError(f"budget value of {slot}={value!r} is negative")
+                options.append((index, p, hits, cost))
+            if not options:
+                raise UnsatisfiableError(f"no allowed value for {slot!r}")
+            steps.append((slot, options))
+
+        def advance(state, hits, cost):
+            counts, total = state
+            counts = tuple(min(c + h, k) for c, h, k in zip(counts, hits, need))
+            return counts, total + cost
+
+        def accepted(state):
+            counts, total = state
+            return counts == need and (value_of is None or low <= total <= high)
+
+        # forward: reachable states per step (totals over `high` can never come back)
+        reachable = [{(tuple(0 for _ in need), 0)}]
+        for _slot, options in steps:
+            nxt = set()
+            for state in reachable[-1]:
+                for _index, _p, hits, cost in options:
+                    new = advance(state, hits, cost)
+                    if value_of is None or new[1] <= high:
+                        nxt.add(new)
+            reachable.append(nxt)
+
+        # backward: mass[i][state] = P(accepted finish | state before step i)
+        mass = [None] * len(steps) + [{s: Fraction(int(accepted(s))) for s in reachable[-1]}]
+        for i in range(len(steps) - 1, -1, -1):
+            after = mass[i + 1]
+            mass[i] = {
+                state: sum(
+                    (p * after.get(advance(state, hits, cost), 0) for _index, p, hits, cost in steps[i][1]),
+                    Fraction(0),
+                )
+                for state in reachable[i]
+            }
+        start = (tuple(0 for _ in need), 0)
+        self.probability = mass[0][start]
+        if not self.probability:
+            raise UnsatisfiableError(f"no {mode} roll meets the constraints")
+
+        # per step and state: cumulative weights over the options still viable
+        self._plan = []
+        for i, (slot, options) in enumerate(steps):
+            tables = {}
+            for state, m in mass[i].items():
+                if not m:
+                    continue
+                picks = []
+                for index, p, hits, cost in options:
+                    new = advance(state, hits, cost)
+                    w = p * mass[i + 1].get(new, 0)
+                    if w:
+                        picks.append((index, new, float(w / m)))
+                indices, states, weights = zip(*picks)
+                tables[state] = (tuple(accumulate(weights)), indices, states)
+            self._plan.append((SLOT_SHIFTS[slot], tables))
+        self._start = start
+
+    def draw(self, rng=random):
+        """Packed slot codes (no layout bits) for one qualifying roll."""
+        state = self._start
+        codes = 0
+        for shift, tables in self._plan:
+            cum, indices, states = tables[state]
+            pos = bisect_right(cum, rng.random() * cum[-1])
+            codes |= (indices[pos] + 1) << shift
+            state = states[pos]
+        return codes
+
+    def roll(self, rng=None, seed=None):
+        """One qualifying Loadout; the same seed gives the same roll from this sampler.
+
+        The result carries seed=None: Loadout.seed means "LoadoutEngine.replay
+        reproduces this", which does not hold for a constrained draw.
+        """
+        if rng is None:
+            rng = random.Random(seed) if seed is not None else random
+        return Loadout(self.draw(rng) | LAYOUT_CODES[self.mode])
+
+    def roll_many(self, n, rng=random):
+        layout = LAYOUT_CODES[self.mode]
+        draw = self.draw
+        rolls = LoadoutArray()
+        rolls.words.extend(draw(rng) | layout for _ in range(n))
+        return rolls
@@ -0,0 +1,133 @@
+"""Columnar export of bulk rolls: Parquet, Arrow IPC or memory-mapped .npy.
+
+Rolls come from loadout_bulk in chunks and are written as they are made, so
+an export of any size only ever holds one chunk in memory. Every slot is one
+dictionary-encoded column: the stored values are indices into the slot's
+table in SLOT_VALUES, and the table itself is the dictionary.
+
+  * parquet / arrow: one dictionary<int8, string|int64> column per slot
+    (int64 where the table is all numbers, e.g. money; text otherwise), null
+    where the slot was not rolled; a row group / record batch per chunk.
+    Needs pyarrow.
+  * npy: a directory with <slot>.npy (int8 codes, -1 = not rolled), written
+    through np.lib.format.open_memmap, plus dictionary.json holding the tables.
+    open_npy() maps it back without reading it into memory.
+
+    python Loadout.py export rolls.parquet --count 50_000_000 --seed 1
+"""
+import json
+from pathlib import Path
+
+from Loadout import SLOT_ORDER, SLOT_VALUES
+from loadout_bulk import ABSENT, CHUNK_SIZE, CODE_DTYPE, MODES, LoadoutBatch, iter_batches, np
+
+FORMATS = ("parquet", "arrow", "npy")
+DICTIONARY_FILE = "dictionary.json"
+
+
+class ExportError(ValueError):
+    """The export cannot be written as asked."""
+
+
+# --- Arrow / Parquet ---
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise ExportError("parquet/arrow export needs pyarrow (pip install pyarrow); npy does not") from None
+    return pyarrow
+
+
+def _numeric(slot):
+    return all(isinstance(value, int) for value in SLOT_VALUES[slot])
+
+
+def arrow_schema(pa):
+    index_type = pa.from_numpy_dtype(CODE_DTYPE)
+    fields = []
+    for slot in SLOT_ORDER:
+        value_type = pa.int64() if _numeric(slot) else pa.string()
+        fields.append(pa.field(slot, pa.dictionary(index_type, value_type)))
+    return pa.schema(fields)
+
+
+def _dictionaries(pa, schema):
+    return {
+        slot: pa.array(SLOT_VALUES[slot] if _numeric(slot) else list(map(str, SLOT_VALUES[slot])),
+                       type=schema.field(slot).type.value_type)
+        for slot in SLOT_ORDER
+    }
+
+
+def to_record_batch(pa, batch, schema, dictionaries):
+    arrays = []
+    for slot in SLOT_ORDER:
+        codes = batch[slot]
+        indices = pa.array(codes, mask=codes == ABSENT, type=schema.field(slot).type.index_type)
+        arrays.append(pa.DictionaryArray.from_arrays(indices, dictionaries[slot]))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _write_arrow(path, batches, parquet):
+    pa = _pyarrow()
+    schema = arrow_schema(pa)
+    dictionaries = _dictionaries(pa, schema)
+    writer = pa.parquet.ParquetWriter(str(path), schema) if parquet else pa.ipc.new_file(str(path), schema)
+    rows = 0
+    try:
+        for batch in batches:
+            writer.write_batch(to_record_batch(pa, batch, schema, dictionaries))
+            rows += len(batch)
+    finally:
+        writer.close()
+    return rows
+
+
+# --- NPY ---
+def _write_npy(path, batches, count, mode):
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    columns = {
+        slot: np.lib.format.open_memmap(path / f"{slot}.npy", mode="w+", dtype=CODE_DTYPE, shape=(count,))
+        for slot in SLOT_ORDER
+    }
+    rows = 0
+    for batch in batches:
+        for slot, column in columns.items():
+            column[rows:rows + len(batch)] = batch[slot]
+        rows += len(batch)
+    for column in columns.values():
+        column.flush()
+    meta = {"mode": mode, "rows": rows, "absent": ABSENT, "dictionary": {slot: SLOT_VALUES[slot] for slot in SLOT_ORDER}}
+    (path / DICTIONARY_FILE).write_text(json.dumps(meta), encoding="utf-8")
+    return rows
+
+
+def open_npy(path):
+    """The LoadoutBatch of an npy export, its columns memory-mapped read-only."""
+    path = Path(path)
+    meta = json.loads((path / DICTIONARY_FILE).read_text(encoding="utf-8"))
+    if meta["dictionary"] != {slot: list(SLOT_VALUES[slot]) for slot in SLOT_ORDER}:
+        raise ExportError(f"{path} was written with a different catalog")
+    columns = {slot: np.load(path / f"{slot}.npy", mmap_mode="r") for slot in SLOT_ORDER}
+    return LoadoutBatch(columns, meta["mode"])
+
+
+def export(path, count, fmt="parquet", settings=None, mode="all", seed=None, chunk_size=CHUNK_SIZE):
+    """Roll `count` loadouts into `path`; returns the number of rows written."""
+    if fmt not in FORMATS:
+        raise ExportError(f"unknown format {fmt!r} (choose from {', '.join(FORMATS)})")
+    if count < 0:
+        raise ExportError(f"count must be >= 0, got {count}")
+    if chunk_size < 1:
+        raise ExportError(f"chunk size must be > 0, got {chunk_size}")
+    if mode not in MODES and not mode.startswith("preset="):
+        raise ExportError(f"mode {mode!r} has no bulk roller (use {', '.join(MODES)} or preset=<name>)")
+    if fmt != "npy":
+        _pyarrow()  # fail before rolling anything
+    batches = iter_batches(count, settings, mode, seed, chunk_size)
+    if fmt == "npy":
+        return _write_npy(path, batches, count, mode)
+    return _write_arrow(path, batches, parquet=fmt == "parquet")
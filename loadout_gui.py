@@ -0,0 +1,725 @@
+"""The Tk window: LoadoutApp and its widget helpers.
+
+Kept out of Loadout.py so the data tables, engine and CLI import without
+tkinter; Loadout.main() imports this module only when it opens the window.
+"""
+import queue
+import sqlite3
+import sys
+import tkinter as tk
+from pathlib import Path
+from tkinter import messagebox
+
+from Loadout import PRESET_SAMPLERS, SLOT_VALUES, LoadoutEngine, RollSettings, line_tag
+from loadout_settings import SettingsError, SettingsFile
+
+
+def _data_path(name):
+    # frozen: beside the .exe, since a onefile build's own files sit in a temp
+    # dir that is deleted on exit
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).with_name(name)
+    return Path(__file__).with_name(name)
+
+
+SETTINGS_POLL_MS = 250  # how often the Tk thread checks for background save errors
+
+CONFIG_PATH = _data_path("loadout_config.json")
+HISTORY_PATH = _data_path("loadout_history.sqlite3")
+
+
+# --- Tooltip helper ---
+class ToolTip:
+    def __init__(self, widget, text):
+        self.widget = widget
+        self.text = text
+        self.tip = None
+        widget.bind("<Enter>", self.show)
+        widget.bind("<Leave>", self.hide)
+
+    def show(self, _event=None):
+        if self.tip is not None:
+            return
+        x = self.widget.winfo_rootx() + 10
+        y = self.widget.winfo_rooty() + 20
+        self.tip = tk.Toplevel(self.widget)
+        self.tip.wm_overrideredirect(True)
+        self.tip.wm_geometry(f"+{x}+{y}")
+        label = tk.Label(
+            self.tip,
+            text=self.text,
+            bg="#222222",
+            fg="#ffcccc",
+            relief="solid",
+            borderwidth=1,
+            font=("Arial", 8),
+        )
+        label.pack(ipadx=4, ipady=2)
+
+    def hide(self, _event=None):
+        if self.tip is not None:
+            self.tip.destroy()
+            self.tip = None
+
+
+# --- Virtualized list helper ---
+class VirtualList:
+    """A Listbox that shows a window onto a long list fetched on demand.
+
+    fetch(offset, limit) returns (key, text) pairs for rows offset.. of the
+    list; only the rows that fit in the box ever become Listbox items and the
+    scrollbar is driven by `total`, so 100k rows cost the same as 10.
+    prepend() adds a new first row in O(1).
+    """
+
+    def __init__(self, parent, fetch, **options):
+        self.fetch = fetch
+        self.total = 0
+        self.offset = 0
+        self.keys = []
+        self.listbox = tk.Listbox(parent, **options)
+        self.scrollbar = tk.Scrollbar(parent, orient="vertical", command=self.yview)
+        self.listbox.bind("<Configure>", self._resize)
+        self.listbox.bind("<MouseWheel>", self._wheel)
+        self.listbox.bind("<Button-4>", self._wheel)
+        self.listbox.bind("<Button-5>", self._wheel)
+        self._rows = int(self.listbox.cget("height"))
+
+    def pack(self, **options):
+        self.scrollbar.pack(side="right", fill="y", pady=options.get("pady", 0))
+        self.listbox.pack(side="left", **options)
+
+    def reset(self, total):
+        self.total = total
+        self.offset = 0
+        self.render()
+
+    def render(self):
+        rows = self.fetch(self.offset, self._rows)
+        self.keys = [key for key, _text in rows]
+        self.listbox.delete(0, tk.END)
+        for _key, text in rows:
+            self.listbox.insert(tk.END, text)
+        self._update_scrollbar()
+
+    def prepend(self, key, text):
+        self.total += 1
+        if self.offset:
+            # scrolled down: keep the same rows in view
+            self.offset += 1
+        else:
+            self.listbox.insert(0, text)
+            self.keys.insert(0, key)
+            if len(self.keys) > self._rows:
+                self.listbox.delete(tk.END)
+                self.keys.pop()
+        self._update_scrollbar()
+
+    def selected_key(self):
+        sel = self.listbox.curselection()
+        if sel and sel[0] < len(self.keys):
+            return self.keys[sel[0]]
+        return None
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            offset = int(float(args[1]) * self.total)
+        else:
+            step = int(args[1]) * (self._rows if args[2] == "pages" else 1)
+            offset = self.offset + step
+        offset = max(0, min(offset, self.total - self._rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def _update_scrollbar(self):
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, (self.offset + len(self.keys)) / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.yview("scroll", -3 if up else 3, "units")
+        return "break"
+
+    def _resize(self, event):
+        box = self.listbox
+        line = int(box.tk.call("font", "metrics", box.cget("font"), "-linespace")) + 1
+        inner = event.height - 2 * (int(box.cget("borderwidth")) + int(box.cget("highlightthickness")))
+        rows = max(1, inner // line)
+        if rows != self._rows:
+            self._rows = rows
+            self.render()
+
+
+class LoadoutApp:
+    def __init__(self, root, defer_startup=True):
+        self.root = root
+        self.root.title("Renegade Generator")
+        self.root.geometry("560x720")
+        self.root.resizable(False, False)
+        self.root.configure(bg="#1a1a1a")
+
+        # Styles
+        self.title_font = ("Arial", 16, "bold")
+        self.text_font = ("Arial", 11, "bold")
+        self.button_font = ("Arial", 11, "bold")
+        self.exit_font = ("Arial", 10, "bold")
+
+        self.color_fg = "#ff3333"
+        self.color_text = "#ffcccc"
+        self.color_accent = "#ff5555"
+        self.btn_bg = "#330000"
+        self.btn_fg = "#ff8888"
+        self.btn_active_bg = "#660000"
+        self.btn_active_fg = "#ffffff"
+
+        # Rolls happen in the engine; the window only mirrors its settings
+        self.engine = LoadoutEngine()
+        self._showing_last = False  # result box holds engine.last, so diffs apply
+
+        self.history = None  # every roll, on disk (loadout_history); opened by finish_startup()
+        self._history_filters = {}
+        self._history_last = None
+
+        # config writes are debounced onto a background thread (loadout_settings)
+        self.settings_file = SettingsFile(CONFIG_PATH, on_error=self._settings_failed)
+        self.autosave = True  # save on every toggle; "autosave": false in the config turns it off
+        self._settings_error = None
+        self._settings_errors = queue.Queue()  # writer thread -> Tk thread
+        self._settings_poll = None
+        self._started = False
+
+        self._build_ui()
+        self._bind_settings()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.set_result("Use Actions or Presets. Enable Detailed for full cursed immersion.")
+
+        # The window paints with the frames above; the Detailed checkboxes,
+        # preset buttons, history panel and saved settings are filled in
+        # from the first idle callback, which runs after that paint.
+        if defer_startup:
+            self.root.after_idle(self.finish_startup)
+        else:
+            self.finish_startup()
+
+    def finish_startup(self):
+        """Second half of __init__: deferred widgets, history store and saved settings."""
+        if self._started:
+            return
+        self._started = True
+        self.history = self._open_history()
+        self._history_last = self.history.last()
+        self._build_deferred()
+        self.load_settings()
+        self._poll_settings_errors()
+
+    # --- UI setup ---
+    def _build_ui(self):
+        tk.Label(
+            self.root,
+            text="⚠️ Renegade Generator ⚠️",
+            font=self.title_font,
+            fg=self.color_fg,
+            bg="#1a1a1a",
+        ).pack(pady=(10, 5))
+
+        # Include (Basic)
+        include_frame = tk.LabelFrame(
+            self.root,
+            text="Include (Basic)",
+            font=("Arial", 9, "bold"),
+            fg=self.color_text,
+            bg="#1a1a1a",
+            bd=1,
+            relief="ridge",
+            labelanchor="n",
+            padx=5,
+            pady=3,
+        )
+        include_frame.pack(pady=(5, 4), fill="x")
+
+        self.include_melee = tk.BooleanVar(value=True)
+        self.include_weapon = tk.BooleanVar(value=True)
+        self.include_armour = tk.BooleanVar(value=True)
+        self.include_filter = tk.BooleanVar(value=True)
+        self.include_money = tk.BooleanVar(value=True)
+
+        self._make_check(include_frame, "Melee", self.include_melee, 0)
+        self._make_check(include_frame, "Weapon", self.include_weapon, 1)
+        self._make_check(include_frame, "Armour", self.include_armour, 2)
+        self._make_check(include_frame, "Filter", self.include_filter, 3)
+        self._make_check(include_frame, "Money", self.include_money, 4)
+
+        # Lock (Basic)
+        lock_frame = tk.LabelFrame(
+            self.root,
+            text="Lock (keep on reroll, Basic only)",
+            font=("Arial", 9, "bold"),
+            fg=self.color_text,
+            bg="#1a1a1a",
+            bd=1,
+            relief="ridge",
+            labelanchor="n",
+            padx=5,
+            pady=3,
+        )
+        lock_frame.pack(pady=(0, 4), fill="x")
+
+        self.lock_melee = tk.BooleanVar(value=False)
+        self.lock_weapon = tk.BooleanVar(value=False)
+        self.lock_armour = tk.BooleanVar(value=False)
+        self.lock_filter = tk.BooleanVar(value=False)
+        self.lock_money = tk.BooleanVar(value=False)
+
+        lock_widgets = [
+            self._make_check(lock_frame, "Melee", self.lock_melee, 0),
+            self._make_check(lock_frame, "Weapon + Ammo", self.lock_weapon, 1),
+            self._make_check(lock_frame, "Armour", self.lock_armour, 2),
+            self._make_check(lock_frame, "Filter", self.lock_filter, 3),
+            self._make_check(lock_frame, "Money", self.lock_money, 4),
+        ]
+        lock_tips = [
+            "Keep the current melee weapon on rerolls.",
+            "Keep current weapon, magazines & ammo on rerolls.",
+            "Keep current armour tier on rerolls.",
+            "Keep current filter value on rerolls.",
+            "Keep current money roll on rerolls.",
+        ]
+        for w, t in zip(lock_widgets, lock_tips):
+            ToolTip(w, t)
+
+        # Detailed toggles
+        detailed_frame = tk.LabelFrame(
+            self.root,
+            text="Detailed (Optional)",
+            font=("Arial", 9, "bold"),
+            fg=self.color_text,
+            bg="#1a1a1a",
+            bd=1,
+            relief="ridge",
+            labelanchor="n",
+            padx=5,
+            pady=3,
+        )
+        detailed_frame.pack(pady=(0, 4), fill="x")
+
+        self.include_medicine = tk.BooleanVar(value=False)
+        self.include_bandages = tk.BooleanVar(value=False)
+        self.include_medkits = tk.BooleanVar(value=False)
+        self.include_food = tk.BooleanVar(value=False)
+        self.include_water = tk.BooleanVar(value=False)
+        self.include_pack = tk.BooleanVar(value=False)
+        self.include_gasmask = tk.BooleanVar(value=False)
+        self.include_pockets = tk.BooleanVar(value=False)
+        self.include_restraints = tk.BooleanVar(value=False)
+
+        self.detailed_frame = detailed_frame  # checkboxes added by _build_deferred()
+
+        # Result box
+        result_frame = tk.Frame(self.root, bg="#1a1a1a")
+        result_frame.pack(pady=(4, 4), fill="x")
+
+        tk.Label(
+            result_frame,
+            text="Current Loadout:",
+            font=("Arial", 10, "bold"),
+            fg=self.color_text,
+            bg="#1a1a1a",
+        ).pack(anchor="w", padx=10)
+
+        self.result_box = tk.Text(
+            result_frame,
+            height=12,
+            width=70,
+            bg="#111111",
+            fg=self.color_accent,
+            font=self.text_font,
+            relief="solid",
+            bd=1,
+        )
+        self.result_box.pack(padx=10, pady=(2, 5), fill="x")
+        self.result_box.config(state="disabled")
+
+        self.result_box.tag_configure("bad", foreground="#ff4444")
+        self.result_box.tag_configure("good", foreground="#7CFC00")
+        self.result_box.tag_configure("normal", foreground=self.color_accent)
+
+        # Actions
+        actions_frame = tk.LabelFrame(
+            self.root,
+            text="Actions",
+            font=("Arial", 9, "bold"),
+            fg=self.color_text,
+            bg="#1a1a1a",
+            bd=1,
+            relief="ridge",
+            labelanchor="n",
+            padx=8,
+            pady=6,
+        )
+        actions_frame.pack(pady=(0, 5), fill="x")
+
+        for i in range(3):
+            actions_frame.columnconfigure(i, weight=1)
+
+        self._make_button(actions_frame, "Generate Basic", self.generate_loadout, width=16)\
+            .grid(row=0, column=0, padx=4, pady=3, sticky="nsew")
+        self._make_button(actions_frame, "Generate Detailed", self.generate_detailed, width=16)\
+            .grid(row=0, column=1, padx=4, pady=3, sticky="nsew")
+        self._make_button(actions_frame, "Generate All", self.generate_all, width=16)\
+            .grid(row=0, column=2, padx=4, pady=3, sticky="nsew")
+
+        self._make_button(actions_frame, "Generate Money Only", self.generate_money, width=16)\
+            .grid(row=1, column=0, padx=4, pady=3, sticky="nsew")
+        self._make_button(actions_frame, "Copy", self.copy_to_clipboard, width=16)\
+            .grid(row=1, column=1, padx=4, pady=3, sticky="nsew")
+        self._make_button(actions_frame, "Clear / Reset", self.clear_all, width=16)\
+            .grid(row=1, column=2, padx=4, pady=3, sticky="nsew")
+
+        # Presets
+        presets_frame = tk.LabelFrame(
+            self.root,
+            text="Presets",
+            font=("Arial", 9, "bold"),
+            fg=self.color_text,
+            bg="#1a1a1a",
+            bd=1,
+            relief="ridge",
+            labelanchor="n",
+            padx=5,
+            pady=3,
+        )
+        presets_frame.pack(pady=(3, 5), fill="x")
+
+        for i in range(3):
+            presets_frame.columnconfigure(i, weight=1)
+        self.presets_frame = presets_frame  # buttons added by _build_deferred()
+
+        # History
+        history_frame = tk.LabelFrame(
+            self.root,
+            text="History",
+            font=("Arial", 9, "bold"),
+            fg=self.color_text,
+            bg="#1a1a1a",
+            bd=1,
+            relief="ridge",
+            labelanchor="n",
+            padx=5,
+            pady=3,
+        )
+        history_frame.pack(pady=(4, 0), fill="both", expand=True)
+        self.history_frame = history_frame  # filled by _build_deferred()
+
+        # Exit button
+        tk.Button(
+            self.root,
+            text="Exit",
+            command=self.on_close,
+            font=self.exit_font,
+            bg=self.btn_bg,
+            fg=self.btn_fg,
+            activebackground=self.btn_active_bg,
+            activeforeground=self.btn_active_fg,
+            width=12,
+        ).pack(pady=(4, 8))
+
+    def _build_deferred(self):
+        detailed = self.detailed_frame
+        self._make_check(detailed, "Medicine", self.include_medicine, 0, row=0)
+        self._make_check(detailed, "Bandages", self.include_bandages, 1, row=0)
+        self._make_check(detailed, "Medkits", self.include_medkits, 2, row=0)
+        self._make_check(detailed, "Food", self.include_food, 3, row=0)
+        self._make_check(detailed, "Water", self.include_water, 4, row=0)
+
+        self._make_check(detailed, "Pack", self.include_pack, 0, row=1)
+        self._make_check(detailed, "Gasmask", self.include_gasmask, 1, row=1)
+        self._make_check(detailed, "Pockets", self.include_pockets, 2, row=1)
+        self._make_check(detailed, "Restraints", self.include_restraints, 3, row=1)
+
+        for i, sampler in enumerate(PRESET_SAMPLERS.values()):
+            self._make_button(self.presets_frame, sampler.label, lambda name=sampler.name: self._run_preset(name),
+                              width=16).grid(row=i // 3, column=i % 3, padx=5, pady=3, sticky="nsew")
+
+        # History
+        filter_row = tk.Frame(self.history_frame, bg="#1a1a1a")
+        filter_row.pack(fill="x", padx=8)
+        self.history_weapon = tk.StringVar(value="Any")
+        self.history_armour = tk.StringVar(value="Any")
+        for col, (label, var, slot) in enumerate(
+            (("Weapon", self.history_weapon, "weapon"), ("Armour", self.history_armour, "armour"))
+        ):
+            tk.Label(filter_row, text=label, font=("Arial", 9), fg=self.color_text, bg="#1a1a1a")\
+                .grid(row=0, column=2 * col, padx=(4, 2), sticky="w")
+            menu = tk.OptionMenu(filter_row, var, "Any", *SLOT_VALUES[slot], command=lambda _v: self.refresh_history())
+            menu.config(font=("Arial", 9), bg=self.btn_bg, fg=self.btn_fg, highlightthickness=0,
+                        activebackground=self.btn_active_bg, activeforeground=self.btn_active_fg)
+            menu.grid(row=0, column=2 * col + 1, padx=(0, 6), sticky="w")
+
+        # only the visible rows are fetched and drawn (see VirtualList)
+        self.history_view = VirtualList(
+            self.history_frame,
+            self._fetch_history,
+            width=70,
+            height=7,
+            bg="#111111",
+            fg=self.color_text,
+            selectbackground="#330000",
+            highlightthickness=0,
+            activestyle="none",
+        )
+        self.history_view.pack(padx=(8, 0), pady=5, fill="both", expand=True)
+        self.history_listbox = self.history_view.listbox
+
+        # Restore from history on double-click / Enter
+        self.history_listbox.bind("<Double-Button-1>", self.on_history_activate)
+        self.history_listbox.bind("<Return>", self.on_history_activate)
+        self.refresh_history()
+
+    # --- UI helpers ---
+    def _make_button(self, parent, text, command, width=18):
+        return tk.Button(
+            parent,
+            text=text,
+            command=command,
+            font=self.button_font,
+            bg=self.btn_bg,
+            fg=self.btn_fg,
+            activebackground=self.btn_active_bg,
+            activeforeground=self.btn_active_fg,
+            width=width,
+        )
+
+    def _make_check(self, parent, label, var, col, row=0):
+        cb = tk.Checkbutton(
+            parent,
+            text=label,
+            variable=var,
+            font=("Arial", 9),
+            bg="#1a1a1a",
+            fg=self.color_text,
+            selectcolor="#330000",
+            activebackground="#1a1a1a",
+            activeforeground=self.color_fg,
+            pady=0,
+        )
+        cb.grid(row=row, column=col, padx=4, pady=1, sticky="w")
+        return cb
+
+    # --- Settings ---
+    def _bind_settings(self):
+        self._setting_vars = {
+            "include": {
+                "melee": self.include_melee,
+                "weapon": self.include_weapon,
+                "armour": self.include_armour,
+                "filter": self.include_filter,
+                "money": self.include_money,
+                "medicine": self.include_medicine,
+                "bandages": self.include_bandages,
+                "medkits": self.include_medkits,
+                "food": self.include_food,
+                "water": self.include_water,
+                "pack": self.include_pack,
+                "gasmask": self.include_gasmask,
+                "pockets": self.include_pockets,
+                "restraints": self.include_restraints,
+            },
+            "lock": {
+                "melee": self.lock_melee,
+                "weapon": self.lock_weapon,
+                "armour": self.lock_armour,
+                "filter": self.lock_filter,
+                "money": self.lock_money,
+            },
+        }
+        # mirror every checkbox into the engine settings so rolls never touch Tcl
+        for group, variables in self._setting_vars.items():
+            target = getattr(self.engine.settings, group)
+            for key, var in variables.items():
+                target[key] = var.get()
+                var.trace_add("write", lambda *_, t=target, k=key, v=var: t.__setitem__(k, v.get()))
+                var.trace_add("write", self._settings_changed)
+
+    def _settings_changed(self, *_):
+        if self.autosave:
+            self.save_settings()
+
+    def get_settings(self):
+        return {**self.engine.settings.to_dict(), "autosave": self.autosave}
+
+    def apply_settings(self, data):
+        settings = RollSettings.from_dict(data)
+        for group, variables in self._setting_vars.items():
+            values = getattr(settings, group)
+            for key, var in variables.items():
+                var.set(values[key])
+
+    def save_settings(self):
+        self.settings_file.save_soon(self.get_settings())
+
+    def load_settings(self):
+        try:
+            data = self.settings_file.load()
+        except SettingsError as exc:
+            self._report_settings_error(exc)
+            return
+        self.autosave = bool(data.get("autosave", True))
+        if data:
+            self.apply_settings(data)
+
+    def _settings_failed(self, exc):
+        # called on the writer thread, which must not touch Tk; the Tk thread
+        # picks it up in _poll_settings_errors()
+        self._settings_errors.put(exc)
+
+    def _drain_settings_errors(self):
+        while True:
+            try:
+                exc = self._settings_errors.get_nowait()
+            except queue.Empty:
+                return
+            self._report_settings_error(exc)
+
+    def _poll_settings_errors(self):
+        self._drain_settings_errors()
+        self._settings_poll = self.root.after(SETTINGS_POLL_MS, self._poll_settings_errors)
+
+    def _report_settings_error(self, exc):
+        message = str(exc)
+        print(f"settings: {message}", file=sys.stderr)
+        if message != self._settings_error:  # one dialog per distinct problem
+            self._settings_error = message
+            messagebox.showwarning("Settings", message, parent=self.root)
+
+    # --- Result rendering ---
+    def reroll(self, mode):
+        loadout, changed = self.engine.reroll(mode)
+        if changed is None or not self._showing_last:
+            self.show_loadout(loadout)
+        elif changed:
+            self.update_lines(loadout, changed)
+        self._showing_last = True
+        self.add_to_history(loadout)
+
+    def update_lines(self, loadout, changed):
+        # rewrite only the lines whose slots changed; tags travel with the insert
+        lines = loadout.lines()
+        tags = loadout.line_tags()
+        self.result_box.config(state="normal")
+        for i, slots in enumerate(loadout.line_slots(), start=1):
+            if changed.intersection(slots):
+                self.result_box.delete(f"{i}.0", f"{i}.end")
+                self.result_box.insert(f"{i}.0", lines[i - 1], tags[i - 1])
+        self.result_box.config(state="disabled")
+
+    def show_loadout(self, loadout):
+        self.set_result(loadout.text, loadout.line_tags())
+
+    def set_result(self, text: str, tags=None):
+        self._showing_last = False
+        lines = text.splitlines()
+        if tags is None:
+            tags = [self.get_line_tag(line) for line in lines]
+        self.result_box.config(state="normal")
+        self.result_box.delete("1.0", tk.END)
+        for line, tag in zip(lines, tags):
+            self.result_box.insert(tk.END, line + "\n", tag)
+        self.result_box.config(state="disabled")
+
+    def get_line_tag(self, line: str) -> str:
+        return line_tag(line)
+
+    # --- History ---
+    def _open_history(self):
+        from loadout_history import HistoryStore
+        try:
+            return HistoryStore(HISTORY_PATH)
+        except sqlite3.Error:
+            # unwritable install dir: keep this session's history in memory
+            return HistoryStore(":memory:")
+
+    def _read_history_filters(self):
+        filters = {}
+        for slot, var in (("weapon", self.history_weapon), ("armour", self.history_armour)):
+            if var.get() != "Any":
+                filters[slot] = var.get()
+        return filters
+
+    @staticmethod
+    def _history_preview(row_id, loadout):
+        preview = loadout.text.replace("\n", " | ")
+        if len(preview) > 140:
+            preview = preview[:137] + "..."
+        return f"{row_id}. {preview}"
+
+    def _fetch_history(self, offset, limit):
+        rows = self.history.rows(offset, limit, **self._history_filters)
+        return [(row, self._history_preview(*row)) for row in rows]
+
+    def add_to_history(self, loadout):
+        self.finish_startup()  # a roll that beats the first idle callback still gets stored
+        # avoid duplicating identical last entry
+        if self._history_last is not None and self._history_last.packed == loadout.packed:
+            return
+        self._history_last = loadout
+        row_id = self.history.append(loadout)
+        if self.history.matches(loadout, **self._history_filters):
+            self.history_view.prepend((row_id, loadout), self._history_preview(row_id, loadout))
+
+    def refresh_history(self):
+        self._history_filters = self._read_history_filters()
+        self.history_view.reset(self.history.count(**self._history_filters))
+
+    def on_history_activate(self, event=None):
+        row = self.history_view.selected_key()
+        if row is not None:
+            self.show_loadout(row[1])
+
+    # --- Generators (thin wrappers over LoadoutEngine) ---
+    def generate_loadout(self):
+        self.reroll("basic")
+
+    def generate_money(self):
+        self.reroll("money")
+
+    def generate_detailed(self):
+        self.reroll("detailed")
+
+    def generate_all(self):
+        self.reroll("all")
+
+    # --- Presets ---
+    def _run_preset(self, name):
+        self.reroll(f"preset={name}")
+        # presets flip include/lock flags; reflect them in the checkboxes
+        self.apply_settings(self.engine.settings.to_dict())
+
+    # --- Misc ---
+    def copy_to_clipboard(self):
+        text = self.result_box.get("1.0", tk.END).strip()
+        if not text:
+            return
+        self.root.clipboard_clear()
+        self.root.clipboard_append(text)
+
+    def clear_all(self):
+        self.apply_settings({})
+        self.engine.reset_fields()
+        self.set_result("Cleared. Ready for a fresh roll.")
+        self.save_settings()
+
+    def on_close(self):
+        self.finish_startup()  # never save over settings that were not loaded yet
+        self.save_settings()
+        if self._settings_poll is not None:
+            self.root.after_cancel(self._settings_poll)
+        try:
+            self.settings_file.close()
+        except SettingsError as exc:
+            self._report_settings_error(exc)
+        self._drain_settings_errors()
+        self.history.close()
+        self.root.destroy()
@@ -0,0 +1,228 @@
+"""Append-only roll history in SQLite.
+
+Each roll is one row: its mode, the values it showed (JSON) and its seed,
+plus weapon, armour and money copied into indexed columns. Rows hold values,
+not packed words or table indices, so they keep their meaning when the
+catalog is edited. Pages are read with LIMIT and keyset paging on the row id,
+so filtering and scrolling stay instant with hundreds of thousands of rows
+and nothing is loaded that is not shown.
+
+The database records the digest of the catalog it was written under. Opened
+with another catalog, rows that no longer decode (a value or preset was
+removed) move to the orphans table, and every seed is cleared: a seed only
+replays against the tables that rolled it.
+
+    history = HistoryStore(HISTORY_PATH)
+    history.append(loadout)
+    history.page(limit=50, weapon="Rusty AKM", money_max=40_000)
+"""
+import json
+import sqlite3
+import time
+
+from Loadout import CATALOG, SLOT_ORDER, SLOT_VALUES, Loadout
+
+# slots copied into their own indexed columns (the value, NULL = not shown)
+INDEXED_SLOTS = ("weapon", "armour", "money")
+
+_COLUMNS = "mode, slots, seed, created, weapon, armour, money"
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rolls (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    slots TEXT NOT NULL,
+    seed INTEGER,
+    created REAL NOT NULL,
+    weapon TEXT,
+    armour TEXT,
+    money INTEGER
+);
+CREATE INDEX IF NOT EXISTS rolls_weapon ON rolls (weapon, id);
+CREATE INDEX IF NOT EXISTS rolls_armour ON rolls (armour, id);
+CREATE INDEX IF NOT EXISTS rolls_money ON rolls (money, id);
+CREATE TABLE IF NOT EXISTS orphans (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    slots TEXT NOT NULL,
+    seed INTEGER,
+    created REAL NOT NULL,
+    weapon TEXT,
+    armour TEXT,
+    money INTEGER,
+    catalog TEXT NOT NULL
+);
+"""
+
+_SIGN = 1 << 63
+
+
+def _signed(word):
+    # SQLite integers are signed 64-bit; seeds are unsigned
+    return None if word is None else word - (word >= _SIGN) * (1 << 64)
+
+
+def _unsigned(value):
+    return None if value is None else value % (1 << 64)
+
+
+def _row(loadout, created):
+    values = {}
+    for slot in SLOT_ORDER:
+        code = loadout.code(slot)
+        if code is not None:
+            values[slot] = SLOT_VALUES[slot][code]
+    return (
+        loadout.mode, json.dumps(values), _signed(loadout.seed), created,
+        *(values.get(slot) for slot in INDEXED_SLOTS),
+    )
+
+
+def _loadout(mode, slots, seed=None):
+    """Row -> Loadout under the current catalog; KeyError if it no longer has the mode or a value."""
+    return Loadout.from_values(json.loads(slots), mode, _unsigned(seed))
+
+
+class HistoryStore:
+    """Rolls on disk, newest first when read back."""
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(rolls)")}
+        if "packed" in columns:
+            # the first layout stored packed words and indices without naming
+            # the catalog behind them, so they cannot be read back safely
+            self.db.executescript("""
+                DROP INDEX rolls_weapon;
+                DROP INDEX rolls_armour;
+                DROP INDEX rolls_money;
+                ALTER TABLE rolls RENAME TO rolls_packed;
+            """)
+        self.db.executescript(_SCHEMA)
+        self._check_catalog()
+
+    def close(self):
+        self.db.close()
+
+    def _check_catalog(self):
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'catalog'").fetchone()
+        if row is not None and row[0] == CATALOG["digest"]:
+            return
+        with self.db:
+            if row is not None:
+                self._adopt(row[0])
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('catalog', ?)", (CATALOG["digest"],))
+
+    def _adopt(self, old):
+        """Keep the rows written under catalog `old` that the current one can still show."""
+        stale = []
+        for row_id, mode, slots in self.db.execute("SELECT id, mode, slots FROM rolls"):
+            try:
+                _loadout(mode, slots)
+            except KeyError:
+                stale.append(row_id)
+        self.db.executemany(
+            f"INSERT INTO orphans ({_COLUMNS}, catalog) SELECT {_COLUMNS}, ? FROM rolls WHERE id = ?",
+            ((old, row_id) for row_id in stale),
+        )
+        self.db.executemany("DELETE FROM rolls WHERE id = ?", ((row_id,) for row_id in stale))
+        self.db.execute("UPDATE rolls SET seed = NULL")
+
+    def append(self, loadout):
+        """Store one roll; returns its id."""
+        with self.db:
+            cur = self.db.execute(
+                f"INSERT INTO rolls ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", _row(loadout, time.time()),
+            )
+        return cur.lastrowid
+
+    def extend(self, loadouts):
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                f"INSERT INTO rolls ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (_row(loadout, now) for loadout in loadouts),
+            )
+
+    def _where(self, weapon=None, armour=None, money_min=None, money_max=None):
+        clauses, params = [], []
+        for slot, value in (("weapon", weapon), ("armour", armour)):
+            if value is not None:
+                clauses.append(f"{slot} = ?")
+                params.append(value)
+        if money_min is not None:
+            clauses.append("money >= ?")
+            params.append(money_min)
+        if money_max is not None:
+            clauses.append("money <= ?")
+            params.append(money_max)
+        return clauses, params
+
+    def page(self, limit=50, before=None, **filters):
+        """Up to `limit` (id, Loadout) pairs, newest first, older than id `before`.
+
+        filters: weapon=, armour= (table values) and money_min=/money_max= (RU).
+        """
+        clauses, params = self._where(**filters)
+        if before is not None:
+            clauses.append("id < ?")
+            params.append(before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.db.execute(
+            f"SELECT id, mode, slots, seed FROM rolls {where} ORDER BY id DESC LIMIT ?", (*params, limit),
+        )
+        return [(row_id, _loadout(*row)) for row_id, *row in rows]
+
+    def rows(self, offset, limit, **filters):
+        """(id, Loadout) pairs at positions offset.. of the filtered list, newest first."""
+        clauses, params = self._where(**filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.db.execute(
+            f"SELECT id, mode, slots, seed FROM rolls {where} ORDER BY id DESC LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        )
+        return [(row_id, _loadout(*row)) for row_id, *row in rows]
+
+    @staticmethod
+    def matches(loadout, weapon=None, armour=None, money_min=None, money_max=None):
+        """Whether `loadout` passes the same filters page()/rows()/count() take."""
+        for slot, value in (("weapon", weapon), ("armour", armour)):
+            if value is not None and loadout.get(slot) != value:
+                return False
+        if money_min is not None or money_max is not None:
+            money = loadout.get("money")
+            if money is None:
+                return False
+            if money_min is not None and money < money_min:
+                return False
+            if money_max is not None and money > money_max:
+                return False
+        return True
+
+    def get(self, row_id):
+        row = self.db.execute("SELECT mode, slots, seed FROM rolls WHERE id = ?", (row_id,)).fetchone()
+        if row is None:
+            raise KeyError(row_id)
+        return _loadout(*row)
+
+    def count(self, **filters):
+        clauses, params = self._where(**filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.db.execute(f"SELECT COUNT(*) FROM rolls {where}", params).fetchone()[0]
+
+    def orphans(self):
+        """How many rows were set aside because a catalog edit removed their mode or a value."""
+        return self.db.execute("SELECT COUNT(*) FROM orphans").fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def last(self):
+        rows = self.page(limit=1)
+        return rows[0][1] if rows else None
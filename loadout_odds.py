@@ -0,0 +1,180 @@
+"""Exact odds for every generator, computed from the tables instead of by rolling.
+
+Each slot is drawn independently from a known discrete distribution, so the
+marginals come straight from the tables, joint questions about several slots
+are products, and "how many lines get tag X" is a convolution of one
+Bernoulli per line. All results are exact Fractions; models are cached per
+(mode, settings, locked fields), so repeated questions cost microseconds.
+
+    probability("all", weapon="Rusty AKM", armour="Ceramic", money=0)
+    tag_count_at_least("preset=rich_pmc", "good", 3)
+"""
+from fractions import Fraction
+from functools import lru_cache
+
+from Loadout import (
+    DETAILED_TABLES,
+    DRAW_RANGES,
+    FLAG_SLOTS,
+    LAYOUT_IDS,
+    LAYOUTS,
+    MODE_FLAGS,
+    PRESET_SAMPLERS,
+    SLOT_INDEX,
+    SLOT_VALUES,
+    RollSettings,
+    format_line,
+    format_sidearm,
+    line_tag,
+)
+
+ONE = Fraction(1)
+
+
+def _uniform(pool):
+    p = Fraction(1, len(pool))
+    return {i: p for i in pool}
+
+
+def _weighted(table):
+    return {i: Fraction(w) / table.total for i, w in enumerate(table.weights)}
+
+
+def _step(indices, table):
+    """Distribution of one PresetSampler step (pools may repeat an item)."""
+    dist = {}
+    if table is None:
+        p = Fraction(1, len(indices))
+        for i in indices:
+            dist[i] = dist.get(i, 0) + p
+    else:
+        for i, w in zip(table.items, table.weights):
+            dist[i] = dist.get(i, 0) + Fraction(w) / table.total
+    return dist
+
+
+def _settings_key(settings, fields):
+    settings = settings if settings is not None else RollSettings()
+    fields = fields or {}
+    return (
+        tuple(settings.include.items()),
+        tuple(settings.lock.items()),
+        tuple(sorted((k, v) for k, v in fields.items() if v is not None)),
+    )
+
+
+@lru_cache(maxsize=256)
+def _model(mode, key):
+    include, lock, fields = (dict(part) for part in key)
+    layout = LAYOUTS[LAYOUT_IDS[mode]]
+    dists = {}
+
+    if mode.startswith("preset="):
+        sampler = PRESET_SAMPLERS[mode.partition("=")[2]]
+        for slot, index in sampler.fixed.items():
+            dists[slot] = {index: ONE}
+        for slot, _shift, indices, table in sampler.steps:
+            dists[slot] = _step(indices, table)
+    else:
+        for flag in MODE_FLAGS[mode]:
+            if not include[flag]:
+                continue
+            locked = lock.get(flag) and fields.get(flag) is not None
+            for slot in FLAG_SLOTS[flag]:
+                if slot in DETAILED_TABLES:
+                    dists[slot] = _weighted(DETAILED_TABLES[slot])
+                elif locked:
+                    dists[slot] = {fields[slot]: ONE}
+                else:
+                    dists[slot] = _uniform(DRAW_RANGES[slot])
+
+    return {slot: dists[slot] for slot in layout.order if slot in dists}
+
+
+def slot_model(mode, settings=None, fields=None):
+    """slot -> {index into SLOT_VALUES[slot]: probability}, for the displayed slots."""
+    return _model(mode, _settings_key(settings, fields))
+
+
+def marginals(mode, settings=None, fields=None):
+    """slot -> {value: probability} for every slot the mode displays."""
+    return {
+        slot: {SLOT_VALUES[slot][i]: p for i, p in dist.items()}
+        for slot, dist in slot_model(mode, settings, fields).items()
+    }
+
+
+def _matches(slot, dist, wanted):
+    if isinstance(wanted, (set, frozenset, list, tuple)):
+        indices = {SLOT_INDEX[slot][v] for v in wanted}
+    else:
+        indices = {SLOT_INDEX[slot][wanted]}
+    return sum((p for i, p in dist.items() if i in indices), Fraction(0))
+
+
+def probability(mode, settings=None, fields=None, **conditions):
+    """P(every named slot shows the given value, or one of a collection of values).
+
+    A slot the mode never displays has probability 0 of matching.
+    """
+    model = slot_model(mode, settings, fields)
+    p = ONE
+    for slot, wanted in conditions.items():
+        if slot not in model:
+            return Fraction(0)
+        p *= _matches(slot, model[slot], wanted)
+    return p
+
+
+@lru_cache(maxsize=256)
+def _lines(mode, key):
+    layout = LAYOUTS[LAYOUT_IDS[mode]]
+    model = _model(mode, key)
+    lines = [{text: ONE} for text in layout.header]
+    for slot, dist in model.items():
+        if layout.sidearm and slot in ("magazines", "ammo"):
+            continue
+        line = {}
+        if layout.sidearm and slot == "weapon":
+            for w, pw in dist.items():
+                for m, pm in model["magazines"].items():
+                    for a, pa in model["ammo"].items():
+                        text = format_sidearm(
+                            SLOT_VALUES["weapon"][w], SLOT_VALUES["magazines"][m], SLOT_VALUES["ammo"][a],
+                        )
+                        line[text] = line.get(text, 0) + pw * pm * pa
+        else:
+            for i, p in dist.items():
+                text = format_line(slot, SLOT_VALUES[slot][i])
+                line[text] = line.get(text, 0) + p
+        lines.append(line)
+    if not lines:
+        lines.append({layout.empty_message: ONE})
+    return lines
+
+
+def line_distributions(mode, settings=None, fields=None):
+    """One {line text: probability} dict per output line, in display order."""
+    return _lines(mode, _settings_key(settings, fields))
+
+
+@lru_cache(maxsize=256)
+def _tag_counts(mode, key, tag):
+    counts = [ONE]
+    for line in _lines(mode, key):
+        p = sum((q for text, q in line.items() if line_tag(text) == tag), Fraction(0))
+        nxt = [Fraction(0)] * (len(counts) + 1)
+        for k, q in enumerate(counts):
+            nxt[k] += q * (1 - p)
+            nxt[k + 1] += q * p
+        counts = nxt
+    return tuple(counts)
+
+
+def tag_count_distribution(mode, tag, settings=None, fields=None):
+    """P(exactly k lines are tagged `tag`) for k = 0..number of lines."""
+    return list(_tag_counts(mode, _settings_key(settings, fields), tag))
+
+
+def tag_count_at_least(mode, tag, k, settings=None, fields=None):
+    return sum(tag_count_distribution(mode, tag, settings, fields)[k:], Fraction(0))
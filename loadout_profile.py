@@ -0,0 +1,136 @@
+"""Opt-in timing of the hot paths, plus a cProfile switch.
+
+Nothing here runs unless asked for: instrument() swaps timing wrappers onto
+the stage functions listed in STAGES (RNG draws, rendering, tagging, Tk text
+updates, history and settings writes), and uninstrument() puts the originals
+back. When profiling is off the code is untouched, so it costs nothing.
+
+    python Loadout.py --profile stages.json            # per-stage timers
+    python Loadout.py --cprofile run.prof generate ...  # full cProfile dump
+    LOADOUT_PROFILE=stages.json python Loadout.py      # same, via environment
+
+Stage times are inclusive (e.g. engine/reroll contains its rng/* stages).
+"""
+import cProfile
+import json
+import sys
+from functools import wraps
+from time import perf_counter_ns
+
+# stage name -> (module, "Owner.attribute" or "function")
+STAGES = {
+    "engine/reroll": ("Loadout", "LoadoutEngine.reroll"),
+    "rng/basic": ("Loadout", "LoadoutEngine._basic"),
+    "rng/detailed": ("Loadout", "LoadoutEngine._detailed"),
+    "rng/money": ("Loadout", "LoadoutEngine._money"),
+    "rng/preset": ("Loadout", "PresetSampler.draw"),
+    "render/lines": ("Loadout", "Loadout.lines"),
+    "render/line_tags": ("Loadout", "Loadout.line_tags"),
+    "render/text": ("Loadout", "Loadout.text"),
+    "tag/line_tag": ("Loadout", "line_tag"),
+    "gui/reroll": ("loadout_gui", "LoadoutApp.reroll"),
+    "gui/set_result": ("loadout_gui", "LoadoutApp.set_result"),
+    "gui/update_lines": ("loadout_gui", "LoadoutApp.update_lines"),
+    "gui/add_to_history": ("loadout_gui", "LoadoutApp.add_to_history"),
+    "history/append": ("loadout_history", "HistoryStore.append"),
+    "settings/save": ("loadout_settings", "SettingsFile.save"),
+}
+
+# stage -> [calls, total ns, max ns]
+STATS = {}
+_patched = []  # (owner, attribute, original) for uninstrument()
+
+
+def _timed(name, fn):
+    stat = STATS.setdefault(name, [0, 0, 0])
+
+    @wraps(fn)
+    def timed(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = perf_counter_ns() - start
+            stat[0] += 1
+            stat[1] += elapsed
+            if elapsed > stat[2]:
+                stat[2] = elapsed
+    return timed
+
+
+def instrument():
+    """Wrap every stage in STAGES with a timer (stages of modules that cannot load, e.g. no Tk, are skipped)."""
+    if _patched:
+        return
+    import importlib
+    for name, (module_name, path) in STAGES.items():
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        owner_name, _, attr = path.rpartition(".")
+        owner = getattr(module, owner_name) if owner_name else module
+        original = owner.__dict__[attr] if isinstance(owner, type) else getattr(owner, attr)
+        if isinstance(original, property):
+            wrapped = property(_timed(name, original.fget))
+        else:
+            wrapped = _timed(name, original)
+        setattr(owner, attr, wrapped)
+        _patched.append((owner, attr, original))
+
+
+def uninstrument():
+    while _patched:
+        owner, attr, original = _patched.pop()
+        setattr(owner, attr, original)
+
+
+def reset():
+    for stat in STATS.values():
+        stat[:] = [0, 0, 0]
+
+
+def report():
+    """{"stages": {name: calls/total/mean/max}}, busiest stage first."""
+    stages = {}
+    for name, (calls, total, worst) in sorted(STATS.items(), key=lambda item: -item[1][1]):
+        if calls:
+            stages[name] = {
+                "calls": calls,
+                "total_ms": round(total / 1e6, 3),
+                "mean_us": round(total / calls / 1e3, 3),
+                "max_us": round(worst / 1e3, 3),
+            }
+    return {"stages": stages}
+
+
+def write_report(path):
+    data = report()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return data
+
+
+def print_report(data=None, out=sys.stderr):
+    data = data if data is not None else report()
+    print(f"{'stage':<22} {'calls':>9} {'total ms':>10} {'mean us':>9} {'max us':>9}", file=out)
+    for name, s in data["stages"].items():
+        print(f"{name:<22} {s['calls']:>9} {s['total_ms']:>10.1f} {s['mean_us']:>9.1f} {s['max_us']:>9.1f}", file=out)
+
+
+def run_profiled(fn, stages_path=None, cprofile_path=None):
+    """Run fn() with stage timers (-> stages_path JSON) and/or cProfile (-> cprofile_path)."""
+    if stages_path:
+        instrument()
+    profiler = cProfile.Profile() if cprofile_path else None
+    try:
+        if profiler is not None:
+            profiler.enable()
+        return fn()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(cprofile_path)
+        if stages_path:
+            print_report(write_report(stages_path))
+            uninstrument()
@@ -0,0 +1,225 @@
+"""Local HTTP/JSON roll service on asyncio (stdlib only, no Tk root).
+
+    python Loadout.py serve --port 8765
+
+    GET  /roll?mode=all[&seed=N]           one roll
+    GET  /roll/batch?mode=all&count=N      up to MAX_BATCH rolls in one response
+    GET  /preset/<name>[?seed=N]           one preset roll
+    POST any of the above with a JSON body {"mode", "count", "seed", "settings"}
+
+Every roll carries its seed; sending it back as ?seed= replays it (rolls
+that kept a locked value, later in a batch, carry "seed": null). settings
+use the loadout_config.json format. Connections are kept alive (HTTP/1.1
+default) and pipelined requests are answered in order on the same socket.
+"""
+import asyncio
+import json
+import random
+from urllib.parse import parse_qsl, urlsplit
+
+from Loadout import PRESETS, LoadoutEngine, RollSettings, resolve_mode
+
+MAX_BATCH = 1000
+MAX_HEADER = 16 * 1024
+MAX_BODY = 64 * 1024
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def roll_record(loadout):
+    return {
+        "mode": loadout.mode,
+        "seed": loadout.seed,
+        "slots": loadout.slots,
+        "lines": loadout.lines(),
+        "tags": loadout.line_tags(),
+    }
+
+
+def _int(params, key, default=None):
+    value = params.get(key, default)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"{key} must be an integer") from None
+
+
+class RollService:
+    """Routing and rolling; transport-free so it can be called directly."""
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random.Random()
+
+    def _engine(self, params):
+        settings = params.get("settings")
+        if settings is not None and not isinstance(settings, dict):
+            raise HTTPError(400, "settings must be an object")
+        # one engine per request: presets rewrite the engine's settings
+        try:
+            settings = RollSettings.from_dict(settings or {})
+        except (AttributeError, TypeError):
+            raise HTTPError(400, "settings must look like loadout_config.json") from None
+        return LoadoutEngine(settings, self.rng)
+
+    def _roll(self, mode, params):
+        if not isinstance(mode, str):
+            raise HTTPError(400, "mode must be a string")
+        try:
+            roll = resolve_mode(mode)
+        except KeyError:
+            raise HTTPError(400 if not mode.startswith("preset=") else 404, f"unknown mode {mode!r}") from None
+        return roll, self._engine(params)
+
+    def handle(self, method, target, body=b""):
+        """(method, request target, body) -> (status, JSON-able payload)."""
+        if method not in ("GET", "POST"):
+            raise HTTPError(405, f"{method} not allowed")
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        if method == "POST" and body:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                raise HTTPError(400, "body is not valid JSON") from None
+            if not isinstance(data, dict):
+                raise HTTPError(400, "body must be a JSON object")
+            params.update(data)
+
+        path = url.path.rstrip("/") or "/"
+        if path == "/roll":
+            return self.roll_one(params.get("mode", "all"), params)
+        if path == "/roll/batch":
+            return self.roll_batch(params.get("mode", "all"), params)
+        if path.startswith("/preset/"):
+            name = path[len("/preset/"):]
+            if name not in PRESETS:
+                raise HTTPError(404, f"unknown preset {name!r}")
+            return self.roll_one(f"preset={name}", params)
+        raise HTTPError(404, f"no route for {url.path}")
+
+    def roll_one(self, mode, params):
+        roll, engine = self._roll(mode, params)
+        return 200, roll_record(roll(engine, seed=_int(params, "seed")))
+
+    def roll_batch(self, mode, params):
+        count = _int(params, "count", 1)
+        if not 0 < count <= MAX_BATCH:
+            raise HTTPError(400, f"count must be between 1 and {MAX_BATCH}")
+        roll, engine = self._roll(mode, params)
+        seed = _int(params, "seed")
+        if seed is not None:
+            # the whole batch replays from one seed; each roll still has its own
+            engine.rng = random.Random(seed)
+        return 200, {"rolls": [roll_record(roll(engine)) for _ in range(count)]}
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def _read_request(reader):
+    """-> (method, target, version, headers, body), or None on a clean EOF."""
+    try:
+        raw = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as exc:
+        if exc.partial.strip():
+            raise HTTPError(400, "truncated request") from None
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(413, "request headers too large") from None
+    request_line, *header_lines = raw.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = request_line.split(" ")
+    except ValueError:
+        raise HTTPError(400, "malformed request line") from None
+    headers = {}
+    for line in header_lines:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    length = _int(headers, "content-length", 0)
+    if length < 0:
+        raise HTTPError(400, "content-length must not be negative")
+    if length > MAX_BODY:
+        raise HTTPError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, version, headers, body
+
+
+def _keep_alive(version, headers):
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+async def _serve_connection(service, reader, writer):
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except HTTPError as exc:
+                writer.write(_response(exc.status, {"error": str(exc)}, False))
+                break
+            if request is None:
+                break
+            method, target, version, headers, body = request
+            keep_alive = _keep_alive(version, headers)
+            try:
+                status, payload = service.handle(method, target, body)
+            except HTTPError as exc:
+                status, payload = exc.status, {"error": str(exc)}
+            except Exception as exc:  # keep serving other requests
+                status, payload = 500, {"error": f"{type(exc).__name__}: {exc}"}
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(host="127.0.0.1", port=8765, service=None):
+    service = service if service is not None else RollService()
+    return await asyncio.start_server(
+        lambda r, w: _serve_connection(service, r, w), host, port, limit=MAX_HEADER,
+    )
+
+
+def serve(host="127.0.0.1", port=8765):
+    async def run():
+        server = await start_server(host, port)
+        addresses = ", ".join(f"http://{s.getsockname()[0]}:{s.getsockname()[1]}" for s in server.sockets)
+        print(f"Serving loadouts on {addresses}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
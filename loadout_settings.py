@@ -0,0 +1,129 @@
+"""loadout_config.json persistence: debounced, atomic, off the calling thread.
+
+save_soon() only records the latest settings; a background thread writes
+them once changes stop for `delay` seconds, so a burst of checkbox toggles
+(or a preset flipping a dozen of them) is a single write. Writes go to a
+temp file that is fsynced and then renamed over the config, so a crash
+leaves either the old file or the new one, never a truncated one. Failures
+are raised as SettingsError from load()/save()/flush() and handed to
+on_error(exc) for background writes. on_error runs on the writer thread once
+the write is over (flush() no longer waits on it), so it must only hand the
+error off, e.g. to a queue the GUI thread polls.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class SettingsError(Exception):
+    """The settings file could not be read or written."""
+
+
+class SettingsFile:
+    def __init__(self, path, delay=0.5, on_error=None):
+        self.path = Path(path)
+        self.delay = delay
+        self.on_error = on_error
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # one writer of the temp file at a time
+        self._pending = None
+        self._deadline = 0.0
+        self._writing = False
+        self._written = None  # text of the last successful write/read
+        self._thread = None
+        self._closed = False
+
+    def load(self):
+        """Settings dict from disk; {} when there is no file yet."""
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return {}
+        except OSError as exc:
+            raise SettingsError(f"cannot read {self.path}: {exc}") from exc
+        try:
+            data = json.loads(text)
+        except ValueError as exc:
+            raise SettingsError(f"{self.path} is not valid JSON ({exc}); using defaults") from exc
+        if not isinstance(data, dict):
+            raise SettingsError(f"{self.path} does not hold a settings object; using defaults")
+        self._written = text
+        return data
+
+    def save(self, data):
+        """Write now, on this thread."""
+        text = json.dumps(data, indent=2)
+        with self._write_lock:
+            if text == self._written:
+                return
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except OSError as exc:
+                try:
+                    tmp.unlink()
+                except OSError:
+                    pass
+                raise SettingsError(f"cannot save {self.path}: {exc}") from exc
+            self._written = text
+
+    def save_soon(self, data):
+        """Queue `data` for a background write once changes settle."""
+        with self._cond:
+            if self._closed:
+                return
+            self._pending = data
+            self._deadline = time.monotonic() + self.delay
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="settings-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self):
+        """Write whatever is queued right away (e.g. on exit); raises SettingsError."""
+        with self._cond:
+            while self._writing:
+                self._cond.wait()
+            data, self._pending = self._pending, None
+        if data is not None:
+            self.save(data)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.flush()
+
+    def _run(self):
+        cond = self._cond
+        while True:
+            with cond:
+                while not self._closed:
+                    if self._pending is None:
+                        cond.wait()
+                        continue
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    cond.wait(remaining)
+                if self._closed:
+                    return
+                data, self._pending = self._pending, None
+                self._writing = True
+            error = None
+            try:
+                self.save(data)
+            except SettingsError as exc:
+                error = exc
+            finally:
+                with cond:
+                    self._writing = False
+                    cond.notify_all()
+            if error is not None and self.on_error is not None:
+                self.on_error(error)
@@ -0,0 +1,126 @@
+"""The basic roll space: count it, rank/unrank it, walk it.
+
+A basic loadout is one value for each of the seven FIELD_NAMES slots (melee,
+weapon, magazines, ammo, armour, filter, money) drawn from its table, which
+is what roll_all() gives with the default settings. That space is finite:
+the product of the draw sizes (3 x 32 x 7 x 6 x 4 x 5 x 31 = 2,499,840 with
+the shipped catalog). rank() maps a loadout to its position in it, a
+mixed-radix number with melee as the most significant digit, and unrank()
+maps it back, so a roll can be stored, compared or deduplicated as one small
+integer (RankSet: a bitmap with O(1) add/contains for the whole space).
+iter_space() walks the space lazily in rank order for exhaustive analysis.
+
+    r = rank(engine.roll_all())
+    unrank(r).text
+    sum(1 for loadout in iter_space() if loadout["armour"] == "Ceramic")
+"""
+from itertools import islice, product
+
+from Loadout import DRAW_RANGES, FIELD_NAMES, LAYOUT_CODES, Loadout, encode
+
+SPACE_SLOTS = FIELD_NAMES
+RADICES = tuple(len(DRAW_RANGES[slot]) for slot in SPACE_SLOTS)
+
+# place value of each slot's digit; the last slot varies fastest
+PLACES = []
+_place = 1
+for _radix in reversed(RADICES):
+    PLACES.insert(0, _place)
+    _place *= _radix
+PLACES = tuple(PLACES)
+SIZE = _place
+del _place, _radix
+
+# packed bits for each slot's every index, so unranking is lookups and ORs
+_ENCODED = tuple(tuple(encode(slot, i) for i in range(radix)) for slot, radix in zip(SPACE_SLOTS, RADICES))
+_LAYOUT = LAYOUT_CODES["all"]
+
+
+def count():
+    """Number of distinct basic loadouts."""
+    return SIZE
+
+
+def rank_codes(codes):
+    """Rank of a {slot: SLOT_VALUES index} mapping; every space slot must be present and drawable."""
+    r = 0
+    for slot, radix, place in zip(SPACE_SLOTS, RADICES, PLACES):
+        index = codes.get(slot)
+        if index is None or not 0 <= index < radix:
+            raise ValueError(f"{slot}={index!r} is outside the basic roll space")
+        r += index * place
+    return r
+
+
+def rank(loadout):
+    """Position of `loadout` in the basic space; slots outside SPACE_SLOTS are ignored.
+
+    Raises ValueError when a space slot is missing (e.g. excluded, or a
+    detailed-only roll) or holds a value basic rolls never draw (preset extras).
+    """
+    return rank_codes(loadout.codes)
+
+
+def unrank_codes(r):
+    if not 0 <= r < SIZE:
+        raise ValueError(f"rank {r} is outside 0..{SIZE - 1}")
+    codes = {}
+    for slot, place in zip(SPACE_SLOTS, PLACES):
+        codes[slot], r = divmod(r, place)
+    return codes
+
+
+def unrank(r):
+    """The Loadout at rank r, as roll_all() would show it (no detailed slots)."""
+    packed = _LAYOUT
+    for encoded, index in zip(_ENCODED, unrank_codes(r).values()):
+        packed |= encoded[index]
+    return Loadout(packed)
+
+
+def iter_space(start=0, stop=None):
+    """Loadouts of ranks start..stop-1, in rank order, built lazily."""
+    stop = SIZE if stop is None else min(stop, SIZE)
+    if not 0 <= start <= stop:
+        raise ValueError(f"bad range {start}..{stop}")
+    # product() over each slot's encoded bits, resumed at `start`: the first
+    # slot's leading values are skipped outright, the rest via islice
+    lead, skip = divmod(start, PLACES[0])
+    first = _ENCODED[0][lead:]
+    for parts in islice(product(first, *_ENCODED[1:]), skip, skip + stop - start):
+        packed = _LAYOUT
+        for part in parts:
+            packed |= part
+        yield Loadout(packed)
+
+
+class RankSet:
+    """Which basic loadouts have been seen: one bit per rank, O(1) add/contains."""
+
+    def __init__(self, loadouts=()):
+        self.bits = bytearray((SIZE + 7) // 8)
+        self.size = 0
+        for loadout in loadouts:
+            self.add(loadout)
+
+    def add(self, loadout):
+        """Mark `loadout`; returns False if it was already seen."""
+        return self.add_rank(rank(loadout))
+
+    def add_rank(self, r):
+        byte, bit = r >> 3, 1 << (r & 7)
+        if self.bits[byte] & bit:
+            return False
+        self.bits[byte] |= bit
+        self.size += 1
+        return True
+
+    def __contains__(self, loadout):
+        try:
+            r = rank(loadout)
+        except ValueError:
+            return False
+        return bool(self.bits[r >> 3] & (1 << (r & 7)))
+
+    def __len__(self):
+        return self.size
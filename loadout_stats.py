@@ -0,0 +1,153 @@
+"""Streaming summary statistics over rolls, in constant memory.
+
+RollStats folds rolls in one at a time (add(), from LoadoutEngine) or a
+LoadoutBatch at a time (add_batch(), from loadout_bulk) and keeps only
+counters: per-slot value counts, roll counts per layout, line tag totals and
+a histogram of "bad" lines per roll. Nothing about an individual roll is
+kept, so memory does not grow with the number of rolls; summaries of
+separate runs combine with merge().
+
+Every slot is drawn from a finite table, so the value counts are themselves
+an exact, fixed-size sketch of the distribution: histograms and quantiles
+(quantile(), for numeric slots such as money) are read straight off them
+with no approximation error.
+
+    stats = RollStats()
+    for batch in loadout_bulk.iter_batches(1_000_000_000, seed=1):
+        stats.add_batch(batch)
+    stats.quantile("money", 0.5), stats.bad_share()
+"""
+from collections import Counter
+
+from Loadout import LAYOUT_FIELDS, LAYOUT_IDS, LAYOUT_SHIFT, LAYOUTS, LINE_TAGS, SLOT_ORDER, SLOT_VALUES
+
+TAGS = LINE_TAGS
+
+
+class RollStats:
+    """Counters for a stream of rolls; see the module docstring."""
+
+    def __init__(self):
+        self.rolls = 0
+        self.layouts = [0] * len(LAYOUTS)
+        self.counts = {slot: [0] * len(SLOT_VALUES[slot]) for slot in SLOT_ORDER}
+        self.tag_lines = dict.fromkeys(TAGS, 0)
+        self.bad_per_roll = Counter()  # bad lines in a roll -> rolls
+        self._bad_share_sum = 0.0
+
+    # --- Feeding ---
+    def add(self, loadout):
+        packed = loadout.packed
+        layout = packed >> LAYOUT_SHIFT
+        self.rolls += 1
+        self.layouts[layout] += 1
+        counts = self.counts
+        for slot, shift, mask in LAYOUT_FIELDS[layout]:
+            c = (packed >> shift) & mask
+            if c:
+                counts[slot][c - 1] += 1
+        tags = loadout.line_tags()
+        bad = 0
+        for tag in tags:
+            self.tag_lines[tag] += 1
+            bad += tag == "bad"
+        self.bad_per_roll[bad] += 1
+        self._bad_share_sum += bad / len(tags)
+
+    def extend(self, loadouts):
+        for loadout in loadouts:
+            self.add(loadout)
+
+    def add_batch(self, batch):
+        """Fold in a loadout_bulk.LoadoutBatch with NumPy, no per-row Python."""
+        from loadout_bulk import np
+        n = len(batch)
+        self.rolls += n
+        self.layouts[LAYOUT_IDS[batch.mode]] += n
+        for slot in SLOT_ORDER:
+            column = batch[slot]
+            freq = np.bincount(column[column >= 0], minlength=len(SLOT_VALUES[slot]))
+            counts = self.counts[slot]
+            for i in np.flatnonzero(freq).tolist():
+                counts[i] += int(freq[i])
+
+        per_tag, lines = batch.line_tags()
+        for tag, rows in per_tag.items():
+            self.tag_lines[tag] += int(rows.sum())
+        bad = per_tag["bad"]
+        freq = np.bincount(bad)
+        for k in np.flatnonzero(freq).tolist():
+            self.bad_per_roll[k] += int(freq[k])
+        self._bad_share_sum += float((bad / lines).sum())
+
+    def merge(self, other):
+        """Add another RollStats' counts into this one (e.g. from another worker)."""
+        self.rolls += other.rolls
+        self.layouts = [a + b for a, b in zip(self.layouts, other.layouts)]
+        for slot, counts in self.counts.items():
+            self.counts[slot] = [a + b for a, b in zip(counts, other.counts[slot])]
+        for tag in TAGS:
+            self.tag_lines[tag] += other.tag_lines[tag]
+        self.bad_per_roll.update(other.bad_per_roll)
+        self._bad_share_sum += other._bad_share_sum
+        return self
+
+    # --- Reading ---
+    def frequencies(self, slot):
+        """{value: rolls that showed it}, in table order, zeros left out."""
+        return {value: n for value, n in zip(SLOT_VALUES[slot], self.counts[slot]) if n}
+
+    def absent(self, slot):
+        """Rolls that did not show `slot`."""
+        return self.rolls - sum(self.counts[slot])
+
+    def histogram(self, slot, width):
+        """Numeric slot counts grouped into [k*width, (k+1)*width) bins: {bin start: rolls}."""
+        bins = Counter()
+        for value, n in self.frequencies(slot).items():
+            bins[value // width * width] += n
+        return dict(sorted(bins.items()))
+
+    def quantile(self, slot, q):
+        """Value at quantile q (0..1) of a numeric slot among the rolls that showed it."""
+        pairs = sorted(zip(SLOT_VALUES[slot], self.counts[slot]))
+        if any(not isinstance(value, (int, float)) for value, _ in pairs):
+            raise ValueError(f"{slot} is not numeric")
+        shown = sum(n for _, n in pairs)
+        if not shown:
+            return None
+        target = q * shown
+        seen = 0
+        for value, n in pairs:
+            seen += n
+            if n and seen >= target:
+                return value
+        return pairs[-1][0]
+
+    def mean(self, slot):
+        shown = sum(self.counts[slot])
+        if not shown:
+            return None
+        return sum(value * n for value, n in zip(SLOT_VALUES[slot], self.counts[slot])) / shown
+
+    def bad_share(self):
+        """Mean share of a roll's lines tagged "bad"."""
+        return self._bad_share_sum / self.rolls if self.rolls else 0.0
+
+    def to_dict(self):
+        """JSON-ready summary (value keys are stringified)."""
+        return {
+            "rolls": self.rolls,
+            "modes": {layout.mode: n for layout, n in zip(LAYOUTS, self.layouts) if n},
+            "slots": {
+                slot: {"absent": self.absent(slot), "counts": {str(v): n for v, n in self.frequencies(slot).items()}}
+                for slot in SLOT_ORDER
+            },
+            "money": {
+                "mean": self.mean("money"),
+                "quantiles": {f"p{round(q * 100)}": self.quantile("money", q) for q in (0.05, 0.25, 0.5, 0.75, 0.95)},
+            },
+            "lines": dict(self.tag_lines),
+            "bad_lines_per_roll": {str(k): n for k, n in sorted(self.bad_per_roll.items())},
+            "bad_share": self.bad_share(),
+        }
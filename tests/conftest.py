@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+# the modules live flat in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Loadout import PRESETS, ROLL_MODES, RollSettings  # noqa: E402
+
+# every mode a roll can be made in: the normal ones, then the presets
+MODES = [*ROLL_MODES, *(f"preset={name}" for name in PRESETS)]
+
+
+def all_included():
+    """RollSettings with every slot switched on and nothing locked."""
+    settings = RollSettings()
+    settings.include.update(dict.fromkeys(settings.include, True))
+    return settings
+
+
+def nothing_included():
+    settings = RollSettings()
+    settings.include.update(dict.fromkeys(settings.include, False))
+    return settings
@@ -0,0 +1,29 @@
+import pytest
+from conftest import MODES, all_included
+
+from Loadout import LINE_TAGS, RollSettings
+
+np = pytest.importorskip("numpy")
+import loadout_bulk  # noqa: E402  (needs NumPy)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_batch_tag_counts_match_line_tags(mode):
+    batch = loadout_bulk.roll_batch(500, mode=mode, seed=2)
+    for tag in LINE_TAGS:
+        assert batch.tag_counts(tag).tolist() == [roll.line_tags().count(tag) for roll in batch]
+
+
+def test_rows_decode_like_the_columns():
+    batch = loadout_bulk.roll_batch(200, all_included(), seed=3)
+    for i, roll in enumerate(batch):
+        assert roll.get("armour") == batch.decode("armour")[i]
+        assert roll.packed == int(batch.packed()[i])
+
+
+def test_locked_slot_repeats():
+    settings = RollSettings()
+    settings.lock["weapon"] = True
+    batch = loadout_bulk.roll_batch(300, settings, fields={"weapon": 4, "magazines": 1, "ammo": 0}, seed=4)
+    assert set(batch["weapon"].tolist()) == {4}
+    assert set(batch["ammo"].tolist()) == {0}
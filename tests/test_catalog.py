@@ -0,0 +1,105 @@
+import copy
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from loadout_catalog import CatalogError, compile_catalog, default_catalog_path, load_catalog, require_word64
+
+ROOT = Path(__file__).resolve().parent.parent
+
+with open(default_catalog_path(), encoding="utf-8") as f:
+    SHIPPED = json.load(f)
+
+
+def _edited(edit):
+    data = copy.deepcopy(SHIPPED)
+    edit(data)
+    return data
+
+
+def test_shipped_catalog_compiles():
+    compiled = compile_catalog(copy.deepcopy(SHIPPED))
+    assert set(compiled["presets"]) == set(SHIPPED["presets"])
+
+
+@pytest.mark.parametrize("edit, message", [
+    (lambda d: d.update(version=999), "version"),
+    (lambda d: d["basic"].pop("armour"), "basic"),
+    (lambda d: d["basic"]["armour"].append("Cloth"), "duplicate"),
+    (lambda d: d["money"].update(step=0), "step"),
+    (lambda d: d["detailed"]["food"].append(["Bread", 0]), "must be > 0"),
+    (lambda d: d["detailed"]["food"].append("Bread"), r"not \[item, weight\]"),
+    (lambda d: d["extras"].update(armour=["Cloth"]), "repeats a value"),
+    (lambda d: d["extras"].update(boots=["Sandals"]), "unknown slot"),
+    (lambda d: d.update(presets=[]), "presets: expected an object"),
+])
+def test_bad_tables(edit, message):
+    with pytest.raises(CatalogError, match=message):
+        compile_catalog(_edited(edit))
+
+
+def test_unreadable_and_invalid_files(tmp_path):
+    with pytest.raises(CatalogError, match="cannot read"):
+        load_catalog(tmp_path / "missing.json")
+    bad = tmp_path / "catalog.json"
+    bad.write_text("{", encoding="utf-8")
+    with pytest.raises(CatalogError, match="invalid JSON"):
+        load_catalog(bad)
+
+
+def test_cache_round_trip(tmp_path):
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(SHIPPED), encoding="utf-8")
+    first = load_catalog(path)
+    assert (tmp_path / "catalog.cache").exists()
+    assert load_catalog(path) == first == load_catalog(path, use_cache=False)
+
+
+def test_packed_bits_match_the_engine():
+    import Loadout
+    assert compile_catalog(copy.deepcopy(SHIPPED))["packed_bits"] == Loadout.PACKED_BITS
+
+
+@pytest.mark.parametrize("edit", [
+    lambda d: d["money"].update(step=1000),
+    lambda d: d["extras"].update(weapon=[f"Gun {i}" for i in range(200)], pack=[f"Pack {i}" for i in range(200)]),
+])
+def test_wide_catalog_compiles_but_has_no_word64(edit):
+    compiled = compile_catalog(_edited(edit))
+    assert compiled["packed_bits"] > 64
+    with pytest.raises(CatalogError, match="too large for the test: a packed roll needs"):
+        require_word64(compiled, "the test")
+    require_word64(compile_catalog(copy.deepcopy(SHIPPED)), "the test")
+
+
+def test_wide_catalog_still_rolls(tmp_path):
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(_edited(lambda d: d["money"].update(step=1000))), encoding="utf-8")
+    # a fresh interpreter, since Loadout compiles its tables from the catalog at import
+    script = (
+        "import random, Loadout, loadout_bulk, loadout_catalog\n"
+        "engine = Loadout.LoadoutEngine(rng=random.Random(1))\n"
+        "rolls = [engine.roll_all() for _ in range(200)]\n"
+        "assert all(engine.replay('all', r.seed) == r and r.text for r in rolls)\n"
+        "sampler = list(Loadout.PRESET_SAMPLERS.values())[-1]  # highest layout id\n"
+        "presets = list(sampler.roll_many(20, random.Random(2)))\n"
+        "assert all(Loadout.Loadout.unpack(r.pack()) == r and r.text for r in presets)\n"
+        "batch = loadout_bulk.roll_batch(20, seed=3)\n"
+        "assert batch.row(0).text\n"
+        "try:\n"
+        "    batch.packed()\n"
+        "except loadout_catalog.CatalogError:\n"
+        "    pass\n"
+        "else:\n"
+        "    raise AssertionError('uint64 words from a 65-bit catalog')\n"
+        "print(Loadout.PACKED_BITS, max(r.packed for r in presets).bit_length())\n"
+    )
+    env = {**os.environ, "LOADOUT_CATALOG": str(path), "PYTHONPATH": str(ROOT)}
+    result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    bits, widest = map(int, result.stdout.split())
+    assert bits == 65 and widest > 64
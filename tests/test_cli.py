@@ -0,0 +1,40 @@
+import io
+import json
+
+import pytest
+
+from Loadout import build_parser, run_generate
+
+
+def _generate(*argv):
+    out = io.StringIO()
+    run_generate(build_parser().parse_args(["generate", *argv]), out)
+    return out.getvalue()
+
+
+def test_jsonl_records():
+    records = [json.loads(line) for line in _generate("--count", "5", "--format", "jsonl", "--seed", "1").splitlines()]
+    assert len(records) == 5
+    assert all("weapon" in record and "money" in record for record in records)
+
+
+def test_seeded_output_does_not_depend_on_workers():
+    one = _generate("--count", "40", "--format", "csv", "--seed", "3")
+    two = _generate("--count", "40", "--format", "csv", "--seed", "3", "--workers", "2")
+    assert one == two
+    assert len(one.splitlines()) == 41  # header + rows
+
+
+@pytest.mark.parametrize("argv", [
+    ["--count", "-1"],
+    ["--count", "0"],
+    ["--workers", "0"],
+    ["--workers", "-2"],
+    ["--mode", "sideways"],
+    ["--format", "xml"],
+])
+def test_bad_arguments_exit(argv, capsys):
+    with pytest.raises(SystemExit) as exc:
+        build_parser().parse_args(["generate", *argv])
+    assert exc.value.code == 2
+    assert "error" in capsys.readouterr().err
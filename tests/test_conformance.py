@@ -0,0 +1,45 @@
+import copy
+import io
+import json
+
+import pytest
+
+import loadout_conformance
+from loadout_catalog import CatalogError, compile_catalog, default_catalog_path
+
+with open(default_catalog_path(), encoding="utf-8") as f:
+    SHIPPED = json.load(f)
+
+
+def _rookie_extras(extras):
+    data = copy.deepcopy(SHIPPED)
+    if extras is None:
+        del data["presets"]["desperate_rookie"]["extras"]
+    else:
+        data["presets"]["desperate_rookie"]["extras"] = extras
+    return data
+
+
+def test_shipped_catalog_conforms():
+    assert loadout_conformance.run(samples=5000, out=io.StringIO()) == 0
+
+
+def test_undeclared_preset_extras_are_flagged(monkeypatch):
+    monkeypatch.setattr(loadout_conformance, "CATALOG", compile_catalog(_rookie_extras(None)))
+    problems = loadout_conformance.off_table("preset=desperate_rookie")
+    assert [slot for slot, _problem in problems] == ["ammo"]
+    assert "Half a Stack" in problems[0][1]
+    assert loadout_conformance.off_table("preset=hungover") == []
+
+
+def test_preset_extras_must_be_extras():
+    with pytest.raises(CatalogError, match="lists a value of the plain table"):
+        compile_catalog(_rookie_extras({"ammo": ["1 Stack"]}))
+
+
+def test_chi_square_catches_a_skew():
+    expected = {i: 0.25 for i in range(4)}
+    fair = {i: 2500 for i in range(4)}
+    skewed = {0: 2800, 1: 2400, 2: 2400, 3: 2400}
+    assert loadout_conformance.chi_square(fair, expected, 10_000)[2] > 0.99
+    assert loadout_conformance.chi_square(skewed, expected, 10_000)[2] < 1e-4
@@ -0,0 +1,78 @@
+import random
+from collections import Counter
+from fractions import Fraction
+
+import pytest
+
+from Loadout import LoadoutEngine, RollSettings, resolve_mode
+from loadout_conformance import chi_square
+from loadout_constraints import ConstrainedSampler, UnsatisfiableError, money_value, tagged
+
+N = 20_000
+
+
+def _no_weapon():
+    settings = RollSettings()
+    settings.include["weapon"] = False
+    return settings
+
+
+def _good(roll):
+    return any(tag == "good" for tag in roll.line_tags())
+
+
+def _rejection(mode, settings, accept, n, seed):
+    """Counts of n accepted plain rolls, and how many rolls it took."""
+    engine = LoadoutEngine(settings, random.Random(seed), record_seeds=False)
+    roll = resolve_mode(mode)
+    counts, tries = Counter(), 0
+    while sum(counts.values()) < n:
+        loadout = roll(engine)
+        tries += 1
+        if accept(loadout):
+            counts[loadout.packed] += 1
+    return counts, tries
+
+
+def _same_distribution(a, b):
+    """Two-sample check: every count pair within 5 sigma of its pooled mean."""
+    for key in set(a) | set(b):
+        pooled = (a[key] + b[key]) / 2
+        assert abs(a[key] - b[key]) <= 5 * (2 * pooled) ** 0.5 + 5, key
+
+
+def test_at_least_matches_rejection_sampling():
+    settings = _no_weapon()
+    sampler = ConstrainedSampler("basic", settings, at_least=[(1, tagged("good"))])
+    rolls = sampler.roll_many(N, random.Random(1))
+    assert all(_good(roll) for roll in rolls)
+    constrained = Counter(roll.packed for roll in rolls)
+    rejected, tries = _rejection("basic", settings, _good, N, 2)
+    _same_distribution(constrained, rejected)
+    assert abs(N / tries - float(sampler.probability)) < 0.02
+
+
+def test_budget_is_exact():
+    sampler = ConstrainedSampler("money", budget=(money_value, 0, 50_000))
+    assert sampler.probability == Fraction(11, 31)
+    counts = Counter(roll["money"] for roll in sampler.roll_many(N, random.Random(3)))
+    assert max(counts) <= 50_000
+    _stat, _dof, p = chi_square(counts, {value: 1 / 11 for value in range(0, 50_001, 5000)}, N)
+    assert p > 1e-4
+
+
+def test_allow_restricts_a_slot():
+    sampler = ConstrainedSampler("basic", allow={"armour": {"Kevlar", "Ceramic"}})
+    assert sampler.probability == Fraction(1, 2)
+    assert {roll["armour"] for roll in sampler.roll_many(2000, random.Random(4))} == {"Kevlar", "Ceramic"}
+    assert sampler.roll(seed=9) == sampler.roll(seed=9)
+    assert sampler.roll(seed=9).seed is None  # LoadoutEngine.replay could not reproduce it
+
+
+def test_unsatisfiable():
+    with pytest.raises(UnsatisfiableError):
+        ConstrainedSampler("basic", allow={"armour": "Mithril"})
+    with pytest.raises(UnsatisfiableError):
+        ConstrainedSampler("money", allow={"weapon": "Rusty AKM"})
+    with pytest.raises(UnsatisfiableError):
+        ConstrainedSampler("money", budget=(money_value, 1, 4999))
@@ -0,0 +1,41 @@
+import random
+
+from conftest import MODES, all_included
+
+from Loadout import Loadout, LoadoutEngine
+
+
+def test_diff_reports_changed_slots():
+    a = Loadout.from_values({"melee": "Fists", "armour": "Ceramic", "money": 0})
+    b = Loadout.from_values({"melee": "Fists", "armour": "Kevlar", "money": 5000})
+    assert b.diff(a) == {"armour", "money"}
+    assert a.diff(a) == set()
+
+
+def test_diff_needs_full_redraw_when_layout_changes():
+    a = Loadout.from_values({"melee": "Fists", "armour": "Ceramic"})
+    assert a.diff(None) is None
+    assert Loadout.from_values({"melee": "Fists"}).diff(a) is None  # armour switched off
+    assert Loadout.from_values({"melee": "Fists", "armour": "Ceramic"}, mode="basic").diff(a) is None
+
+
+def test_reroll_keeps_locked_slots_out_of_changed():
+    settings = all_included()
+    settings.lock["armour"] = True
+    engine = LoadoutEngine(settings, random.Random(7))
+    engine.reroll("all")
+    for _ in range(20):
+        _loadout, changed = engine.reroll("all")
+        assert "armour" not in changed
+
+
+def test_line_slots_parallel_lines():
+    engine = LoadoutEngine(all_included(), random.Random(5))
+    for mode in MODES:
+        for _ in range(5):
+            roll = engine.reroll(mode)[0]
+            deps = roll.line_slots()
+            assert len(deps) == len(roll.lines()) == len(roll.line_tags())
+            assert all(dep == () for dep in deps[:len(roll.header)])
+            assert {slot for dep in deps for slot in dep} == set(roll.codes)
+    assert Loadout.from_codes({}, "basic").line_slots() == [()]
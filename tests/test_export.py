@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("numpy")
+from loadout_export import ExportError, export, open_npy  # noqa: E402  (needs NumPy)
+import loadout_bulk  # noqa: E402
+
+
+def test_npy_round_trip(tmp_path):
+    rows = export(tmp_path / "rolls", 2500, "npy", mode="basic", seed=1, chunk_size=1000)
+    assert rows == 2500
+    batch = open_npy(tmp_path / "rolls")
+    assert len(batch) == 2500 and batch.mode == "basic"
+    expected = list(loadout_bulk.iter_batches(2500, mode="basic", seed=1, chunk_size=1000))
+    assert list(batch)[:1000] == list(expected[0])
+    assert list(batch)[-500:] == list(expected[-1])
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"count": -3}, "count"),
+    ({"count": 10, "chunk_size": 0}, "chunk size"),
+    ({"count": 10, "fmt": "xlsx"}, "unknown format"),
+    ({"count": 10, "mode": "sideways"}, "no bulk roller"),
+])
+def test_bad_arguments(tmp_path, kwargs, message):
+    kwargs.setdefault("fmt", "npy")
+    with pytest.raises(ExportError, match=message):
+        export(tmp_path / "out", **kwargs)
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_arrow_formats_decode_to_the_table_values(tmp_path, fmt):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    ipc = pytest.importorskip("pyarrow.ipc")
+
+    path = tmp_path / f"rolls.{fmt}"
+    assert export(path, 300, fmt, seed=2, chunk_size=128) == 300
+    table = parquet.read_table(path) if fmt == "parquet" else ipc.open_file(path).read_all()
+    rolls = [roll for batch in loadout_bulk.iter_batches(300, seed=2, chunk_size=128) for roll in batch]
+    assert table.column("armour").to_pylist() == [roll.get("armour") for roll in rolls]
+    assert table.column("money").to_pylist() == [roll.get("money") for roll in rolls]
@@ -0,0 +1,139 @@
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from Loadout import SLOT_VALUES, Loadout, LoadoutEngine
+from loadout_catalog import default_catalog_path
+from loadout_history import HistoryStore
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def rolls():
+    engine = LoadoutEngine(rng=random.Random(1))
+    return [engine.roll_all() for _ in range(200)]
+
+
+def test_append_and_get(store, rolls):
+    row_id = store.append(rolls[0])
+    assert store.get(row_id) == rolls[0]
+    assert store.get(row_id).seed == rolls[0].seed
+    assert store.last() == rolls[0]
+    with pytest.raises(KeyError):
+        store.get(row_id + 1)
+
+
+def test_seeds_survive_the_signed_column(store):
+    engine = LoadoutEngine(rng=random.Random(2))
+    roll = engine.roll_all(seed=(1 << 64) - 1)
+    assert store.get(store.append(roll)).seed == (1 << 64) - 1
+
+
+def test_paging_is_newest_first(store, rolls):
+    store.extend(rolls)
+    assert len(store) == len(rolls)
+    seen, before = [], None
+    while True:
+        page = store.page(limit=30, before=before)
+        if not page:
+            break
+        seen.extend(loadout for _id, loadout in page)
+        before = page[-1][0]
+    assert seen == rolls[::-1]
+    assert [loadout for _id, loadout in store.rows(40, 10)] == rolls[::-1][40:50]
+
+
+@pytest.mark.parametrize("filters", [
+    {"armour": "Ceramic"},
+    {"weapon": SLOT_VALUES["weapon"][0]},
+    {"money_min": 50_000},
+    {"money_max": 20_000},
+    {"money_min": 12_345, "money_max": 80_000, "armour": "Kevlar"},
+])
+def test_filters_match_matches(store, rolls, filters):
+    store.extend(rolls)
+    expected = [loadout for loadout in rolls[::-1] if HistoryStore.matches(loadout, **filters)]
+    assert expected
+    assert store.count(**filters) == len(expected)
+    assert [loadout for _id, loadout in store.page(limit=1000, **filters)] == expected
+    assert [loadout for _id, loadout in store.rows(2, 3, **filters)] == expected[2:5]
+
+
+def test_money_filter_skips_rolls_without_money(store):
+    engine = LoadoutEngine(rng=random.Random(3))
+    store.append(engine.roll_basic())
+    assert store.count(money_min=0) == 0
+    assert store.count() == 1
+
+
+def test_rows_keep_values_when_the_catalog_changes(tmp_path):
+    # roll under a catalog with one more weapon up front, so every weapon
+    # index shifts, then read the history back under the shipped one
+    data = json.loads(default_catalog_path().read_text(encoding="utf-8"))
+    data["basic"]["weapon"].insert(0, "Test Gun")
+    edited = tmp_path / "catalog.json"
+    edited.write_text(json.dumps(data), encoding="utf-8")
+    db = tmp_path / "history.sqlite3"
+    script = (
+        "import json, random, sys, Loadout, loadout_history\n"
+        "engine = Loadout.LoadoutEngine(rng=random.Random(5))\n"
+        "rolls = [engine.roll_all() for _ in range(300)]\n"
+        "loadout_history.HistoryStore(sys.argv[1]).extend(rolls)\n"
+        "print(json.dumps([[r.mode, r.slots] for r in rolls]))\n"
+    )
+    env = {**os.environ, "LOADOUT_CATALOG": str(edited), "PYTHONPATH": str(ROOT)}
+    result = subprocess.run([sys.executable, "-c", script, str(db)], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    written = json.loads(result.stdout)
+    kept = [Loadout.from_values(slots, mode) for mode, slots in written if slots.get("weapon") != "Test Gun"]
+    assert 0 < len(kept) < len(written)
+
+    store = HistoryStore(db)
+    assert [loadout for _id, loadout in store.rows(0, 1000)] == kept[::-1]
+    assert all(loadout.seed is None for _id, loadout in store.page(limit=1000))
+    assert store.orphans() == len(written) - len(kept)
+    assert store.count(weapon=kept[0]["weapon"]) == sum(r["weapon"] == kept[0]["weapon"] for r in kept)
+    store.close()
+    reopened = HistoryStore(db)  # same catalog now: nothing moves again
+    assert len(reopened) == len(kept) and reopened.orphans() == len(written) - len(kept)
+    reopened.close()
+
+
+def test_seeds_survive_reopening_under_the_same_catalog(tmp_path, rolls):
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    store.extend(rolls)
+    store.close()
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    assert [loadout.seed for _id, loadout in store.page(limit=1000)] == [roll.seed for roll in rolls[::-1]]
+    store.close()
+
+
+def test_packed_rows_are_set_aside(tmp_path):
+    db = sqlite3.connect(tmp_path / "history.sqlite3")
+    db.executescript("""
+        CREATE TABLE rolls (id INTEGER PRIMARY KEY, packed INTEGER NOT NULL, seed INTEGER, created REAL NOT NULL,
+                            weapon INTEGER, armour INTEGER, money INTEGER);
+        CREATE INDEX rolls_weapon ON rolls (weapon, id);
+        CREATE INDEX rolls_armour ON rolls (armour, id);
+        CREATE INDEX rolls_money ON rolls (money, id);
+        INSERT INTO rolls (packed, created) VALUES (12345, 0);
+    """)
+    db.close()
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    assert len(store) == 0 and store.last() is None
+    assert store.db.execute("SELECT COUNT(*) FROM rolls_packed").fetchone()[0] == 1
+    store.close()
@@ -0,0 +1,89 @@
+import random
+from fractions import Fraction
+from itertools import product
+
+import pytest
+from conftest import all_included
+
+from Loadout import (
+    FLAG_SLOTS,
+    LAYOUTS,
+    LINE_TAGS,
+    LOCK_DEFAULTS,
+    MODE_FLAGS,
+    ROLL_MODES,
+    Loadout,
+    LoadoutEngine,
+    RollSettings,
+)
+from loadout_odds import marginals, probability, slot_model, tag_count_distribution
+
+
+def _enumerate(mode, settings=None, fields=None):
+    """Every roll slot_model() allows, with its exact probability."""
+    model = slot_model(mode, settings, fields)
+    slots = list(model)
+    for picks in product(*(model[slot].items() for slot in slots)):
+        p = Fraction(1)
+        for _index, q in picks:
+            p *= q
+        yield Loadout.from_codes(dict(zip(slots, (index for index, _q in picks))), mode), p
+
+
+def _no_weapon():
+    settings = RollSettings()
+    settings.include["weapon"] = False
+    return settings
+
+
+CASES = [
+    ("money", None, None),
+    ("basic", _no_weapon(), None),
+    ("preset=hungover", None, None),
+    ("preset=desperate_rookie", None, None),
+]
+
+
+@pytest.mark.parametrize("mode, settings, fields", CASES)
+def test_tag_counts_match_enumeration(mode, settings, fields):
+    for tag in LINE_TAGS:
+        exact = {}
+        for roll, p in _enumerate(mode, settings, fields):
+            k = roll.line_tags().count(tag)
+            exact[k] = exact.get(k, 0) + p
+        dist = tag_count_distribution(mode, tag, settings, fields)
+        assert sum(dist) == 1
+        assert {k: p for k, p in enumerate(dist) if p} == exact
+
+
+@pytest.mark.parametrize("mode, settings, fields", CASES)
+def test_probability_matches_enumeration(mode, settings, fields):
+    rolls = list(_enumerate(mode, settings, fields))
+    assert sum(p for _roll, p in rolls) == 1
+    for slot, dist in marginals(mode, settings, fields).items():
+        for value, p in dist.items():
+            assert probability(mode, settings, fields, **{slot: value}) == p
+            assert sum(q for roll, q in rolls if roll[slot] == value) == p
+
+
+def test_locked_slot_is_certain():
+    settings = RollSettings()
+    settings.lock["weapon"] = True
+    fields = {"weapon": 3, "magazines": 1, "ammo": 2}
+    model = slot_model("basic", settings, fields)
+    assert model["weapon"] == {3: 1} and model["magazines"] == {1: 1} and model["ammo"] == {2: 1}
+    assert len(model["melee"]) > 1
+
+
+def test_hidden_slot_has_probability_zero():
+    assert probability("money", weapon="Rusty AKM") == 0
+
+
+def test_modes_show_what_the_table_says():
+    engine = LoadoutEngine(all_included(), random.Random(6))
+    for mode, flags in MODE_FLAGS.items():
+        shown = {slot for flag in flags for slot in FLAG_SLOTS[flag]}
+        assert set(ROLL_MODES[mode](engine).codes) == shown
+        assert set(slot_model(mode, all_included())) == shown
+    assert {layout.mode for layout in LAYOUTS} >= set(MODE_FLAGS)
+    assert set(LOCK_DEFAULTS) <= set(FLAG_SLOTS)
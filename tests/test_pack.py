@@ -0,0 +1,33 @@
+import random
+
+from conftest import MODES, all_included
+
+from Loadout import SLOT_ORDER, Loadout, LoadoutArray, LoadoutEngine, resolve_mode
+
+
+def test_pack_round_trip():
+    engine = LoadoutEngine(all_included(), random.Random(4))
+    for mode in MODES:
+        roll = resolve_mode(mode)(engine)
+        back = Loadout.unpack(roll.pack(), roll.seed)
+        assert back == roll
+        assert back.mode == mode
+        assert back.slots == roll.slots
+        assert back.lines() == roll.lines()
+
+
+def test_loadout_array_keeps_words():
+    engine = LoadoutEngine(all_included(), random.Random(5))
+    rolls = [engine.roll_all() for _ in range(50)]
+    array = LoadoutArray(rolls)
+    assert len(array) == 50
+    assert list(array) == rolls
+    assert array[7] == rolls[7]
+
+
+def test_from_values_matches_slots():
+    values = {"weapon": "Rusty AKM", "armour": "Ceramic", "money": 0}
+    roll = Loadout.from_values(values)
+    assert roll.slots == {slot: values[slot] for slot in SLOT_ORDER if slot in values}
+    assert "melee" not in roll
+    assert roll.get("melee") is None
@@ -0,0 +1,60 @@
+import copy
+import json
+import random
+
+import pytest
+
+from Loadout import PRESET_SAMPLERS, PRESETS, LoadoutEngine
+from loadout_catalog import CatalogError, compile_catalog, default_catalog_path
+
+with open(default_catalog_path(), encoding="utf-8") as f:
+    SHIPPED = json.load(f)
+
+
+def _edited(edit):
+    data = copy.deepcopy(SHIPPED)
+    edit(data)
+    return data
+
+
+def _preset(name, **changes):
+    return lambda data: data["presets"][name].update(changes)
+
+
+@pytest.mark.parametrize("edit, message", [
+    (lambda d: d["presets"].update(broken=[]), "presets.broken: expected an object"),
+    (_preset("hungover", fixed=["melee"]), "fixed: expected an object"),
+    (_preset("desperate_rookie", pools=["melee"]), "pools: expected an object"),
+    (_preset("desperate_rookie", weights={"melee": 3}), "weights.melee: expected an object"),
+    (_preset("desperate_rookie", draw="melee"), "draw: expected a list"),
+    (_preset("desperate_rookie", draw=["melee", "melee"]), "duplicate slots"),
+    (_preset("desperate_rookie", draw=["boots"]), "unknown slot"),
+    (_preset("desperate_rookie", pools={"melee": ["Lightsaber"]}), "not in the catalog"),
+    (_preset("desperate_rookie", fixed={"melee": "Fists"}), "both drawn and fixed"),
+    (_preset("desperate_rookie", order="melee"), "order: expected a list"),
+    (_preset("desperate_rookie", header="Rookie"), "header: expected a list of strings"),
+    (_preset("scuffed_raider", pools={"money": [0, 5000]}), "money"),
+    (_preset("scuffed_raider", pools={"money": {"min": 1, "max": 2}}), "matches no money step"),
+    (_preset("scuffed_raider", weights={"melee": {"Fists": -1}}), "must be >= 0"),
+])
+def test_bad_presets(edit, message):
+    with pytest.raises(CatalogError, match=message):
+        compile_catalog(_edited(edit))
+
+
+def test_fixed_slots_and_pools():
+    hungover = PRESET_SAMPLERS["hungover"].roll(random.Random(1))
+    assert hungover.slots == {slot: value for slot, value in SHIPPED["presets"]["hungover"]["fixed"].items()}
+    rookie = SHIPPED["presets"]["desperate_rookie"]["pools"]
+    rng = random.Random(2)
+    for _ in range(200):
+        roll = PRESET_SAMPLERS["desperate_rookie"].roll(rng)
+        assert all(roll[slot] in pool for slot, pool in rookie.items())
+
+
+def test_preset_rolls_switch_the_engine_settings():
+    engine = LoadoutEngine(rng=random.Random(3))
+    PRESETS["desperate_rookie"](engine)
+    spec = SHIPPED["presets"]["desperate_rookie"]
+    assert all(engine.settings.include[flag] for flag in spec["include"])
+    assert not any(engine.settings.lock.values())
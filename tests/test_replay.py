@@ -0,0 +1,32 @@
+import random
+
+from conftest import MODES, all_included
+
+from Loadout import LoadoutEngine
+
+
+def test_replay_reproduces_every_mode():
+    engine = LoadoutEngine(all_included(), random.Random(1))
+    for mode in MODES:
+        for _ in range(20):
+            roll = engine.reroll(mode)[0]
+            assert roll.seed is not None
+            fresh = LoadoutEngine(all_included())
+            assert fresh.replay(mode, roll.seed) == roll
+
+
+def test_locked_rolls_carry_no_seed():
+    settings = all_included()
+    settings.lock["weapon"] = True
+    engine = LoadoutEngine(settings, random.Random(2))
+    first = engine.roll_all()
+    second = engine.roll_all()
+    assert first.seed is not None
+    assert second.seed is None
+    assert second["weapon"] == first["weapon"]
+    assert LoadoutEngine(all_included()).replay("all", first.seed) == first
+
+
+def test_record_seeds_off_gives_no_seed():
+    engine = LoadoutEngine(rng=random.Random(3), record_seeds=False)
+    assert engine.roll_all().seed is None
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from Loadout import PRESETS, LoadoutEngine, RollSettings
+from loadout_server import MAX_BATCH, HTTPError, RollService, start_server
+
+
+@pytest.fixture
+def service():
+    return RollService(random.Random(1))
+
+
+def _status(service, method, target, body=b""):
+    try:
+        return service.handle(method, target, body)[0]
+    except HTTPError as exc:
+        return exc.status
+
+
+def test_roll_replays_from_its_seed(service):
+    status, record = service.handle("GET", "/roll?mode=basic")
+    assert status == 200
+    assert record["mode"] == "basic"
+    assert len(record["lines"]) == len(record["tags"])
+    _, again = service.handle("GET", f"/roll?mode=basic&seed={record['seed']}")
+    assert again == record
+    assert LoadoutEngine().replay("basic", record["seed"]).slots == record["slots"]
+
+
+def test_preset_route(service):
+    name = next(iter(PRESETS))
+    status, record = service.handle("GET", f"/preset/{name}?seed=7")
+    assert status == 200
+    assert record["mode"] == f"preset={name}"
+    assert service.handle("GET", f"/roll?mode=preset={name}&seed=7")[1] == record
+
+
+def test_batch_from_one_seed(service):
+    _, first = service.handle("GET", "/roll/batch?mode=all&count=5&seed=3")
+    _, second = service.handle("GET", "/roll/batch?mode=all&count=5&seed=3")
+    assert len(first["rolls"]) == 5
+    assert first == second
+
+
+def test_post_body_with_settings(service):
+    settings = RollSettings()
+    settings.include.update(dict.fromkeys(settings.include, False))
+    settings.include["armour"] = True
+    body = json.dumps({"mode": "basic", "seed": 11, "settings": settings.to_dict()}).encode()
+    status, record = service.handle("POST", "/roll", body)
+    assert status == 200
+    assert list(record["slots"]) == ["armour"]
+
+
+@pytest.mark.parametrize("method, target, body, status", [
+    ("DELETE", "/roll", b"", 405),
+    ("GET", "/nowhere", b"", 404),
+    ("GET", "/preset/nobody", b"", 404),
+    ("GET", "/roll?mode=sideways", b"", 400),
+    ("GET", "/roll?mode=preset=nobody", b"", 404),
+    ("GET", "/roll?seed=abc", b"", 400),
+    ("GET", "/roll/batch?count=0", b"", 400),
+    ("GET", f"/roll/batch?count={MAX_BATCH + 1}", b"", 400),
+    ("POST", "/roll", b"{", 400),
+    ("POST", "/roll", b"[1, 2]", 400),
+    ("POST", "/roll", b'{"mode": 5}', 400),
+    ("POST", "/roll", b'{"mode": ["all"]}', 400),
+    ("POST", "/roll", b'{"settings": "all"}', 400),
+])
+def test_bad_requests(service, method, target, body, status):
+    assert _status(service, method, target, body) == status
+
+
+def _exchange(raw):
+    async def talk():
+        server = await start_server(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+        finally:
+            server.close()
+            await server.wait_closed()
+    return asyncio.run(talk())
+
+
+def test_http_keep_alive_and_pipelining():
+    request = b"GET /roll?mode=money&seed=1 HTTP/1.1\r\nHost: x\r\n\r\n"
+    response = _exchange(request + request.replace(b"Host: x", b"Connection: close"))
+    assert response.count(b"HTTP/1.1 200 OK") == 2
+
+
+def test_http_negative_content_length():
+    response = _exchange(b"POST /roll HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 400 ")
@@ -0,0 +1,72 @@
+import json
+import threading
+
+import pytest
+
+from loadout_settings import SettingsError, SettingsFile
+
+
+def test_save_and_load(tmp_path):
+    settings = SettingsFile(tmp_path / "config.json")
+    assert settings.load() == {}
+    settings.save({"include": {"melee": False}})
+    assert settings.load() == {"include": {"melee": False}}
+    assert json.loads((tmp_path / "config.json").read_text(encoding="utf-8")) == {"include": {"melee": False}}
+    assert [p.name for p in tmp_path.iterdir()] == ["config.json"]  # no temp file left behind
+
+
+def test_failed_save_keeps_the_old_file(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    settings = SettingsFile(path)
+    settings.save({"autosave": True})
+
+    def broken_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("loadout_settings.os.replace", broken_replace)
+    with pytest.raises(SettingsError, match="disk full"):
+        settings.save({"autosave": False})
+    assert json.loads(path.read_text(encoding="utf-8")) == {"autosave": True}
+    assert [p.name for p in tmp_path.iterdir()] == ["config.json"]
+
+
+@pytest.mark.parametrize("text, message", [
+    ("{", "not valid JSON"),
+    ("[1, 2]", "does not hold a settings object"),
+])
+def test_bad_files(tmp_path, text, message):
+    path = tmp_path / "config.json"
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(SettingsError, match=message):
+        SettingsFile(path).load()
+
+
+def test_save_soon_debounces_into_one_write(tmp_path, monkeypatch):
+    settings = SettingsFile(tmp_path / "config.json", delay=0.05)
+    writes = []
+    save = settings.save
+    monkeypatch.setattr(settings, "save", lambda data: (writes.append(data), save(data)))
+    for i in range(20):
+        settings.save_soon({"n": i})
+    settings.close()
+    assert writes[-1] == {"n": 19}
+    assert len(writes) <= 2
+    assert settings.load() == {"n": 19}
+    settings.save_soon({"n": 20})  # ignored once closed
+    assert settings.load() == {"n": 19}
+
+
+def test_background_error_reaches_on_error_without_blocking_flush(tmp_path):
+    errors = []
+    reported = threading.Event()
+
+    def on_error(exc):
+        errors.append(exc)
+        settings.flush()  # must not wait on the write that just failed
+        reported.set()
+
+    settings = SettingsFile(tmp_path / "missing" / "config.json", delay=0.01, on_error=on_error)
+    settings.save_soon({"n": 1})
+    assert reported.wait(5)
+    assert isinstance(errors[0], SettingsError)
+    settings.close()
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from Loadout import DRAW_RANGES, Loadout, LoadoutEngine
+from loadout_space import RADICES, SIZE, SPACE_SLOTS, RankSet, count, iter_space, rank, unrank
+
+
+def test_size_is_the_product_of_the_draw_tables():
+    size = 1
+    for slot in SPACE_SLOTS:
+        size *= len(DRAW_RANGES[slot])
+    assert count() == SIZE == size
+    assert RADICES == tuple(len(DRAW_RANGES[slot]) for slot in SPACE_SLOTS)
+
+
+def test_rank_unrank_round_trip():
+    rng = random.Random(1)
+    for r in [0, 1, SIZE - 1, *(rng.randrange(SIZE) for _ in range(500))]:
+        assert rank(unrank(r)) == r
+
+
+def test_rolls_rank_and_come_back():
+    engine = LoadoutEngine(rng=random.Random(2))
+    for _ in range(200):
+        roll = engine.roll_all()
+        assert unrank(rank(roll)) == roll
+
+
+def test_rank_order_is_value_order():
+    assert unrank(0).codes == dict.fromkeys(SPACE_SLOTS, 0)
+    assert unrank(1).codes["money"] == 1
+    assert unrank(SIZE - 1).codes == {slot: len(DRAW_RANGES[slot]) - 1 for slot in SPACE_SLOTS}
+
+
+@pytest.mark.parametrize("start, stop", [(0, 10), (12_345, 12_400), (SIZE - 5, None), (7, 7)])
+def test_iter_space_matches_unrank(start, stop):
+    end = SIZE if stop is None else stop
+    assert list(iter_space(start, stop)) == [unrank(r) for r in range(start, end)]
+
+
+def test_out_of_space():
+    with pytest.raises(ValueError):
+        unrank(SIZE)
+    with pytest.raises(ValueError):
+        rank(Loadout.from_values({"weapon": "Rusty AKM"}))  # other slots missing
+    with pytest.raises(ValueError):
+        list(iter_space(5, 2))
+    extra = unrank(0).codes
+    extra["ammo"] = len(DRAW_RANGES["ammo"])  # a preset-only extra
+    with pytest.raises(ValueError):
+        rank(Loadout.from_codes(extra))
+
+
+def test_rank_set():
+    engine = LoadoutEngine(rng=random.Random(3))
+    rolls = [engine.roll_all() for _ in range(100)]
+    seen = RankSet(rolls)
+    assert len(seen) == len(set(rolls))
+    assert all(roll in seen for roll in rolls)
+    assert seen.add(rolls[0]) is False
+    assert Loadout.from_values({"weapon": "Rusty AKM"}) not in seen
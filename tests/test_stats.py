@@ -0,0 +1,65 @@
+import math
+import random
+
+import pytest
+from conftest import MODES, nothing_included
+
+from Loadout import LoadoutEngine, RollSettings, resolve_mode
+from loadout_stats import RollStats
+
+np = pytest.importorskip("numpy")
+import loadout_bulk  # noqa: E402  (needs NumPy)
+
+
+def _same(a, b):
+    a, b = a.to_dict(), b.to_dict()
+    assert math.isclose(a.pop("bad_share"), b.pop("bad_share"))
+    assert a == b
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("settings", [None, nothing_included()], ids=["defaults", "nothing"])
+def test_add_batch_matches_add(mode, settings):
+    batch = loadout_bulk.roll_batch(2000, settings, mode=mode, seed=1)
+    rows, columns = RollStats(), RollStats()
+    rows.extend(batch)
+    columns.add_batch(batch)
+    _same(rows, columns)
+
+
+def test_merge_equals_one_pass():
+    engine = LoadoutEngine(rng=random.Random(3), record_seeds=False)
+    rolls = [engine.roll_all() for _ in range(3000)]
+    whole, left, right = RollStats(), RollStats(), RollStats()
+    whole.extend(rolls)
+    left.extend(rolls[:1000])
+    right.extend(rolls[1000:])
+    _same(whole, left.merge(right))
+
+
+def test_readings():
+    stats = RollStats()
+    engine = LoadoutEngine(rng=random.Random(4), record_seeds=False)
+    stats.extend(resolve_mode("money")(engine) for _ in range(5000))
+    assert stats.rolls == 5000
+    assert stats.absent("weapon") == 5000 and stats.absent("money") == 0
+    assert sum(stats.frequencies("money").values()) == 5000
+    assert stats.quantile("money", 0) == min(stats.frequencies("money"))
+    assert stats.quantile("money", 1) == max(stats.frequencies("money"))
+    assert 60_000 < stats.mean("money") < 90_000
+    assert sum(stats.histogram("money", 50_000).values()) == 5000
+    with pytest.raises(ValueError):
+        stats.quantile("armour", 0.5)
+    assert RollStats().quantile("money", 0.5) is None
+
+
+def test_iter_batches_chunks_like_one_batch():
+    settings = RollSettings()
+    settings.lock["armour"] = True
+    chunks = list(loadout_bulk.iter_batches(2500, settings, seed=5, chunk_size=1000))
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+    assert len({int(chunk["armour"][0]) for chunk in chunks}) == 1
+    with pytest.raises(ValueError):
+        next(loadout_bulk.iter_batches(10, chunk_size=0))
+    with pytest.raises(ValueError):
+        next(loadout_bulk.iter_batches(-1))